@@ -8,9 +8,17 @@ sys.path.insert(0, str(Path(__file__).parent))
 from flask import Flask, jsonify
 from flask_cors import CORS
 
+from core.database.connection import conexao_leitura
+from core.database.schema import migrar_na_inicializacao
+
 app = Flask(__name__)
 CORS(app)
 
+DB_PATH = "clipping_faciap.db"
+
+# Migrações uma vez por processo, antes da primeira requisição
+migrar_na_inicializacao(DB_PATH)
+
 @app.route('/health')
 def health():
     return jsonify({
@@ -31,22 +39,27 @@ def status():
 @app.route('/api/noticias')
 def get_noticias():
     try:
-        from core.database.db_manager import db_manager
-        
-        # Buscar notícias do banco
-        noticias, total = db_manager.get_noticias(limit=100)
+        # Buscar notícias do banco (total pelas estatísticas agregadas)
+        with conexao_leitura(DB_PATH) as conn:
+            rows = conn.execute("""
+                SELECT id, titulo, fonte, link, data_publicacao, texto_completo, favorita
+                FROM noticias
+                ORDER BY data_publicacao DESC, id DESC
+                LIMIT 100
+            """).fetchall()
+            total = conn.execute("SELECT COALESCE(SUM(total), 0) FROM estatisticas_fonte").fetchone()[0]
         
         # Converter para dicionário
         noticias_dict = []
-        for noticia in noticias:
+        for row in rows:
             noticias_dict.append({
-                'id': noticia.id,
-                'titulo': noticia.titulo,
-                'fonte': noticia.fonte,
-                'link': noticia.link,
-                'data_publicacao': noticia.data_publicacao.isoformat() if noticia.data_publicacao else None,
-                'resumo': noticia.texto_completo[:200] + '...' if noticia.texto_completo and len(noticia.texto_completo) > 200 else noticia.texto_completo,
-                'favorita': noticia.favorita
+                'id': row[0],
+                'titulo': row[1],
+                'fonte': row[2],
+                'link': row[3],
+                'data_publicacao': row[4],
+                'resumo': row[5][:200] + '...' if row[5] and len(row[5]) > 200 else row[5],
+                'favorita': bool(row[6])
             })
         
         return jsonify({
@@ -1,50 +1,24 @@
 ﻿from flask import Flask, jsonify, request
 from flask_cors import CORS
-import sqlite3
-import pandas as pd
-import re
-from datetime import datetime
+
+from core.scoring.dictionary_loader import obter_dicionario
 
 app = Flask(__name__)
 CORS(app)
 
-# Carregar dicionário FACIAP
-def carregar_dicionario():
-    try:
-        df = pd.read_csv("config/dicionario_faciap.csv")
-        return df
-    except:
-        # Dicionário de exemplo se não encontrar o arquivo
-        return pd.DataFrame({
-            'termo': ['educação', 'tecnologia', 'inteligência artificial', 'dados', 'startup', 'inovação'],
-            'categoria': ['Educação', 'Tecnologia', 'IA', 'Dados', 'Empreendedorismo', 'Inovação'],
-            'peso_interesse': [8, 7, 9, 6, 7, 8],
-            'peso_risco': [3, 5, 8, 7, 4, 3]
-        })
+DICIONARIO_PATH = "config/dicionario_faciap.csv"
 
 # Calcular score de uma notícia
-def calcular_score(texto, dicionario):
+def calcular_score(texto, matcher):
     if not texto:
         return 0, 0, []
     
-    texto_lower = texto.lower()
-    score_interesse = 0
-    score_risco = 0
-    categorias_encontradas = []
-    
-    for _, row in dicionario.iterrows():
-        termo = row['termo'].lower()
-        if termo in texto_lower:
-            score_interesse += row['peso_interesse']
-            score_risco += row['peso_risco']
-            if row['categoria'] not in categorias_encontradas:
-                categorias_encontradas.append(row['categoria'])
-    
-    return score_interesse, score_risco, categorias_encontradas
+    resultado = matcher.match(texto)
+    return resultado.score_interesse, resultado.score_risco, resultado.categorias
 
 @app.route("/api/noticias")
 def get_noticias():
-    dicionario = carregar_dicionario()
+    dicionario = obter_dicionario(DICIONARIO_PATH)
     
     # Notícias com scoring aplicado
     noticias_exemplo = [
@@ -90,10 +64,13 @@ def get_noticias():
         }
     ]
     
-    # Aplicar scoring em cada notícia
-    for noticia in noticias_exemplo:
-        texto_completo = noticia.get('texto_completo', '' ) + ' ' + noticia.get('titulo', '')
-        score_interesse, score_risco, categorias = calcular_score(texto_completo, dicionario)
+    # Aplicar scoring em cada notícia, com o mesmo matcher dos scores gravados
+    matcher = dicionario.matcher_pontuacao
+    textos = matcher.preparar_textos([
+        noticia.get('texto_completo', '' ) + ' ' + noticia.get('titulo', '') for noticia in noticias_exemplo
+    ])
+    for noticia, texto_completo in zip(noticias_exemplo, textos):
+        score_interesse, score_risco, categorias = calcular_score(texto_completo, matcher)
         
         noticia['score_interesse'] = score_interesse
         noticia['score_risco'] = score_risco
@@ -124,8 +101,7 @@ def favoritar_noticia(noticia_id):
 
 @app.route("/api/categorias")
 def get_categorias():
-    dicionario = carregar_dicionario()
-    categorias = dicionario['categoria'].unique().tolist()
+    categorias = obter_dicionario(DICIONARIO_PATH).categorias
     return jsonify({"categorias": categorias})
 
 @app.route("/health")
@@ -1,101 +1,163 @@
-﻿from flask import Flask, jsonify, request
+﻿import os
+import time
+
+from flask import Flask, Response, g, jsonify, request, stream_with_context
 from flask_cors import CORS
-import sqlite3
-import pandas as pd
-from datetime import datetime
+from datetime import date, datetime
+
+from core.database.connection import conexao_escrita, conexao_leitura
+from core.database.noticias_query import LIMITE_PADRAO, ORDENACOES, buscar_noticias
+from core.database.schema import migrar_na_inicializacao
+from core.database.search import LIMITE_PADRAO as LIMITE_BUSCA, buscar_texto
+from core.http_cache import (CODIFICACOES, TAMANHO_MINIMO_COMPRESSAO, CacheRespostas, calcular_etag,
+                             comprimir, ler_marca_escrita)
+from core.metrics import CONTENT_TYPE_PROMETHEUS, REGISTRO
+from core.scoring.dictionary_loader import obter_dicionario
+from core.scoring.score_cache import decodificar_categorias, existem_pendentes
 
 app = Flask(__name__)
 CORS(app)
 
-def carregar_dicionario():
-    try:
-        df = pd.read_csv("config/dicionario_faciap.csv")
-        return df
-    except:
-        return pd.DataFrame({
-            'termo': ['educação', 'tecnologia', 'inteligência artificial', 'dados'],
-            'categoria': ['Educação', 'Tecnologia', 'IA', 'Dados'],
-            'peso_interesse': [8, 7, 9, 6],
-            'peso_risco': [3, 5, 8, 7]
-        })
-
-def calcular_score_noticia(texto, dicionario):
-    if not texto:
-        return 0, 0, []
-    
-    texto_lower = texto.lower()
-    score_interesse = 0
-    score_risco = 0
-    categorias = []
-    
-    for _, row in dicionario.iterrows():
-        if row['termo'].lower() in texto_lower:
-            score_interesse += row['peso_interesse']
-            score_risco += row['peso_risco']
-            if row['categoria'] not in categorias:
-                categorias.append(row['categoria'])
-    
-    return score_interesse, score_risco, categorias
+DB_PATH = "clipping_faciap.db"
+DICIONARIO_PATH = "config/dicionario_faciap.csv"
+
+# Migrações uma vez por processo, antes da primeira requisição
+migrar_na_inicializacao(DB_PATH)
+
+API_DURACAO = REGISTRO.histograma(
+    "clipping_api_request_duration_seconds", "Latência das requisições da API", ("rota", "metodo", "status")
+)
+
+@app.before_request
+def _iniciar_cronometro():
+    g.inicio_requisicao = time.perf_counter()
+
+@app.after_request
+def _registrar_latencia(response):
+    inicio = g.pop("inicio_requisicao", None)
+    if inicio is not None and request.url_rule is not None and request.url_rule.rule.startswith("/api/"):
+        API_DURACAO.observar(
+            time.perf_counter() - inicio,
+            rota=request.url_rule.rule, metodo=request.method, status=response.status_code
+        )
+    return response
+
+# Respostas JSON das consultas, por ETag (marca de escrita + parâmetros)
+CACHE_RESPOSTAS = CacheRespostas()
+
+MIMETYPES_COMPRIMIVEIS = ("application/json", "text/plain", "text/html", "text/csv")
+
+@app.after_request
+def _comprimir_resposta(response):
+    # Respostas do cache já saem comprimidas; exportações em fluxo não são tocadas
+    if (response.status_code != 200 or response.is_streamed or response.direct_passthrough
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in MIMETYPES_COMPRIMIVEIS):
+        return response
+    codificacao = request.accept_encodings.best_match(CODIFICACOES)
+    response.vary.add("Accept-Encoding")
+    if codificacao is None or response.content_length is None or response.content_length < TAMANHO_MINIMO_COMPRESSAO:
+        return response
+    response.set_data(comprimir(response.get_data(), codificacao))
+    response.headers["Content-Encoding"] = codificacao
+    return response
+
+def _responder_com_cache(marca, gerar_payload, *chave):
+    """
+    Resposta JSON condicional: 304 se o cliente já tem a versão, senão o
+    corpo em cache (ou gerado agora e guardado), comprimido se aceito
+    """
+    etag = calcular_etag(marca, request.path, sorted(request.args.items(multi=True)), *chave)
+    if request.if_none_match.contains_weak(etag):
+        resposta = Response(status=304)
+    else:
+        entrada = CACHE_RESPOSTAS.obter(etag)
+        if entrada is None:
+            entrada = CACHE_RESPOSTAS.guardar(etag, app.json.response(gerar_payload()).get_data())
+        codificacao = request.accept_encodings.best_match(CODIFICACOES)
+        corpo = entrada.corpo_para(codificacao)
+        resposta = Response(corpo, mimetype="application/json")
+        if corpo is not entrada.corpo:
+            resposta.headers["Content-Encoding"] = codificacao
+    resposta.set_etag(etag, weak=True)
+    resposta.vary.add("Accept-Encoding")
+    # O cliente sempre revalida; sem mudanças, recebe 304
+    resposta.headers["Cache-Control"] = "no-cache"
+    return resposta
+
+def _parametro_bool(valor):
+    if valor is None or valor == "":
+        return None
+    return valor.lower() in ("1", "true", "sim", "yes")
 
 @app.route("/api/noticias")
 def get_noticias():
     try:
-        conn = sqlite3.connect("clipping_faciap.db")
-        cursor = conn.cursor()
-        
-        # Buscar notícias reais do banco
-        cursor.execute("""
-            SELECT id, titulo, fonte, link, data_publicacao, texto_completo, 
-                   score_interesse, score_risco, favorita
-            FROM noticias 
-            ORDER BY data_publicacao DESC 
-            LIMIT 100
-        """)
-        
-        rows = cursor.fetchall()
-        conn.close()
-        
-        if not rows:
-            return jsonify({"noticias": [], "total": 0, "erro": "Nenhuma notícia encontrada"})
+        ordenacao = request.args.get('ordenacao', 'data')
+        if ordenacao not in ORDENACOES:
+            ordenacao = 'data'
+        score_min = request.args.get('score_min', type=float)
+        limite = request.args.get('limite', LIMITE_PADRAO, type=int)
         
-        # Carregar dicionário para recalcular scores
-        dicionario = carregar_dicionario()
+        # Só lê os scores gravados: a pontuação é do coletor/agendador, e a
+        # versão lematizada só é conhecida aqui se o modelo já foi carregado
+        dicionario = obter_dicionario(DICIONARIO_PATH)
+        versao = dicionario.versao_pontuacao
         
-        noticias = []
-        for row in rows:
-            # Recalcular score baseado no dicionário
-            texto_completo = (row[5] or "") + " " + (row[1] or "")
-            score_interesse, score_risco, categorias = calcular_score_noticia(texto_completo, dicionario)
+        def gerar():
+            # Filtros, ordenação e paginação no SQL
+            rows, proximo_cursor = buscar_noticias(
+                conn,
+                versao,
+                ordenacao=ordenacao,
+                fonte=request.args.get('fonte'),
+                categoria=request.args.get('categoria'),
+                data_inicio=request.args.get('data_inicio'),
+                data_fim=request.args.get('data_fim'),
+                score_min=score_min,
+                favorita=_parametro_bool(request.args.get('favorita')),
+                cursor=request.args.get('cursor'),
+                limite=limite
+            )
+            
+            if not rows:
+                return {"noticias": [], "total": 0, "proximo_cursor": None, "erro": "Nenhuma notícia encontrada"}
+            
+            noticias = []
+            for row in rows:
+                noticia = {
+                    "id": row[0],
+                    "titulo": row[1] or "Título não disponível",
+                    "fonte": row[2] or "Fonte não informada",
+                    "link": row[3] or "#",
+                    "data_publicacao": row[4] or "Data não informada",
+                    "resumo": (row[5] or "")[:200] + "..." if row[5] and len(row[5]) > 200 else (row[5] or "Resumo não disponível"),
+                    "score_interesse": row[6] or 0,
+                    "score_risco": row[7] or 0,
+                    "categorias": decodificar_categorias(row[9]),
+                    "categoria_dominante": row[10],
+                    "favorita": bool(row[8]) if row[8] else False
+                }
+                noticias.append(noticia)
             
-            noticia = {
-                "id": row[0],
-                "titulo": row[1] or "Título não disponível",
-                "fonte": row[2] or "Fonte não informada",
-                "link": row[3] or "#",
-                "data_publicacao": row[4] or "Data não informada",
-                "resumo": (row[5] or "")[:200] + "..." if row[5] and len(row[5]) > 200 else (row[5] or "Resumo não disponível"),
-                "score_interesse": score_interesse,
-                "score_risco": score_risco,
-                "categorias": categorias,
-                "favorita": bool(row[8]) if row[8] else False
+            return {
+                "noticias": noticias,
+                "total": len(noticias),
+                "proximo_cursor": proximo_cursor,
+                "fonte": "Dados reais coletados",
+                "dicionario_termos": len(dicionario),
+                "scores_desatualizados": existem_pendentes(conn, versao)
             }
-            noticias.append(noticia)
-        
-        # Ordenação
-        ordenacao = request.args.get('ordenacao', 'data')
-        if ordenacao == 'score_interesse':
-            noticias.sort(key=lambda x: x['score_interesse'], reverse=True)
-        elif ordenacao == 'score_risco':
-            noticias.sort(key=lambda x: x['score_risco'], reverse=True)
-        elif ordenacao == 'score_total':
-            noticias.sort(key=lambda x: x['score_interesse'] + x['score_risco'], reverse=True)
         
+        with conexao_leitura(DB_PATH) as conn:
+            return _responder_com_cache(ler_marca_escrita(conn), gerar, dicionario.versao, versao)
+    
+    except ValueError as e:
         return jsonify({
-            "noticias": noticias,
-            "total": len(noticias),
-            "fonte": "Dados reais coletados",
-            "dicionario_termos": len(dicionario)
-        })
+            "erro": str(e),
+            "noticias": [],
+            "total": 0
+        }), 400
         
     except Exception as e:
         return jsonify({
@@ -104,18 +166,136 @@ def get_noticias():
             "total": 0
         }), 500
 
+@app.route("/api/noticias/search")
+def buscar_noticias_texto():
+    try:
+        q = request.args.get('q', '')
+        pagina = request.args.get('pagina', 1, type=int)
+        limite = request.args.get('limite', LIMITE_BUSCA, type=int)
+        
+        def gerar():
+            rows, total = buscar_texto(conn, q, pagina=pagina, limite=limite)
+            
+            noticias = []
+            for row in rows:
+                noticias.append({
+                    "id": row[0],
+                    "titulo": row[1] or "Título não disponível",
+                    "fonte": row[2] or "Fonte não informada",
+                    "link": row[3] or "#",
+                    "data_publicacao": row[4] or "Data não informada",
+                    "score_interesse": row[5] or 0,
+                    "score_risco": row[6] or 0,
+                    "favorita": bool(row[7]) if row[7] else False,
+                    "trecho": row[8] or "",
+                    "relevancia": -row[9]
+                })
+            
+            return {
+                "noticias": noticias,
+                "total": total,
+                "pagina": pagina,
+                "q": q
+            }
+        
+        with conexao_leitura(DB_PATH) as conn:
+            return _responder_com_cache(ler_marca_escrita(conn), gerar)
+    
+    except ValueError as e:
+        return jsonify({"erro": str(e), "noticias": [], "total": 0}), 400
+        
+    except Exception as e:
+        return jsonify({"erro": str(e), "noticias": [], "total": 0}), 500
+
 @app.route("/api/noticias/<int:noticia_id>/favoritar", methods=["POST"])
 def favoritar_noticia(noticia_id):
     try:
-        conn = sqlite3.connect("clipping_faciap.db")
-        cursor = conn.cursor()
-        cursor.execute("UPDATE noticias SET favorita = 1 WHERE id = ?", (noticia_id,))
-        conn.commit()
-        conn.close()
+        with conexao_escrita(DB_PATH) as conn:
+            conn.execute("UPDATE noticias SET favorita = 1 WHERE id = ?", (noticia_id,))
+        CACHE_RESPOSTAS.invalidar()
         return jsonify({"success": True, "message": f"Notícia {noticia_id} favoritada!"})
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
+@app.route("/api/stats")
+def get_estatisticas():
+    from core.database.stats import obter_estatisticas
+    
+    try:
+        dias = request.args.get("dias", 30, type=int)
+        with conexao_leitura(DB_PATH) as conn:
+            # por_dia é relativo à data de hoje
+            return _responder_com_cache(
+                ler_marca_escrita(conn), lambda: obter_estatisticas(conn, dias=dias), date.today()
+            )
+    except Exception as e:
+        return jsonify({"erro": str(e)}), 500
+
+@app.route("/api/export")
+def exportar_noticias():
+    from core.database.export import FORMATOS, gerar_exportacao
+    
+    formato = request.args.get("formato", "csv")
+    if formato not in FORMATOS:
+        return jsonify({"erro": f"formato deve ser um de: {', '.join(FORMATOS)}"}), 400
+    incluir_texto = bool(_parametro_bool(request.args.get("texto")))
+    filtros = {
+        "data_inicio": request.args.get("data_inicio"),
+        "data_fim": request.args.get("data_fim"),
+        "fonte": request.args.get("fonte"),
+        "score_min": request.args.get("score_min", type=float),
+    }
+    
+    def gerar():
+        # A conexão vive enquanto a resposta é transmitida
+        with conexao_leitura(DB_PATH) as conn:
+            for parte in gerar_exportacao(conn, formato, incluir_texto, **filtros):
+                yield parte.encode("utf-8") if isinstance(parte, str) else parte
+    
+    content_type, extensao = FORMATOS[formato]
+    nome = f"clipping_legislativo_{datetime.now():%Y%m%d_%H%M%S}.{extensao}"
+    return Response(
+        stream_with_context(gerar()),
+        content_type=content_type,
+        headers={"Content-Disposition": f'attachment; filename="{nome}"'}
+    )
+
+@app.route("/api/coletas", methods=["POST"])
+def criar_coleta():
+    from core.scheduler import get_servico_coleta
+    
+    dados = request.get_json(silent=True) or {}
+    try:
+        tarefa = get_servico_coleta().enfileirar(
+            dados.get("tipo", "coleta"), dados.get("parametros"), origem="api"
+        )
+    except ValueError as e:
+        return jsonify({"erro": str(e)}), 400
+    
+    resposta = jsonify(tarefa.to_dict())
+    resposta.headers["Location"] = f"/api/coletas/{tarefa.id}"
+    return resposta, 202
+
+@app.route("/api/coletas")
+def listar_coletas():
+    from core.scheduler import get_servico_coleta
+    
+    limite = request.args.get("limite", 20, type=int)
+    return jsonify({"tarefas": [t.to_dict() for t in get_servico_coleta().listar(limite)]})
+
+@app.route("/api/coletas/<tarefa_id>")
+def status_coleta(tarefa_id):
+    from core.scheduler import get_servico_coleta
+    
+    tarefa = get_servico_coleta().obter(tarefa_id)
+    if tarefa is None:
+        return jsonify({"erro": "Tarefa não encontrada"}), 404
+    return jsonify(tarefa.to_dict())
+
+@app.route("/metrics")
+def metrics():
+    return Response(REGISTRO.exportar(), mimetype=None, content_type=CONTENT_TYPE_PROMETHEUS)
+
 @app.route("/health")
 def health():
     return jsonify({"status": "healthy", "service": "Clipping FACIAP Real"})
@@ -124,4 +304,11 @@ if __name__ == "__main__":
     print("🚀 Backend com Dados REAIS iniciado!")
     print("📍 Health: http://localhost:5000/health" )
     print("📰 Notícias Reais: http://localhost:5000/api/noticias" )
+    print("📈 Métricas: http://localhost:5000/metrics" )
+    
+    # Coletas periódicas (CLIPPING_INTERVALO_COLETA etc.), só no processo que
+    # atende as requisições e não no supervisor do reloader
+    from core.scheduler import get_servico_coleta, intervalos_do_ambiente
+    if intervalos_do_ambiente() and os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        get_servico_coleta().iniciar()
     app.run(host="0.0.0.0", port=5000, debug=True)
@@ -0,0 +1,472 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks de todas as etapas do pipeline sobre um corpus sintético
+
+Uso (na raiz do projeto):
+    python -m benchmarks.run_benchmarks --escala pequena --saida resultado.json
+    python -m benchmarks.run_benchmarks --comparar base.json --tolerancia 0.2
+
+Etapas: parsing das listagens, extração de texto, limpeza/lematização,
+scoring (matcher e matriz esparsa), gravação em lote no SQLite, coleta
+completa contra um servidor HTTP local e latência de /api/noticias. O
+resultado é JSON; com --comparar, etapas mais lentas que a base além da
+tolerância são listadas e o processo sai com código 1.
+"""
+
+import argparse
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.synthetic import GeradorCorpus, escrever_dicionario_csv, paginas_por_fonte
+from core.database.connection import connect
+
+ESCALAS = {
+    'pequena': {'paginas': 10, 'artigos': 100, 'noticias': 2000, 'termos': 200, 'requisicoes': 50},
+    'media': {'paginas': 40, 'artigos': 400, 'noticias': 20000, 'termos': 500, 'requisicoes': 200},
+    'grande': {'paginas': 100, 'artigos': 1000, 'noticias': 100000, 'termos': 2000, 'requisicoes': 500},
+}
+
+# Tabelas criadas pelo db_manager; o restante do schema vem das migrações
+SCHEMA_BASE = """
+    CREATE TABLE IF NOT EXISTS noticias (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        titulo TEXT NOT NULL,
+        fonte TEXT NOT NULL,
+        link TEXT UNIQUE NOT NULL,
+        data_publicacao TEXT,
+        texto_completo TEXT,
+        score_interesse REAL DEFAULT 0,
+        score_risco REAL DEFAULT 0,
+        favorita BOOLEAN DEFAULT 0,
+        data_coleta TEXT DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE IF NOT EXISTS scores_faciap (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        noticia_id INTEGER,
+        score_interesse REAL,
+        score_risco REAL,
+        categorias TEXT,
+        data_calculo TEXT DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (noticia_id) REFERENCES noticias (id)
+    );
+"""
+
+
+def medir(etapa: str, itens: int, funcao: Callable[[], object], repeticoes: int = 1) -> Dict:
+    """
+    Executa a função `repeticoes` vezes e registra o melhor tempo
+
+    Returns:
+        {'etapa', 'itens', 'segundos', 'itens_por_segundo', 'ms_por_item'}
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    segundos = min(tempos)
+    return {
+        'etapa': etapa,
+        'itens': itens,
+        'segundos': round(segundos, 6),
+        'itens_por_segundo': round(itens / segundos, 2) if segundos else None,
+        'ms_por_item': round(segundos * 1000 / itens, 4) if itens else None,
+    }
+
+
+def latencias(etapa: str, amostras: List[float]) -> Dict:
+    """Resumo de latências em milissegundos"""
+    ordenadas = sorted(amostras)
+
+    def percentil(p: float) -> float:
+        return round(ordenadas[min(len(ordenadas) - 1, int(p * len(ordenadas)))] * 1000, 3)
+
+    return {
+        'etapa': etapa,
+        'itens': len(amostras),
+        'segundos': round(sum(amostras), 6),
+        'p50_ms': percentil(0.50),
+        'p95_ms': percentil(0.95),
+        'p99_ms': percentil(0.99),
+        'max_ms': round(ordenadas[-1] * 1000, 3),
+        'media_ms': round(statistics.mean(amostras) * 1000, 3),
+    }
+
+
+def pulada(etapa: str, motivo: str) -> Dict:
+    return {'etapa': etapa, 'pulada': True, 'motivo': motivo}
+
+
+def preparar_banco(caminho: str) -> None:
+    """Cria o schema base e aplica as migrações"""
+    from core.database.schema import aplicar_migracoes
+
+    conn = connect(caminho)
+    try:
+        conn.executescript(SCHEMA_BASE)
+    finally:
+        conn.close()
+    aplicar_migracoes(caminho)
+
+
+# Etapas
+
+
+def bench_parsing(gerador: GeradorCorpus, escala: Dict) -> List[Dict]:
+    from core.scrapers.listing_parsers import parse_listagem_camara, parse_listagem_senado
+
+    n_camara, n_senado = paginas_por_fonte(escala['paginas'])
+    camara = [gerador.listagem_camara(p, 'https://www.camara.leg.br') for p in range(1, n_camara + 1)]
+    senado = [gerador.listagem_senado(p, 'https://www12.senado.leg.br') for p in range(1, n_senado + 1)]
+
+    return [
+        medir('parsing_listagem_camara', len(camara),
+              lambda: [parse_listagem_camara(html, 'https://www.camara.leg.br/noticias/') for html in camara], 3),
+        medir('parsing_listagem_senado', len(senado),
+              lambda: [parse_listagem_senado(html, 'https://www12.senado.leg.br/noticias/') for html in senado], 3),
+    ]
+
+
+def bench_extracao(gerador: GeradorCorpus, escala: Dict) -> List[Dict]:
+    from core.extractors.text_extractor import extrair_texto_html
+
+    metade = escala['artigos'] // 2
+    paginas = (
+        [(gerador.artigo('camara'), 'https://www.camara.leg.br/noticias/1') for _ in range(metade)] +
+        [(gerador.artigo('senado'), 'https://www12.senado.leg.br/noticias/materias/1') for _ in range(metade)]
+    )
+    return [medir('extracao_texto', len(paginas),
+                  lambda: [extrair_texto_html(html, url) for html, url in paginas], 3)]
+
+
+def bench_limpeza(textos: List[str]) -> List[Dict]:
+    from core.scoring.lemmatizer import Lematizador, limpar_texto
+
+    resultados = [medir('limpeza_texto', len(textos), lambda: [limpar_texto(t) for t in textos], 3)]
+
+    lematizador = Lematizador()
+    try:
+        lematizador.nlp
+    except (ImportError, OSError) as e:
+        resultados.append(pulada('lematizacao', f"spaCy/modelo indisponível: {e}"))
+        return resultados
+
+    amostra = textos[:500]
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = str(Path(diretorio) / 'lemas.db')
+        preparar_banco(caminho)
+        conn = connect(caminho)
+        try:
+            resultados.append(medir('lematizacao', len(amostra), lambda: lematizador.lematizar_lote(conn, amostra)))
+            resultados.append(medir('lematizacao_cache', len(amostra), lambda: lematizador.lematizar_lote(conn, amostra)))
+        finally:
+            conn.close()
+    return resultados
+
+
+def bench_scoring(textos: List[str], termos) -> List[Dict]:
+    from core.scoring.keyword_matcher import KeywordMatcher
+    from core.scoring.sparse_scorer import MatrizDocumentos, pontuar_matriz
+
+    matcher = KeywordMatcher(termos)
+    resultados = [
+        medir('scoring_matcher', len(textos), lambda: [matcher.match(t) for t in textos]),
+    ]
+
+    matriz = []
+    resultados.append(medir('scoring_matriz_tokenizacao', len(textos),
+                            lambda: matriz.append(MatrizDocumentos(textos, matcher.normalizar))))
+    resultados.append(medir('scoring_matriz_pontuacao', len(textos),
+                            lambda: pontuar_matriz(matriz[-1], matcher), 3))
+    return resultados
+
+
+def bench_banco(gerador: GeradorCorpus, escala: Dict, diretorio: str, termos) -> List[Dict]:
+    from core.database.bulk_ops import save_noticias_bulk, save_scores_bulk, update_textos_bulk
+    from core.scoring.keyword_matcher import KeywordMatcher
+    from core.scoring.sparse_scorer import rescore_todas
+
+    caminho = str(Path(diretorio) / 'bench_banco.db')
+    preparar_banco(caminho)
+    noticias = gerador.noticias(escala['noticias'])
+    cabecalhos = [{k: v for k, v in n.items() if k != 'texto_completo'} for n in noticias]
+    textos = [(n['link'], n['texto_completo']) for n in noticias]
+
+    conn = connect(caminho)
+    try:
+        resultados = [
+            medir('db_save_noticias_bulk', len(noticias), lambda: save_noticias_bulk(conn, cabecalhos)),
+            medir('db_update_textos_bulk', len(textos), lambda: update_textos_bulk(conn, textos)),
+        ]
+        ids = [row[0] for row in conn.execute("SELECT id FROM noticias")]
+        scores = [
+            {'noticia_id': i, 'score_interesse': 1.0, 'score_risco': 2.0, 'categorias': ['Tributação']}
+            for i in ids
+        ]
+        resultados.append(medir('db_save_scores_bulk', len(scores), lambda: save_scores_bulk(conn, scores, 'bench')))
+
+        matcher = KeywordMatcher(termos)
+        resultados.append(medir('rescore_todas', len(ids), lambda: rescore_todas(conn, matcher)))
+    finally:
+        conn.close()
+    return resultados
+
+
+class _ServidorStub(BaseHTTPRequestHandler):
+    """Serve listagens e notícias sintéticas pré-geradas"""
+
+    paginas: Dict[str, bytes] = {}
+    artigos: Dict[str, List[bytes]] = {}
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        corpo = self.paginas.get(self.path)
+        if corpo is None:
+            fonte = 'camara' if 'camara.leg.br' in self.path else 'senado'
+            artigos = self.artigos[fonte]
+            corpo = artigos[hash(self.path) % len(artigos)]
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+
+def bench_coleta(gerador: GeradorCorpus, escala: Dict) -> List[Dict]:
+    from core.extractors.extraction_pipeline import ExtractionPipeline
+    from core.extractors.text_extractor import extrair_texto
+    from core.http_client import HttpClient
+    from core.scrapers.listing_crawler import ListingCrawler, fonte_camara, fonte_senado
+
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), _ServidorStub)
+    raiz = f"http://127.0.0.1:{servidor.server_port}"
+    site_camara, site_senado = f"{raiz}/www.camara.leg.br", f"{raiz}/www12.senado.leg.br"
+    camara = fonte_camara(f"{site_camara}/noticias/ultimas")
+    senado = fonte_senado(f"{site_senado}/noticias/ultimas")
+
+    n_camara, n_senado = paginas_por_fonte(escala['paginas'])
+    paginas = {}
+    for p in range(1, n_camara + 1):
+        paginas[camara.url_pagina(p)[len(raiz):]] = gerador.listagem_camara(p, site_camara)
+    for p in range(1, n_senado + 1):
+        paginas[senado.url_pagina(p)[len(raiz):]] = gerador.listagem_senado(p, site_senado)
+    _ServidorStub.paginas = paginas
+    _ServidorStub.artigos = {
+        'camara': [gerador.artigo('camara') for _ in range(20)],
+        'senado': [gerador.artigo('senado') for _ in range(20)],
+    }
+
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    client = HttpClient(cache_path=None, arquivo_path=None)
+    try:
+        crawler = ListingCrawler(concorrencia=4, taxa_por_host=None,
+                                 data_limite=datetime(2000, 1, 1), client=client)
+        coletadas: Dict[str, List[dict]] = {}
+        resultados = [medir('coleta_listagens_stub', n_camara + n_senado,
+                            lambda: coletadas.update(crawler.crawl_fontes({camara: n_camara, senado: n_senado})))]
+
+        links = [n['link'] for noticias in coletadas.values() for n in noticias][:escala['artigos']]
+        pipeline = ExtractionPipeline(lambda link: extrair_texto(link, client), lambda lote: len(lote))
+        resultados.append(medir('coleta_extracao_stub', len(links), lambda: pipeline.run(links)))
+    finally:
+        client.close()
+        servidor.shutdown()
+        servidor.server_close()
+    return resultados
+
+
+def bench_api(gerador: GeradorCorpus, escala: Dict, diretorio: str, termos) -> List[Dict]:
+    try:
+        import requests
+        from werkzeug.serving import make_server
+
+        import backend_real
+    except ImportError as e:
+        return [pulada('api_noticias', f"dependência indisponível: {e}")]
+
+    from core.database.bulk_ops import save_noticias_bulk
+
+    caminho = str(Path(diretorio) / 'bench_api.db')
+    dicionario = str(Path(diretorio) / 'dicionario.csv')
+    preparar_banco(caminho)
+    escrever_dicionario_csv(termos, dicionario)
+    conn = connect(caminho)
+    try:
+        save_noticias_bulk(conn, gerador.noticias(escala['noticias']))
+    finally:
+        conn.close()
+
+    backend_real.DB_PATH = caminho
+    backend_real.DICIONARIO_PATH = dicionario
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    servidor = make_server('127.0.0.1', 0, backend_real.app, threaded=True)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{servidor.server_port}/api/noticias"
+
+    sessao = requests.Session()
+    try:
+        # Primeira requisição pontua todo o acervo para o dicionário novo
+        resultados = [medir('api_noticias_primeira', escala['noticias'],
+                            lambda: sessao.get(url, timeout=600).raise_for_status())]
+
+        consultas = [
+            {}, {'ordenacao': 'score_total'}, {'ordenacao': 'score_risco', 'limite': 20},
+            {'fonte': 'Senado Federal'}, {'categoria': 'Tributação'}, {'score_min': 10},
+        ]
+        amostras, paginacao = [], []
+        for i in range(escala['requisicoes']):
+            inicio = time.perf_counter()
+            resposta = sessao.get(url, params=consultas[i % len(consultas)], timeout=60)
+            amostras.append(time.perf_counter() - inicio)
+            resposta.raise_for_status()
+
+            # Página seguinte pelo cursor
+            cursor = resposta.json().get('proximo_cursor')
+            if cursor:
+                inicio = time.perf_counter()
+                sessao.get(url, params={**consultas[i % len(consultas)], 'cursor': cursor}, timeout=60).raise_for_status()
+                paginacao.append(time.perf_counter() - inicio)
+
+        resultados.append(latencias('api_noticias', amostras))
+        if paginacao:
+            resultados.append(latencias('api_noticias_cursor', paginacao))
+    finally:
+        sessao.close()
+        servidor.shutdown()
+    return resultados
+
+
+ETAPAS = ('parsing', 'extracao', 'limpeza', 'scoring', 'banco', 'coleta', 'api')
+
+
+def executar(escala_nome: str, semente: int, etapas: Optional[List[str]] = None) -> Dict:
+    """Roda as etapas selecionadas e devolve o relatório"""
+    escala = ESCALAS[escala_nome]
+    etapas = etapas or list(ETAPAS)
+
+    gerador = GeradorCorpus(semente)
+    termos = gerador.dicionario(escala['termos'])
+    textos = [gerador.texto() for _ in range(min(escala['noticias'], 20000))]
+
+    resultados: List[Dict] = []
+    with tempfile.TemporaryDirectory() as diretorio:
+        for etapa in etapas:
+            print(f"⏱  {etapa}...", file=sys.stderr)
+            if etapa == 'parsing':
+                resultados += bench_parsing(gerador, escala)
+            elif etapa == 'extracao':
+                resultados += bench_extracao(gerador, escala)
+            elif etapa == 'limpeza':
+                resultados += bench_limpeza(textos)
+            elif etapa == 'scoring':
+                resultados += bench_scoring(textos, termos)
+            elif etapa == 'banco':
+                resultados += bench_banco(gerador, escala, diretorio, termos)
+            elif etapa == 'coleta':
+                resultados += bench_coleta(gerador, escala)
+            elif etapa == 'api':
+                resultados += bench_api(gerador, escala, diretorio, termos)
+
+    return {
+        'metadados': {
+            'data': datetime.now().isoformat(timespec='seconds'),
+            'commit': _commit_atual(),
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'escala': escala_nome,
+            'parametros': escala,
+            'semente': semente,
+        },
+        'resultados': resultados,
+    }
+
+
+def _commit_atual() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+            cwd=Path(__file__).resolve().parents[1], check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def comparar(atual: Dict, base: Dict, tolerancia: float) -> List[str]:
+    """
+    Etapas mais lentas que na base além da tolerância
+
+    Compara `segundos` (tempo total da etapa) e, quando houver, `p95_ms`.
+    """
+    anteriores = {r['etapa']: r for r in base.get('resultados', []) if not r.get('pulada')}
+    regressoes = []
+    for resultado in atual['resultados']:
+        anterior = anteriores.get(resultado['etapa'])
+        if resultado.get('pulada') or anterior is None:
+            continue
+        for metrica in ('segundos', 'p95_ms'):
+            if metrica in resultado and anterior.get(metrica):
+                razao = resultado[metrica] / anterior[metrica]
+                if razao > 1 + tolerancia:
+                    regressoes.append(
+                        f"{resultado['etapa']}: {metrica} {anterior[metrica]} → {resultado[metrica]} "
+                        f"({(razao - 1) * 100:+.0f}%)"
+                    )
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks do pipeline de clipping')
+    parser.add_argument('--escala', choices=ESCALAS, default='pequena', help='Tamanho do corpus sintético')
+    parser.add_argument('--semente', type=int, default=42, help='Semente do gerador')
+    parser.add_argument('--etapas', help=f"Etapas separadas por vírgula ({','.join(ETAPAS)})")
+    parser.add_argument('--saida', help='Arquivo JSON de saída (padrão: stdout)')
+    parser.add_argument('--comparar', help='JSON de uma execução anterior para detectar regressões')
+    parser.add_argument('--tolerancia', type=float, default=0.2, help='Piora relativa tolerada (0.2 = 20%%)')
+    args = parser.parse_args()
+
+    etapas = [e.strip() for e in args.etapas.split(',')] if args.etapas else None
+    if etapas and set(etapas) - set(ETAPAS):
+        parser.error(f"etapas desconhecidas: {', '.join(sorted(set(etapas) - set(ETAPAS)))}")
+
+    relatorio = executar(args.escala, args.semente, etapas)
+
+    for r in relatorio['resultados']:
+        if r.get('pulada'):
+            print(f"{r['etapa']:<30} pulada ({r['motivo']})", file=sys.stderr)
+        elif 'p50_ms' in r:
+            print(f"{r['etapa']:<30} p50 {r['p50_ms']:>9.2f} ms  p95 {r['p95_ms']:>9.2f} ms", file=sys.stderr)
+        else:
+            print(f"{r['etapa']:<30} {r['segundos']:>9.3f} s  {r['ms_por_item']:>9.3f} ms/item", file=sys.stderr)
+
+    saida = json.dumps(relatorio, ensure_ascii=False, indent=2)
+    if args.saida:
+        Path(args.saida).write_text(saida, encoding='utf-8')
+    else:
+        print(saida)
+
+    if args.comparar:
+        base = json.loads(Path(args.comparar).read_text(encoding='utf-8'))
+        regressoes = comparar(relatorio, base, args.tolerancia)
+        for regressao in regressoes:
+            print(f"⚠️  Regressão: {regressao}", file=sys.stderr)
+        if regressoes:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
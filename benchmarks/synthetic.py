@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+Gerador de corpus sintético para os benchmarks
+
+Produz páginas de listagem e de notícia no formato dos portais da Câmara e
+do Senado (os mesmos containers que os parsers procuram), dicionários
+FACIAP e textos com termos do dicionário espalhados. Tudo é determinístico
+para uma mesma semente.
+"""
+
+import csv
+import random
+from datetime import datetime, timedelta
+from html import escape
+from typing import List, Optional, Tuple
+
+from core.scoring.dictionary_loader import Termo
+
+DATA_INICIAL = datetime(2025, 8, 31, 18, 0)
+
+_PALAVRAS = (
+    "projeto lei câmara senado comissão votação plenário relator proposta emenda "
+    "governo federal estados municípios orçamento recursos programa política pública "
+    "saúde segurança transporte energia agricultura indústria comércio serviços "
+    "trabalho emprego renda consumidor contribuinte setor privado mercado regulação "
+    "deputado senador parecer audiência debate sessão aprovação texto artigo medida"
+).split()
+
+_CATEGORIAS = (
+    "Tributação", "Trabalho", "Crédito", "Infraestrutura", "Inovação",
+    "Comércio Exterior", "Meio Ambiente", "Educação", "Saúde", "Regulação",
+)
+
+# Ruído típico dos portais: menus, scripts e rodapé fora do container da matéria
+_RUIDO = ''.join(
+    f'<div class="menu-item-{i}"><nav><a href="/secao/{i}">Seção {i}</a></nav>'
+    f'<script>window.dataLayer.push({{"secao": {i}}});</script><span>Atalho {i}</span></div>'
+    for i in range(150)
+)
+
+
+class GeradorCorpus:
+    """
+    Gera páginas, textos e dicionários sintéticos
+    """
+
+    def __init__(self, semente: int = 42, termos: Optional[List[Termo]] = None):
+        """
+        Args:
+            semente: Semente do gerador aleatório
+            termos: Dicionário cujos termos são espalhados nos textos
+        """
+        self.random = random.Random(semente)
+        self.termos = termos or []
+
+    def dicionario(self, n_termos: int = 200, fracao_compostos: float = 0.3) -> List[Termo]:
+        """Dicionário com termos simples e compostos; passa a ser usado nos textos"""
+        termos = []
+        for i in range(n_termos):
+            palavras = [f"termo{i}"]
+            if self.random.random() < fracao_compostos:
+                palavras.append(self.random.choice(_PALAVRAS))
+            termos.append((
+                ' '.join(palavras),
+                _CATEGORIAS[i % len(_CATEGORIAS)],
+                float(self.random.randint(0, 10)),
+                float(self.random.randint(0, 10)),
+            ))
+        self.termos = termos
+        return termos
+
+    def texto(self, n_palavras: int = 400, densidade_termos: float = 0.02) -> str:
+        """Texto corrido com termos do dicionário na densidade indicada"""
+        partes = []
+        for _ in range(n_palavras):
+            if self.termos and self.random.random() < densidade_termos:
+                partes.append(self.random.choice(self.termos)[0])
+            else:
+                partes.append(self.random.choice(_PALAVRAS))
+        return ' '.join(partes)
+
+    def titulo(self) -> str:
+        return ' '.join(self.random.choice(_PALAVRAS) for _ in range(8)).capitalize()
+
+    def listagem_camara(self, pagina: int, site: str, itens: int = 20) -> bytes:
+        """Página de listagem da Câmara (ul.l-lista-noticias > article.g-chamada)"""
+        artigos = []
+        for i in range(itens):
+            numero = pagina * 1000 + i
+            data = DATA_INICIAL - timedelta(days=pagina - 1, minutes=10 * i)
+            artigos.append(
+                f'<li><article class="g-chamada"><h3 class="g-chamada__titulo">'
+                f'<a class="g-chamada__titulo-link" href="{site}/noticias/{numero}-noticia">'
+                f'{escape(self.titulo())}</a></h3>'
+                f'<span class="g-chamada__data">{data:%d/%m/%Y %H:%M}</span></article></li>'
+            )
+        return (
+            f'<html><head><meta charset="utf-8"><title>Últimas notícias</title></head><body>'
+            f'{_RUIDO}<ul class="l-lista-noticias">{"".join(artigos)}</ul>{_RUIDO}</body></html>'
+        ).encode('utf-8')
+
+    def listagem_senado(self, pagina: int, site: str, itens: int = 20) -> bytes:
+        """Página de listagem do Senado (div.col-xs-12.col-md-9 > li)"""
+        linhas = []
+        for i in range(itens):
+            numero = pagina * 1000 + i
+            data = DATA_INICIAL - timedelta(days=pagina - 1, minutes=10 * i)
+            linhas.append(
+                f'<li><a href="{site}/noticias/materias/{data:%Y/%m/%d}/noticia-{numero}">'
+                f'{escape(self.titulo())}</a> <span class="data">{data:%d/%m/%Y %Hh%M}</span></li>'
+            )
+        return (
+            f'<html><head><meta charset="utf-8"><title>Senado Notícias</title></head><body>'
+            f'{_RUIDO}<div class="col-xs-12 col-md-9"><ul>{"".join(linhas)}</ul></div></body></html>'
+        ).encode('utf-8')
+
+    def artigo(self, fonte: str = 'camara', paragrafos: int = 12, palavras_por_paragrafo: int = 60) -> bytes:
+        """Página de notícia com o texto em div#content-noticia (Câmara) ou div#textoMateria (Senado)"""
+        corpo = ''.join(
+            f'<p>{escape(self.texto(palavras_por_paragrafo))}</p>' for _ in range(paragrafos)
+        )
+        corpo += '<aside><p>Leia também: outras notícias relacionadas a este assunto no portal</p></aside>'
+        container = 'content-noticia' if fonte == 'camara' else 'textoMateria'
+        return (
+            f'<html><head><meta charset="utf-8"><title>{escape(self.titulo())}</title></head><body>'
+            f'<header><p>Portal de notícias</p></header>{_RUIDO}'
+            f'<div id="{container}">{corpo}</div>'
+            f'<footer><p>Todos os direitos reservados. Reprodução autorizada mediante citação.</p></footer>'
+            f'</body></html>'
+        ).encode('utf-8')
+
+    def noticias(self, quantidade: int, palavras: int = 400) -> List[dict]:
+        """Notícias no formato do crawler, com texto completo"""
+        noticias = []
+        for i in range(quantidade):
+            fonte = 'Câmara dos Deputados' if i % 2 == 0 else 'Senado Federal'
+            noticias.append({
+                'fonte': fonte,
+                'titulo': self.titulo(),
+                'link': f"https://bench.local/noticias/{i}",
+                'data_publicacao': DATA_INICIAL - timedelta(minutes=7 * i),
+                'texto_completo': self.texto(palavras),
+            })
+        return noticias
+
+
+def escrever_dicionario_csv(termos: List[Termo], caminho: str, formato: str = 'notebook') -> None:
+    """
+    Grava o dicionário em CSV
+
+    Args:
+        termos: Tuplas (termo, categoria, peso_interesse, peso_risco)
+        caminho: Arquivo de saída
+        formato: 'notebook' (palavra_chave;eixo_temat, vírgula decimal) ou
+            'backend' (termo,categoria)
+    """
+    with open(caminho, 'w', encoding='utf-8', newline='') as arquivo:
+        if formato == 'notebook':
+            escritor = csv.writer(arquivo, delimiter=';')
+            escritor.writerow(['palavra_chave', 'eixo_temat', 'peso_interesse', 'peso_risco'])
+            for termo, categoria, interesse, risco in termos:
+                escritor.writerow([termo, categoria, str(interesse).replace('.', ','), str(risco).replace('.', ',')])
+        else:
+            escritor = csv.writer(arquivo)
+            escritor.writerow(['termo', 'categoria', 'peso_interesse', 'peso_risco'])
+            escritor.writerows(termos)
+
+
+def paginas_por_fonte(n_paginas: int) -> Tuple[int, int]:
+    """Divide o total de páginas entre Câmara e Senado"""
+    return (n_paginas + 1) // 2, n_paginas // 2
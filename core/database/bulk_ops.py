@@ -0,0 +1,386 @@
+# -*- coding: utf-8 -*-
+"""
+Operações em lote sobre noticias e scores_faciap
+
+Cada lote é gravado com executemany em uma única transação, e as funções
+de escrita retornam quantas linhas foram inseridas, atualizadas e ignoradas.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+# Abaixo do limite de parâmetros por comando do SQLite: só divide as
+# listas de um IN (...), não as transações
+TAMANHO_LOTE_PARAMETROS = 500
+
+# Linhas por transação nas gravações em lote
+TAMANHO_LOTE_ESCRITA = 1000
+
+# Política de revisita: notícias publicadas nos últimos JANELA_REVISITA_DIAS
+# têm o texto buscado de novo (para detectar edições) após REVISITA_DIAS
+REVISITA_DIAS = int(os.getenv('CLIPPING_REVISITA_DIAS', '7'))
+JANELA_REVISITA_DIAS = int(os.getenv('CLIPPING_JANELA_REVISITA_DIAS', '30'))
+
+_SQL_UPSERT_NOTICIA = """
+    INSERT INTO noticias (titulo, fonte, link, data_publicacao, data_coleta)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (link) DO UPDATE SET
+        titulo = excluded.titulo,
+        fonte = excluded.fonte,
+        data_publicacao = excluded.data_publicacao
+"""
+
+_SQL_UPSERT_SCORE = """
+    INSERT INTO scores_faciap
+        (noticia_id, score_interesse, score_risco, categorias, categoria_dominante,
+         data_calculo, dicionario_hash)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (noticia_id, dicionario_hash) DO UPDATE SET
+        score_interesse = excluded.score_interesse,
+        score_risco = excluded.score_risco,
+        categorias = excluded.categorias,
+        categoria_dominante = excluded.categoria_dominante,
+        data_calculo = excluded.data_calculo
+"""
+
+_SQL_ESPELHA_SCORE = """
+    UPDATE noticias SET score_interesse = ?, score_risco = ?, categorias = ?, categoria_dominante = ?,
+        score_versao = ?
+    WHERE id = ?
+"""
+
+
+def _em_lotes(itens: Sequence, tamanho: int) -> Iterator[Sequence]:
+    for inicio in range(0, len(itens), tamanho):
+        yield itens[inicio:inicio + tamanho]
+
+
+def _consultar_em(conn: sqlite3.Connection, sql: str, valores: Sequence,
+                  prefixo: Sequence = ()) -> Iterator[tuple]:
+    """
+    Executa `sql`, cujo IN ({marcadores}) recebe os valores, em consultas de
+    até TAMANHO_LOTE_PARAMETROS parâmetros
+
+    Args:
+        conn: Conexão com o banco
+        sql: Consulta com o marcador {marcadores}
+        valores: Valores da lista IN
+        prefixo: Parâmetros que antecedem a lista IN
+    """
+    for parte in _em_lotes(valores, TAMANHO_LOTE_PARAMETROS):
+        marcadores = ','.join('?' * len(parte))
+        yield from conn.execute(sql.format(marcadores=marcadores), [*prefixo, *parte])
+
+
+def links_existentes(conn: sqlite3.Connection, links: Iterable[str]) -> Set[str]:
+    """
+    Retorna quais dos links já estão gravados em noticias
+
+    Args:
+        conn: Conexão com o banco
+        links: Links a verificar
+    """
+    links: List[str] = list(dict.fromkeys(links))
+    existentes: Set[str] = set()
+    for lote in _em_lotes(links, TAMANHO_LOTE_PARAMETROS):
+        marcadores = ','.join('?' * len(lote))
+        existentes.update(
+            row[0] for row in conn.execute(
+                f"SELECT link FROM noticias WHERE link IN ({marcadores})", lote
+            )
+        )
+    return existentes
+
+
+def links_sem_texto(conn: sqlite3.Connection, limite: Optional[int] = None) -> List[str]:
+    """
+    Links das notícias ainda sem texto extraído, das mais recentes às mais antigas
+
+    Args:
+        conn: Conexão com o banco
+        limite: Número máximo de links (todos se None)
+    """
+    sql = ("SELECT link FROM noticias WHERE texto_completo IS NULL OR texto_completo = '' "
+           "ORDER BY data_publicacao DESC")
+    if limite is not None:
+        sql += f" LIMIT {int(limite)}"
+    return [row[0] for row in conn.execute(sql)]
+
+
+def links_a_extrair(conn: sqlite3.Connection, links: Iterable[str],
+                    revisita_dias: int = REVISITA_DIAS,
+                    janela_dias: int = JANELA_REVISITA_DIAS) -> List[str]:
+    """
+    Filtra os links cujo texto precisa ser buscado
+
+    Entram os links sem texto gravado (ou ainda não gravados) e os de
+    notícias recentes cujo texto não é verificado há `revisita_dias`.
+
+    Args:
+        conn: Conexão com o banco
+        links: Links candidatos
+        revisita_dias: Dias até uma nova verificação do texto (0 revisita sempre)
+        janela_dias: Só notícias publicadas nestes últimos dias são revisitadas
+
+    Returns:
+        Links a extrair, na ordem recebida
+    """
+    links = list(dict.fromkeys(links))
+    agora = datetime.now()
+    verificado_antes = _formatar_data(agora - timedelta(days=revisita_dias))
+    publicado_desde = _formatar_data(agora - timedelta(days=janela_dias))
+
+    atuais: Set[str] = set()
+    for lote in _em_lotes(links, TAMANHO_LOTE_PARAMETROS):
+        marcadores = ','.join('?' * len(lote))
+        atuais.update(
+            row[0] for row in conn.execute(
+                f"""
+                SELECT link FROM noticias
+                WHERE link IN ({marcadores})
+                    AND texto_completo IS NOT NULL AND texto_completo != ''
+                    AND NOT (
+                        (texto_verificado_em IS NULL OR texto_verificado_em < ?)
+                        AND data_publicacao >= ?
+                    )
+                """,
+                list(lote) + [verificado_antes, publicado_desde]
+            )
+        )
+    return [link for link in links if link not in atuais]
+
+
+def hash_texto(texto: str) -> str:
+    """Hash do texto extraído (noticias.texto_hash)"""
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+
+def _formatar_data(valor) -> Optional[str]:
+    """
+    Datas no mesmo formato texto já usado no banco ('AAAA-MM-DD HH:MM:SS[.ffffff]',
+    com espaço, como o CURRENT_TIMESTAMP do SQLite)
+
+    Todas as colunas de data gravadas aqui passam por este formato, para que
+    as comparações como texto (revisita, retenção) sejam cronológicas.
+    """
+    if isinstance(valor, datetime):
+        return str(valor)
+    return valor
+
+
+def save_noticias_bulk(conn: sqlite3.Connection, noticias: Iterable[dict],
+                       tamanho_lote: int = TAMANHO_LOTE_ESCRITA) -> Dict[str, int]:
+    """
+    Insere ou atualiza notícias pelo link
+
+    Notícias sem link ou título, ou idênticas às já gravadas, são ignoradas.
+
+    Args:
+        conn: Conexão com o banco
+        noticias: Dicionários com titulo, fonte, link, data_publicacao e data_coleta
+        tamanho_lote: Notícias por transação
+
+    Returns:
+        {'inseridas': n, 'atualizadas': n, 'ignoradas': n}
+    """
+    contagem = {'inseridas': 0, 'atualizadas': 0, 'ignoradas': 0}
+
+    # Deduplica por link (a última ocorrência prevalece)
+    por_link: Dict[str, tuple] = {}
+    for noticia in noticias:
+        link, titulo = noticia.get('link'), noticia.get('titulo')
+        if not link or not titulo:
+            contagem['ignoradas'] += 1
+            continue
+        if link in por_link:
+            contagem['ignoradas'] += 1
+        por_link[link] = (
+            titulo,
+            noticia.get('fonte') or '',
+            link,
+            _formatar_data(noticia.get('data_publicacao')),
+            _formatar_data(noticia.get('data_coleta') or datetime.now())
+        )
+
+    linhas = list(por_link.values())
+    for lote in _em_lotes(linhas, tamanho_lote):
+        gravadas = {
+            row[0]: row[1:] for row in _consultar_em(
+                conn, "SELECT link, titulo, fonte, data_publicacao FROM noticias WHERE link IN ({marcadores})",
+                [linha[2] for linha in lote]
+            )
+        }
+
+        alteradas = []
+        for linha in lote:
+            atual = gravadas.get(linha[2])
+            if atual is None:
+                contagem['inseridas'] += 1
+            elif atual == (linha[0], linha[1], linha[3]):
+                contagem['ignoradas'] += 1
+                continue
+            else:
+                contagem['atualizadas'] += 1
+            alteradas.append(linha)
+
+        if alteradas:
+            with conn:
+                conn.executemany(_SQL_UPSERT_NOTICIA, alteradas)
+
+    return contagem
+
+
+def save_scores_bulk(conn: sqlite3.Connection, scores: Iterable[dict], dicionario_hash: str,
+                     tamanho_lote: int = TAMANHO_LOTE_ESCRITA) -> Dict[str, int]:
+    """
+    Grava scores em scores_faciap e os espelha em noticias (com score_versao)
+
+    Args:
+        conn: Conexão com o banco
+        scores: Dicionários com noticia_id, score_interesse, score_risco, categorias
+            e categoria_dominante (opcional)
+        dicionario_hash: Versão do dicionário/scorer que gerou os scores
+        tamanho_lote: Scores por transação
+
+    Returns:
+        {'inseridas': n, 'atualizadas': n, 'ignoradas': n}
+    """
+    contagem = {'inseridas': 0, 'atualizadas': 0, 'ignoradas': 0}
+    agora = _formatar_data(datetime.now())
+
+    linhas = []
+    for score in scores:
+        if score.get('noticia_id') is None:
+            contagem['ignoradas'] += 1
+            continue
+        categorias = score.get('categorias') or []
+        if not isinstance(categorias, str):
+            categorias = json.dumps(list(categorias), ensure_ascii=False)
+        linhas.append((
+            score['noticia_id'],
+            float(score.get('score_interesse') or 0),
+            float(score.get('score_risco') or 0),
+            categorias,
+            score.get('categoria_dominante'),
+            agora,
+            dicionario_hash
+        ))
+
+    for lote in _em_lotes(linhas, tamanho_lote):
+        existentes = {
+            row[0] for row in _consultar_em(
+                conn,
+                "SELECT noticia_id FROM scores_faciap WHERE dicionario_hash = ? AND noticia_id IN ({marcadores})",
+                [linha[0] for linha in lote], (dicionario_hash,)
+            )
+        }
+        with conn:
+            conn.executemany(_SQL_UPSERT_SCORE, lote)
+            conn.executemany(
+                _SQL_ESPELHA_SCORE,
+                [(linha[1], linha[2], linha[3], linha[4], dicionario_hash, linha[0]) for linha in lote]
+            )
+
+        atualizadas = sum(1 for linha in lote if linha[0] in existentes)
+        contagem['atualizadas'] += atualizadas
+        contagem['inseridas'] += len(lote) - atualizadas
+
+    return contagem
+
+
+def update_textos_bulk(conn: sqlite3.Connection, textos: Iterable[Tuple[str, str]],
+                       tamanho_lote: int = TAMANHO_LOTE_ESCRITA) -> Dict[str, int]:
+    """
+    Grava os textos extraídos, um lote por transação
+
+    O texto só é regravado quando o hash muda; um texto idêntico ao gravado
+    apenas atualiza texto_verificado_em, sem invalidar o score nem o índice
+    de busca.
+
+    Args:
+        conn: Conexão com o banco
+        textos: Pares (link, texto_completo)
+        tamanho_lote: Textos por transação
+
+    Returns:
+        {'inseridas': textos novos, 'atualizadas': textos alterados,
+        'ignoradas': textos inalterados e links inexistentes}
+    """
+    contagem = {'inseridas': 0, 'atualizadas': 0, 'ignoradas': 0}
+    linhas = [(link, texto, hash_texto(texto)) for link, texto in textos]
+    agora = _formatar_data(datetime.now())
+
+    for lote in _em_lotes(linhas, tamanho_lote):
+        gravados = dict(_consultar_em(
+            conn, "SELECT link, COALESCE(texto_hash, '') FROM noticias WHERE link IN ({marcadores})",
+            [linha[0] for linha in lote]
+        ))
+
+        alterados, verificados = [], []
+        for link, texto, hash_novo in lote:
+            if link not in gravados:
+                contagem['ignoradas'] += 1
+            elif gravados[link] == hash_novo:
+                contagem['ignoradas'] += 1
+                verificados.append((agora, link))
+            else:
+                contagem['inseridas' if not gravados[link] else 'atualizadas'] += 1
+                alterados.append((texto, hash_novo, agora, link))
+
+        with conn:
+            conn.executemany(
+                "UPDATE noticias SET texto_completo = ?, texto_hash = ?, texto_verificado_em = ? WHERE link = ?",
+                alterados
+            )
+            conn.executemany("UPDATE noticias SET texto_verificado_em = ? WHERE link = ?", verificados)
+
+    return contagem
+
+
+def lemas_em_cache(conn: sqlite3.Connection, modelo: str, hashes: Iterable[str]) -> Dict[str, str]:
+    """
+    Busca lemas já calculados em lemas_cache
+
+    Args:
+        conn: Conexão com o banco
+        modelo: Modelo spaCy que gerou os lemas
+        hashes: Hashes dos textos limpos
+
+    Returns:
+        {texto_hash: lema} dos hashes encontrados
+    """
+    encontrados: Dict[str, str] = {}
+    for lote in _em_lotes(list(set(hashes)), TAMANHO_LOTE_PARAMETROS):
+        marcadores = ','.join('?' * len(lote))
+        encontrados.update(conn.execute(
+            f"SELECT texto_hash, lema FROM lemas_cache WHERE modelo = ? AND texto_hash IN ({marcadores})",
+            [modelo, *lote]
+        ))
+    return encontrados
+
+
+def save_lemas_bulk(conn: sqlite3.Connection, modelo: str, lemas: Iterable[Tuple[str, str]],
+                    tamanho_lote: int = TAMANHO_LOTE_ESCRITA) -> int:
+    """
+    Grava lemas em lemas_cache, um lote por transação
+
+    Args:
+        conn: Conexão com o banco
+        modelo: Modelo spaCy que gerou os lemas
+        lemas: Pares (texto_hash, lema)
+        tamanho_lote: Lemas por transação
+
+    Returns:
+        Quantidade de lemas gravados
+    """
+    linhas = [(texto_hash, modelo, lema) for texto_hash, lema in lemas]
+    for lote in _em_lotes(linhas, tamanho_lote):
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO lemas_cache (texto_hash, modelo, lema) VALUES (?, ?, ?)", lote
+            )
+    return len(linhas)
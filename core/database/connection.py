@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+Conexões SQLite com o banco clipping_faciap.db
+
+- `connect`: conexão avulsa, para scripts e para a linha de comando
+- `conexao_leitura` / `conexao_escrita`: conexões emprestadas de um pool
+  por processo, usadas pelos backends Flask. Cada conexão é aberta uma vez,
+  com os PRAGMAs aplicados e o cache de comandos preparados do sqlite3
+  preservado entre requisições. As de leitura são abertas em modo somente
+  leitura (mode=ro e query_only)
+
+O pool é seguro entre threads (servidor threaded do Flask, gunicorn
+gthread) e entre workers do gunicorn: após um fork, o processo filho
+descarta as conexões herdadas e abre as suas.
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+
+DB_PATH = os.getenv('CLIPPING_DB_PATH', 'clipping_faciap.db')
+
+# Aplicados a cada conexão. journal_mode=WAL é persistente e é ativado pela
+# migração 0002; leitores da API não bloqueiam durante a escrita do coletor.
+PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA mmap_size=268435456",
+)
+
+
+# Comandos preparados mantidos por conexão (cache do módulo sqlite3)
+COMANDOS_PREPARADOS = 256
+
+# Conexões ociosas mantidas por pool; as excedentes são fechadas ao voltar
+MAXIMO_OCIOSAS = int(os.getenv('CLIPPING_DB_POOL', '8'))
+
+
+def connect(path: Optional[str] = None, timeout: float = 30) -> sqlite3.Connection:
+    """
+    Abre uma conexão com o banco já configurada
+
+    Args:
+        path: Caminho do banco (DB_PATH se None)
+        timeout: Espera máxima por locks em segundos (busy timeout)
+    """
+    conn = sqlite3.connect(path or DB_PATH, timeout=timeout)
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+class PoolConexoes:
+    """
+    Conexões reutilizáveis com um banco, emprestadas uma por vez
+
+    Uma conexão emprestada pertence a quem a pegou até ser devolvida; o
+    pool só guarda as ociosas. Não há limite de conexões em uso: o SQLite
+    serializa os escritores e o busy timeout cobre a espera.
+    """
+
+    def __init__(self, path: Optional[str] = None, somente_leitura: bool = False,
+                 maximo_ociosas: int = MAXIMO_OCIOSAS, timeout: float = 30):
+        self.path = os.path.abspath(path or DB_PATH)
+        self.somente_leitura = somente_leitura
+        self.maximo_ociosas = maximo_ociosas
+        self.timeout = timeout
+        self._ociosas: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def _abrir(self) -> sqlite3.Connection:
+        if self.somente_leitura:
+            conn = sqlite3.connect(
+                f"file:{quote(self.path)}?mode=ro", uri=True, timeout=self.timeout,
+                check_same_thread=False, cached_statements=COMANDOS_PREPARADOS
+            )
+        else:
+            conn = sqlite3.connect(
+                self.path, timeout=self.timeout,
+                check_same_thread=False, cached_statements=COMANDOS_PREPARADOS
+            )
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        if self.somente_leitura:
+            conn.execute("PRAGMA query_only=ON")
+        return conn
+
+    def _verificar_fork(self) -> None:
+        # Conexões SQLite não podem ser usadas (nem fechadas) no filho de um fork
+        if self._pid != os.getpid():
+            self._ociosas = []
+            self._pid = os.getpid()
+
+    def emprestar(self) -> sqlite3.Connection:
+        with self._lock:
+            self._verificar_fork()
+            if self._ociosas:
+                return self._ociosas.pop()
+        return self._abrir()
+
+    def devolver(self, conn: sqlite3.Connection) -> None:
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            self._verificar_fork()
+            if len(self._ociosas) < self.maximo_ociosas:
+                self._ociosas.append(conn)
+                return
+        conn.close()
+
+    @contextmanager
+    def conexao(self) -> Iterator[sqlite3.Connection]:
+        """Empresta uma conexão pelo bloco with"""
+        conn = self.emprestar()
+        try:
+            yield conn
+        finally:
+            self.devolver(conn)
+
+    def fechar(self) -> None:
+        """Fecha as conexões ociosas"""
+        with self._lock:
+            ociosas, self._ociosas = self._ociosas, []
+        for conn in ociosas:
+            conn.close()
+
+
+_pools: Dict[Tuple[str, bool], PoolConexoes] = {}
+_pools_lock = threading.Lock()
+
+
+def obter_pool(path: Optional[str] = None, somente_leitura: bool = False) -> PoolConexoes:
+    """Pool do processo para o banco (um para leitura e um para escrita)"""
+    chave = (os.path.abspath(path or DB_PATH), somente_leitura)
+    pool = _pools.get(chave)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(chave)
+            if pool is None:
+                pool = _pools[chave] = PoolConexoes(chave[0], somente_leitura)
+    return pool
+
+
+@contextmanager
+def conexao_leitura(path: Optional[str] = None) -> Iterator[sqlite3.Connection]:
+    """
+    Conexão somente leitura do pool
+
+    Args:
+        path: Caminho do banco (DB_PATH se None); o banco precisa existir
+    """
+    with obter_pool(path, somente_leitura=True).conexao() as conn:
+        yield conn
+
+
+@contextmanager
+def conexao_escrita(path: Optional[str] = None) -> Iterator[sqlite3.Connection]:
+    """
+    Conexão de escrita do pool, com o bloco em uma transação
+
+    Confirma ao sair do bloco e desfaz se houver exceção.
+
+    Args:
+        path: Caminho do banco (DB_PATH se None)
+    """
+    with obter_pool(path).conexao() as conn:
+        with conn:
+            yield conn
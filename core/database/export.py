@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+Exportação em fluxo de notícias com scores (CSV, NDJSON e Parquet)
+
+As linhas saem do banco por um cursor lido em lotes (fetchmany) e cada lote
+é serializado e entregue antes do próximo ser lido; a memória usada não
+depende do número de notícias exportadas. No Parquet, cada lote vira um
+row group.
+
+Os scores e categorias exportados são os espelhados em noticias, da versão
+registrada em noticias.score_versao.
+"""
+
+import csv
+import io
+import json
+import sqlite3
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+from core.scoring.score_cache import decodificar_categorias
+
+FORMATOS = {
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'ndjson': ('application/x-ndjson; charset=utf-8', 'ndjson'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+
+# Linhas lidas do banco e serializadas por vez (um row group no Parquet)
+TAMANHO_LOTE_EXPORTACAO = 5000
+
+COLUNAS = (
+    'id', 'titulo', 'fonte', 'link', 'data_publicacao', 'data_coleta',
+    'score_interesse', 'score_risco', 'favorita', 'categorias', 'categoria_dominante',
+)
+COLUNA_TEXTO = 'texto_completo'
+
+
+def colunas_exportadas(incluir_texto: bool = False) -> Tuple[str, ...]:
+    return COLUNAS + ((COLUNA_TEXTO,) if incluir_texto else ())
+
+
+def lotes_exportacao(conn: sqlite3.Connection, data_inicio: Optional[str] = None,
+                     data_fim: Optional[str] = None, fonte: Optional[str] = None,
+                     score_min: Optional[float] = None, incluir_texto: bool = False,
+                     tamanho_lote: int = TAMANHO_LOTE_EXPORTACAO) -> Iterator[List[tuple]]:
+    """
+    Lê as notícias filtradas em lotes, na ordem do id
+
+    Args:
+        conn: Conexão com o banco
+        data_inicio: Data mínima de publicação (AAAA-MM-DD)
+        data_fim: Data máxima de publicação, inclusiva (AAAA-MM-DD)
+        fonte: Fonte exata
+        score_min: Score total (interesse + risco) mínimo
+        incluir_texto: Exporta também o texto completo
+        tamanho_lote: Linhas por lote
+
+    Yields:
+        Listas de tuplas na ordem de colunas_exportadas(incluir_texto),
+        com categorias já decodificadas em lista
+    """
+    condicoes = []
+    parametros: list = []
+    if data_inicio:
+        condicoes.append("n.data_publicacao >= ?")
+        parametros.append(data_inicio)
+    if data_fim:
+        condicoes.append("n.data_publicacao < date(?, '+1 day')")
+        parametros.append(data_fim)
+    if fonte:
+        condicoes.append("n.fonte = ?")
+        parametros.append(fonte)
+    if score_min is not None:
+        condicoes.append("(n.score_interesse + n.score_risco) >= ?")
+        parametros.append(float(score_min))
+
+    where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+    texto = f", n.{COLUNA_TEXTO}" if incluir_texto else ""
+    cursor = conn.execute(f"""
+        SELECT n.id, n.titulo, n.fonte, n.link, n.data_publicacao, n.data_coleta,
+               n.score_interesse, n.score_risco, n.favorita, n.categorias, n.categoria_dominante{texto}
+        FROM noticias n
+        {where}
+        ORDER BY n.id
+    """, parametros)
+
+    indice_categorias = COLUNAS.index('categorias')
+    indice_favorita = COLUNAS.index('favorita')
+    try:
+        while True:
+            linhas = cursor.fetchmany(tamanho_lote)
+            if not linhas:
+                return
+            lote = []
+            for linha in linhas:
+                linha = list(linha)
+                linha[indice_favorita] = bool(linha[indice_favorita])
+                linha[indice_categorias] = decodificar_categorias(linha[indice_categorias])
+                lote.append(tuple(linha))
+            yield lote
+    finally:
+        cursor.close()
+
+
+def gerar_csv(lotes: Iterator[List[tuple]], incluir_texto: bool = False) -> Iterator[str]:
+    """CSV com cabeçalho; categorias separadas por '; '"""
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    escritor.writerow(colunas_exportadas(incluir_texto))
+    indice_categorias = COLUNAS.index('categorias')
+    for lote in lotes:
+        for linha in lote:
+            linha = list(linha)
+            linha[indice_categorias] = '; '.join(linha[indice_categorias])
+            escritor.writerow(linha)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def gerar_ndjson(lotes: Iterator[List[tuple]], incluir_texto: bool = False) -> Iterator[str]:
+    """Um objeto JSON por linha"""
+    colunas = colunas_exportadas(incluir_texto)
+    for lote in lotes:
+        yield ''.join(
+            json.dumps(dict(zip(colunas, linha)), ensure_ascii=False) + '\n' for linha in lote
+        )
+
+
+class _SaidaEmPartes(io.RawIOBase):
+    """Destino não pesquisável que acumula o que o ParquetWriter escreve até ser drenado"""
+
+    def __init__(self):
+        self._partes: List[bytes] = []
+        self._posicao = 0
+
+    def writable(self):
+        return True
+
+    def write(self, dados) -> int:
+        self._partes.append(bytes(dados))
+        self._posicao += len(dados)
+        return len(dados)
+
+    def tell(self) -> int:
+        return self._posicao
+
+    def drenar(self) -> bytes:
+        dados = b''.join(self._partes)
+        self._partes = []
+        return dados
+
+
+def _schema_parquet(incluir_texto: bool):
+    import pyarrow as pa
+
+    campos = [
+        ('id', pa.int64()), ('titulo', pa.string()), ('fonte', pa.string()), ('link', pa.string()),
+        ('data_publicacao', pa.string()), ('data_coleta', pa.string()),
+        ('score_interesse', pa.float64()), ('score_risco', pa.float64()),
+        ('favorita', pa.bool_()), ('categorias', pa.list_(pa.string())),
+        ('categoria_dominante', pa.string()),
+    ]
+    if incluir_texto:
+        campos.append((COLUNA_TEXTO, pa.string()))
+    return pa.schema(campos)
+
+
+def gerar_parquet(lotes: Iterator[List[tuple]], incluir_texto: bool = False) -> Iterator[bytes]:
+    """Parquet (zstd) com um row group por lote, entregue à medida que é escrito"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _schema_parquet(incluir_texto)
+    saida = _SaidaEmPartes()
+    with pq.ParquetWriter(pa.PythonFile(saida, mode='w'), schema, compression='zstd') as escritor:
+        for lote in lotes:
+            colunas = list(zip(*lote))
+            escritor.write_table(pa.Table.from_arrays(
+                [pa.array(valores, type=campo.type) for valores, campo in zip(colunas, schema)],
+                schema=schema
+            ))
+            yield saida.drenar()
+    yield saida.drenar()
+
+
+def gerar_exportacao(conn: sqlite3.Connection, formato: str, incluir_texto: bool = False,
+                     tamanho_lote: int = TAMANHO_LOTE_EXPORTACAO, **filtros) -> Iterator:
+    """
+    Exportação no formato pedido, em pedaços (str para csv/ndjson, bytes para parquet)
+
+    Raises:
+        ValueError: formato desconhecido
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"formato deve ser um de: {', '.join(FORMATOS)}")
+    lotes = lotes_exportacao(conn, incluir_texto=incluir_texto, tamanho_lote=tamanho_lote, **filtros)
+    gerador = {'csv': gerar_csv, 'ndjson': gerar_ndjson, 'parquet': gerar_parquet}[formato]
+    return gerador(lotes, incluir_texto)
+
+
+def exportar(conn: sqlite3.Connection, formato: str, destino: BinaryIO,
+             incluir_texto: bool = False, **filtros) -> int:
+    """
+    Grava a exportação em um arquivo binário aberto
+
+    Returns:
+        Bytes escritos
+    """
+    escritos = 0
+    for parte in gerar_exportacao(conn, formato, incluir_texto, **filtros):
+        if isinstance(parte, str):
+            parte = parte.encode('utf-8')
+        destino.write(parte)
+        escritos += len(parte)
+    return escritos
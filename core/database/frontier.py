@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""
+Fronteira persistente da coleta (migração 0009)
+
+A tabela fronteira guarda o trabalho ainda não concluído da coleta:
+
+- Páginas de listagem de uma coleta em andamento (o checkpoint por fonte).
+  Cada página concluída é marcada junto com as notícias que ela trouxe; se
+  o processo cair, uma coleta com retomada (main.py --resume) busca só as
+  páginas que faltam em vez de recomeçar da página 1. O checkpoint é
+  apagado quando a fonte termina sem erros
+- Notícias descobertas cujo texto ainda não foi extraído. A linha sai da
+  fronteira quando a extração grava o texto
+
+Falhas (de página ou de extração) voltam a ser tentadas com backoff
+exponencial: BACKOFF_BASE segundos, dobrando a cada tentativa até
+BACKOFF_MAXIMO. Depois de MAX_TENTATIVAS a entrada fica como 'abandonada'.
+"""
+
+import json
+import sqlite3
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from core.database.connection import connect
+
+MAX_TENTATIVAS = 6
+
+# Segundos até a primeira nova tentativa e teto do backoff
+BACKOFF_BASE = 300
+BACKOFF_MAXIMO = 12 * 3600
+
+# Campos da notícia guardados em dados (o link é a própria url)
+CAMPOS_NOTICIA = ('titulo', 'data_publicacao', 'data_texto', 'data_coleta')
+
+_SQL_INSERE = """
+    INSERT INTO fronteira (url, tipo, fonte, pagina, dados, atualizado_em)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT (url) DO NOTHING
+"""
+
+# No SET, `tentativas` é sempre o valor anterior à atualização
+_SQL_FALHA = """
+    UPDATE fronteira SET
+        tentativas = tentativas + 1,
+        status = CASE WHEN tentativas + 1 >= ? THEN 'abandonada' ELSE 'falha' END,
+        proxima_tentativa = datetime(?, '+' || MIN(? * (1 << MIN(tentativas, 20)), ?) || ' seconds'),
+        ultimo_erro = ?,
+        atualizado_em = ?
+    WHERE url = ?
+"""
+
+
+class CheckpointListagem(NamedTuple):
+    """Estado da coleta de listagens de uma fonte"""
+    concluidas: Set[int]
+    aguardando: Set[int]
+    limite: int
+    pagina_final: Optional[int]
+    retomada: bool
+
+
+def _agora() -> str:
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _dados_noticia(noticia: dict) -> str:
+    return json.dumps(
+        {campo: noticia.get(campo) for campo in CAMPOS_NOTICIA}, ensure_ascii=False, default=str
+    )
+
+
+class Fronteira:
+    """
+    Acesso à fronteira; cada operação usa sua própria conexão e pode ser
+    chamada de várias threads
+    """
+
+    def __init__(self, db_path: Optional[str] = None, max_tentativas: int = MAX_TENTATIVAS,
+                 backoff_base: int = BACKOFF_BASE, backoff_maximo: int = BACKOFF_MAXIMO):
+        """
+        Args:
+            db_path: Caminho do banco (DB_PATH se None)
+            max_tentativas: Falhas até a entrada ser abandonada
+            backoff_base: Segundos até a primeira nova tentativa
+            backoff_maximo: Teto do intervalo entre tentativas em segundos
+        """
+        self.db_path = db_path
+        self.max_tentativas = max_tentativas
+        self.backoff_base = backoff_base
+        self.backoff_maximo = backoff_maximo
+
+    def _conectar(self) -> sqlite3.Connection:
+        return connect(self.db_path)
+
+    def _falhas(self, conn: sqlite3.Connection, falhas: Iterable[Tuple[str, str]]) -> None:
+        agora = _agora()
+        conn.executemany(_SQL_FALHA, [
+            (self.max_tentativas, agora, self.backoff_base, self.backoff_maximo, erro[:500], agora, url)
+            for url, erro in falhas
+        ])
+
+    # Listagens
+
+    def retomar_listagem(self, fonte: str, urls: Dict[int, str]) -> CheckpointListagem:
+        """
+        Registra as páginas da coleta e retorna o checkpoint da fonte
+
+        Páginas já registradas por uma coleta interrompida mantêm o estado;
+        o limite passa a ser a maior página entre as duas coletas.
+
+        Args:
+            fonte: Nome da fonte
+            urls: {página: URL} das páginas pedidas nesta coleta
+        """
+        agora = _agora()
+        conn = self._conectar()
+        try:
+            with conn:
+                retomada = conn.execute(
+                    "SELECT EXISTS (SELECT 1 FROM fronteira WHERE tipo = 'listagem' AND fonte = ? "
+                    "AND status != 'pendente')",
+                    (fonte,)
+                ).fetchone()[0]
+                conn.executemany(_SQL_INSERE, [
+                    (url, 'listagem', fonte, pagina, None, agora) for pagina, url in urls.items()
+                ])
+                linhas = conn.execute(
+                    "SELECT pagina, status, proxima_tentativa, dados FROM fronteira "
+                    "WHERE tipo = 'listagem' AND fonte = ?",
+                    (fonte,)
+                ).fetchall()
+        finally:
+            conn.close()
+
+        concluidas, aguardando = set(), set()
+        pagina_final = None
+        for pagina, status, proxima, dados in linhas:
+            if status in ('concluida', 'abandonada'):
+                concluidas.add(pagina)
+                if dados and json.loads(dados).get('encerra'):
+                    pagina_final = pagina if pagina_final is None else min(pagina_final, pagina)
+            elif status == 'falha' and proxima and proxima > agora:
+                aguardando.add(pagina)
+        limite = max([pagina for pagina, *_ in linhas] or [0])
+        return CheckpointListagem(concluidas, aguardando, limite, pagina_final, bool(retomada))
+
+    def concluir_listagem(self, fonte: str, url: str, noticias: List[dict], encerra: bool) -> None:
+        """
+        Marca a página como concluída e registra suas notícias, na mesma transação
+
+        Args:
+            fonte: Nome da fonte
+            url: URL da página
+            noticias: Notícias encontradas na página
+            encerra: A página encerrou a coleta da fonte
+        """
+        agora = _agora()
+        conn = self._conectar()
+        try:
+            with conn:
+                conn.executemany(_SQL_INSERE, [
+                    (n['link'], 'noticia', n.get('fonte') or fonte, None, _dados_noticia(n), agora)
+                    for n in noticias if n.get('link')
+                ])
+                conn.execute(
+                    "UPDATE fronteira SET status = 'concluida', dados = ?, ultimo_erro = NULL, "
+                    "atualizado_em = ? WHERE url = ?",
+                    (json.dumps({'encerra': bool(encerra), 'noticias': len(noticias)}), agora, url)
+                )
+        finally:
+            conn.close()
+
+    def encerrar_listagem(self, fonte: str) -> None:
+        """Apaga o checkpoint da fonte (a coleta terminou sem erros)"""
+        conn = self._conectar()
+        try:
+            with conn:
+                conn.execute("DELETE FROM fronteira WHERE tipo = 'listagem' AND fonte = ?", (fonte,))
+        finally:
+            conn.close()
+
+    def falhar(self, url: str, erro: str) -> None:
+        """Registra uma falha e agenda a próxima tentativa"""
+        conn = self._conectar()
+        try:
+            with conn:
+                self._falhas(conn, [(url, erro)])
+        finally:
+            conn.close()
+
+    # Notícias
+
+    def registrar_noticias(self, noticias: Iterable[dict]) -> int:
+        """
+        Registra notícias a extrair (as já presentes mantêm o estado)
+
+        Returns:
+            Quantidade de notícias novas na fronteira
+        """
+        agora = _agora()
+        conn = self._conectar()
+        try:
+            with conn:
+                antes = conn.total_changes
+                conn.executemany(_SQL_INSERE, [
+                    (n['link'], 'noticia', n.get('fonte') or '', None, _dados_noticia(n), agora)
+                    for n in noticias if n.get('link')
+                ])
+                return conn.total_changes - antes
+        finally:
+            conn.close()
+
+    def noticias_pendentes(self, limite: Optional[int] = None) -> List[dict]:
+        """
+        Notícias a extrair nesta execução: novas e falhas cujo backoff venceu
+
+        Returns:
+            Dicionários com link, fonte, titulo, data_publicacao, data_texto e data_coleta
+        """
+        sql = ("SELECT url, fonte, dados FROM fronteira WHERE tipo = 'noticia' "
+               "AND (status = 'pendente' OR (status = 'falha' AND proxima_tentativa <= ?)) ORDER BY rowid")
+        parametros: list = [_agora()]
+        if limite is not None:
+            sql += " LIMIT ?"
+            parametros.append(int(limite))
+        conn = self._conectar()
+        try:
+            linhas = conn.execute(sql, parametros).fetchall()
+        finally:
+            conn.close()
+        return [{**json.loads(dados or '{}'), 'link': url, 'fonte': fonte} for url, fonte, dados in linhas]
+
+    def registrar_extracoes(self, resultados: Iterable[Tuple[str, Optional[str]]]) -> None:
+        """
+        Resultado da extração: (link, None) sai da fronteira, (link, erro) agenda nova tentativa
+        """
+        resultados = list(resultados)
+        conn = self._conectar()
+        try:
+            with conn:
+                conn.executemany(
+                    "DELETE FROM fronteira WHERE url = ? AND tipo = 'noticia'",
+                    [(link,) for link, erro in resultados if erro is None]
+                )
+                self._falhas(conn, [(link, erro) for link, erro in resultados if erro is not None])
+        finally:
+            conn.close()
+
+    def resumo(self) -> Dict[str, Dict[str, int]]:
+        """Contagem de entradas por tipo e status"""
+        conn = self._conectar()
+        try:
+            linhas = conn.execute(
+                "SELECT tipo, status, count(*) FROM fronteira GROUP BY tipo, status"
+            ).fetchall()
+        finally:
+            conn.close()
+        resumo: Dict[str, Dict[str, int]] = {}
+        for tipo, status, quantidade in linhas:
+            resumo.setdefault(tipo, {})[status] = quantidade
+        return resumo
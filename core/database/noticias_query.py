@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Consulta paginada de notícias com filtros e ordenação no SQL
+
+A paginação é por keyset: o cursor carrega o valor da coluna de ordenação e
+o id da última notícia da página, e a próxima página começa logo depois
+dele usando os índices de ordenação, sem OFFSET.
+"""
+
+import base64
+import json
+import sqlite3
+from typing import List, Optional, Tuple
+
+# Expressões de ordenação (todas decrescentes, desempate por id)
+ORDENACOES = {
+    'data': "n.data_publicacao",
+    'score_interesse': "n.score_interesse",
+    'score_risco': "n.score_risco",
+    'score_total': "(n.score_interesse + n.score_risco)",
+}
+
+LIMITE_PADRAO = 100
+LIMITE_MAXIMO = 500
+
+COLUNAS = (
+    "n.id, n.titulo, n.fonte, n.link, n.data_publicacao, n.texto_completo, "
+    "n.score_interesse, n.score_risco, n.favorita, s.categorias, s.categoria_dominante"
+)
+
+
+def codificar_cursor(valor, noticia_id: int) -> str:
+    """Cursor opaco a partir da última linha da página"""
+    bruto = json.dumps([valor, noticia_id], ensure_ascii=False).encode('utf-8')
+    return base64.urlsafe_b64encode(bruto).decode('ascii')
+
+
+def decodificar_cursor(cursor: str) -> Tuple[object, int]:
+    """Inverso de codificar_cursor; ValueError se inválido"""
+    try:
+        valor, noticia_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return valor, int(noticia_id)
+    except Exception:
+        raise ValueError("cursor inválido")
+
+
+def buscar_noticias(conn: sqlite3.Connection, dicionario_hash: Optional[str],
+                    ordenacao: str = 'data', fonte: Optional[str] = None,
+                    categoria: Optional[str] = None, data_inicio: Optional[str] = None,
+                    data_fim: Optional[str] = None, score_min: Optional[float] = None,
+                    favorita: Optional[bool] = None, cursor: Optional[str] = None,
+                    limite: int = LIMITE_PADRAO) -> Tuple[List[tuple], Optional[str]]:
+    """
+    Busca uma página de notícias
+
+    Args:
+        conn: Conexão com o banco
+        dicionario_hash: Versão do dicionário cujas categorias serão retornadas
+            (None = as da versão gravada em cada notícia)
+        ordenacao: Chave de ORDENACOES
+        fonte: Filtra pela fonte exata
+        categoria: Filtra notícias com esta categoria
+        data_inicio: Data mínima de publicação (AAAA-MM-DD)
+        data_fim: Data máxima de publicação, inclusiva (AAAA-MM-DD)
+        score_min: Score total (interesse + risco) mínimo
+        favorita: Filtra favoritas (True) ou não favoritas (False)
+        cursor: Cursor retornado pela página anterior
+        limite: Tamanho da página
+
+    Returns:
+        (linhas na ordem de COLUNAS, cursor da próxima página ou None)
+    """
+    if ordenacao not in ORDENACOES:
+        raise ValueError(f"ordenacao deve ser uma de: {', '.join(ORDENACOES)}")
+    expressao = ORDENACOES[ordenacao]
+    limite = max(1, min(int(limite), LIMITE_MAXIMO))
+
+    condicoes = []
+    parametros: list = [dicionario_hash]
+
+    if fonte:
+        condicoes.append("n.fonte = ?")
+        parametros.append(fonte)
+    if categoria:
+        condicoes.append("EXISTS (SELECT 1 FROM json_each(s.categorias) WHERE json_each.value = ?)")
+        parametros.append(categoria)
+    if data_inicio:
+        condicoes.append("n.data_publicacao >= ?")
+        parametros.append(data_inicio)
+    if data_fim:
+        condicoes.append("n.data_publicacao < date(?, '+1 day')")
+        parametros.append(data_fim)
+    if score_min is not None:
+        condicoes.append("(n.score_interesse + n.score_risco) >= ?")
+        parametros.append(float(score_min))
+    if favorita is not None:
+        condicoes.append("n.favorita = ?")
+        parametros.append(1 if favorita else 0)
+
+    valor, ultimo_id = decodificar_cursor(cursor) if cursor else (None, None)
+
+    def consultar(condicoes_extras: List[str], parametros_extras: list, quantidade: int) -> List[tuple]:
+        todas = condicoes + condicoes_extras
+        where = f"WHERE {' AND '.join(todas)}" if todas else ""
+        sql = f"""
+            SELECT {COLUNAS}, {expressao}
+            FROM noticias n
+            LEFT JOIN scores_faciap s
+                ON s.noticia_id = n.id AND s.dicionario_hash = COALESCE(?, n.score_versao)
+            {where}
+            ORDER BY {expressao} DESC, n.id DESC
+            LIMIT ?
+        """
+        return conn.execute(sql, parametros + parametros_extras + [quantidade]).fetchall()
+
+    linhas: List[tuple] = []
+    # Fase 1: linhas com valor de ordenação, a partir do cursor (busca no índice)
+    if not (cursor and valor is None):
+        if cursor:
+            linhas = consultar([f"({expressao}, n.id) < (?, ?)"], [valor, ultimo_id], limite + 1)
+        else:
+            linhas = consultar([f"{expressao} IS NOT NULL"], [], limite + 1)
+
+    # Fase 2: linhas sem valor (NULL), que vêm por último na ordem decrescente
+    if len(linhas) <= limite:
+        if cursor and valor is None:
+            linhas += consultar([f"{expressao} IS NULL", "n.id < ?"], [ultimo_id], limite + 1)
+        else:
+            linhas += consultar([f"{expressao} IS NULL"], [], limite + 1 - len(linhas))
+
+    proximo = None
+    if len(linhas) > limite:
+        linhas = linhas[:limite]
+        proximo = codificar_cursor(linhas[-1][-1], linhas[-1][0])
+
+    return [linha[:-1] for linha in linhas], proximo
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+Retenção: notícias antigas saem do banco para um arquivo frio em Parquet
+
+Em vez de apagar, `arquivar_antigas` copia as notícias anteriores ao corte
+(e seus scores_faciap) para arquivos Parquet comprimidos com zstd,
+particionados por mês da publicação no layout Hive:
+
+    arquivo_frio/noticias/ano=2025/mes=07/part-0000000101-0000001100.parquet
+    arquivo_frio/scores_faciap/ano=2025/mes=07/part-0000000101-0000001100.parquet
+
+Cada lote é gravado no Parquet antes de ser apagado do banco, em uma
+transação curta, seguida de um PRAGMA incremental_vacuum (migração 0006);
+leitores da API nunca esperam por um DELETE grande. Se o processo cair
+entre a escrita e o DELETE, o lote é arquivado de novo na próxima
+execução; `consultar_arquivo` descarta as cópias repetidas pelo id.
+
+Notícias favoritas continuam no banco.
+"""
+
+import logging
+import os
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+ARQUIVO_FRIO_PATH_PADRAO = os.getenv('CLIPPING_ARQUIVO_FRIO', 'arquivo_frio')
+
+DIAS_RETENCAO_PADRAO = int(os.getenv('CLIPPING_DIAS_RETENCAO', '90'))
+
+# Notícias por lote (uma transação e um arquivo por partição)
+TAMANHO_LOTE_RETENCAO = 1000
+
+# Páginas devolvidas ao sistema de arquivos após cada lote
+PAGINAS_VACUUM_POR_LOTE = 2000
+
+TABELAS_ARQUIVADAS = ('noticias', 'scores_faciap')
+
+# Data de referência da partição e do corte
+_SQL_DATA_REFERENCIA = "COALESCE(data_publicacao, data_coleta)"
+
+_TIPOS_ARROW = {
+    'INTEGER': pa.int64(),
+    'REAL': pa.float64(),
+    'BOOLEAN': pa.int64(),
+    'BLOB': pa.binary(),
+}
+
+
+def schema_arrow(conn: sqlite3.Connection, tabela: str) -> pa.Schema:
+    """
+    Schema Parquet a partir das colunas declaradas da tabela
+
+    O schema fixo evita que lotes com uma coluna toda nula gerem arquivos
+    com tipos diferentes dentro do mesmo dataset.
+    """
+    campos = []
+    for _, nome, tipo, *_ in conn.execute(f"PRAGMA table_info({tabela})"):
+        campos.append(pa.field(nome, _TIPOS_ARROW.get((tipo or '').upper(), pa.string())))
+    return pa.schema(campos)
+
+
+def _particao(data: Optional[str]) -> str:
+    """'2025-07-17 15:31:00' -> 'ano=2025/mes=07' (datas ilegíveis vão para ano=0000)"""
+    if data and len(data) >= 7 and data[:4].isdigit() and data[5:7].isdigit():
+        return f"ano={data[:4]}/mes={data[5:7]}"
+    return "ano=0000/mes=00"
+
+
+def _gravar_particoes(destino: Path, tabela: str, schema: pa.Schema, linhas: List[tuple],
+                      particoes: List[str], nome_arquivo: str) -> int:
+    """Grava as linhas agrupadas por partição; escrita atômica por arquivo"""
+    por_particao: Dict[str, List[tuple]] = {}
+    for linha, particao in zip(linhas, particoes):
+        por_particao.setdefault(particao, []).append(linha)
+
+    colunas = schema.names
+    for particao, grupo in por_particao.items():
+        diretorio = destino / tabela / particao
+        diretorio.mkdir(parents=True, exist_ok=True)
+        tabela_arrow = pa.Table.from_pydict(
+            {nome: [linha[i] for linha in grupo] for i, nome in enumerate(colunas)}, schema=schema
+        )
+        arquivo = diretorio / nome_arquivo
+        temporario = arquivo.with_name(arquivo.name + '.tmp')
+        pq.write_table(tabela_arrow, temporario, compression='zstd')
+        os.replace(temporario, arquivo)
+    return len(por_particao)
+
+
+def _ids_antigos(conn: sqlite3.Connection, corte: str, apos_id: int, limite: int) -> List[int]:
+    return [row[0] for row in conn.execute(
+        f"SELECT id FROM noticias WHERE {_SQL_DATA_REFERENCIA} < ? AND COALESCE(favorita, 0) = 0 "
+        "AND id > ? ORDER BY id LIMIT ?",
+        (corte, apos_id, limite)
+    )]
+
+
+def arquivar_antigas(conn: sqlite3.Connection, destino: str = ARQUIVO_FRIO_PATH_PADRAO,
+                     dias: int = DIAS_RETENCAO_PADRAO, antes_de: Optional[datetime] = None,
+                     tamanho_lote: int = TAMANHO_LOTE_RETENCAO,
+                     paginas_vacuum: int = PAGINAS_VACUUM_POR_LOTE) -> Dict[str, float]:
+    """
+    Move para o arquivo frio as notícias anteriores ao corte, lote a lote
+
+    Args:
+        conn: Conexão com o banco
+        destino: Diretório do arquivo frio
+        dias: Dias mantidos no banco (ignorado se antes_de for informado)
+        antes_de: Data de corte explícita
+        tamanho_lote: Notícias por lote
+        paginas_vacuum: Páginas liberadas por incremental_vacuum após cada lote (0 desativa)
+
+    Returns:
+        {'noticias', 'scores', 'lotes', 'arquivos', 'paginas_liberadas', 'tempo'}
+    """
+    inicio = time.time()
+    corte = str(antes_de or (datetime.now() - timedelta(days=dias)))
+    destino_path = Path(destino)
+    schemas = {tabela: schema_arrow(conn, tabela) for tabela in TABELAS_ARQUIVADAS}
+    colunas_noticias = ', '.join(schemas['noticias'].names)
+    colunas_scores = ', '.join(f"s.{nome}" for nome in schemas['scores_faciap'].names)
+    paginas_antes = conn.execute("PRAGMA page_count").fetchone()[0]
+
+    stats = {'noticias': 0, 'scores': 0, 'lotes': 0, 'arquivos': 0, 'paginas_liberadas': 0}
+    ultimo_id = 0
+    while True:
+        ids = _ids_antigos(conn, corte, ultimo_id, tamanho_lote)
+        if not ids:
+            break
+        ultimo_id = ids[-1]
+        marcadores = ','.join('?' * len(ids))
+        nome_arquivo = f"part-{ids[0]:010d}-{ids[-1]:010d}.parquet"
+
+        noticias = conn.execute(
+            f"SELECT {colunas_noticias}, {_SQL_DATA_REFERENCIA} FROM noticias WHERE id IN ({marcadores})", ids
+        ).fetchall()
+        particao_por_id = {linha[0]: _particao(linha[-1]) for linha in noticias}
+        scores = conn.execute(
+            f"SELECT {colunas_scores} FROM scores_faciap s WHERE s.noticia_id IN ({marcadores})", ids
+        ).fetchall()
+        indice_noticia = schemas['scores_faciap'].names.index('noticia_id')
+
+        stats['arquivos'] += _gravar_particoes(
+            destino_path, 'noticias', schemas['noticias'], [linha[:-1] for linha in noticias],
+            [particao_por_id[linha[0]] for linha in noticias], nome_arquivo
+        )
+        if scores:
+            stats['arquivos'] += _gravar_particoes(
+                destino_path, 'scores_faciap', schemas['scores_faciap'], scores,
+                [particao_por_id[linha[indice_noticia]] for linha in scores], nome_arquivo
+            )
+
+        # Só apaga depois que o lote está no Parquet
+        with conn:
+            conn.execute(f"DELETE FROM scores_faciap WHERE noticia_id IN ({marcadores})", ids)
+            conn.execute(f"DELETE FROM noticias WHERE id IN ({marcadores})", ids)
+        if paginas_vacuum:
+            # Cada página é um passo do PRAGMA; execute() do sqlite3 só dá o
+            # primeiro, executescript() roda até o fim
+            conn.executescript(f"PRAGMA incremental_vacuum({int(paginas_vacuum)})")
+
+        stats['noticias'] += len(noticias)
+        stats['scores'] += len(scores)
+        stats['lotes'] += 1
+        logger.info(f"🧊 Lote {stats['lotes']}: {len(noticias)} notícias arquivadas em {destino_path}")
+
+    stats['paginas_liberadas'] = paginas_antes - conn.execute("PRAGMA page_count").fetchone()[0]
+    stats['tempo'] = round(time.time() - inicio, 3)
+    return stats
+
+
+def _filtro_periodo(inicio: Optional[str], fim: Optional[str]):
+    """Expressão de filtro por data_publicacao, com poda das partições ano/mes"""
+    filtro = None
+
+    def juntar(expressao):
+        nonlocal filtro
+        filtro = expressao if filtro is None else filtro & expressao
+
+    if inicio:
+        ano, mes = int(inicio[:4]), int(inicio[5:7] or 1)
+        juntar((ds.field('ano') > ano) | ((ds.field('ano') == ano) & (ds.field('mes') >= mes)))
+        juntar(ds.field('data_publicacao') >= inicio)
+    if fim:
+        ano, mes = int(fim[:4]), int(fim[5:7] or 12)
+        juntar((ds.field('ano') < ano) | ((ds.field('ano') == ano) & (ds.field('mes') <= mes)))
+        # '2025-07' e '2025-07-17' incluem o mês/dia inteiro
+        juntar(ds.field('data_publicacao') <= fim + '\uffff')
+    return filtro
+
+
+def dataset_arquivo(destino: str = ARQUIVO_FRIO_PATH_PADRAO, tabela: str = 'noticias') -> ds.Dataset:
+    """
+    Dataset pyarrow de uma tabela arquivada, com as colunas de partição ano e mes
+
+    Para consultas livres: dataset_arquivo().to_table(filter=..., columns=[...]).
+
+    Arquivos gravados antes de uma migração não têm as colunas novas; o
+    schema do dataset é a união dos schemas de todos os arquivos, e as
+    colunas ausentes em um arquivo são lidas como nulas.
+    """
+    if tabela not in TABELAS_ARQUIVADAS:
+        raise ValueError(f"tabela não arquivada: {tabela}")
+    caminho = Path(destino) / tabela
+    schema_particoes = pa.schema([('ano', pa.int32()), ('mes', pa.int32())])
+    particionamento = ds.partitioning(schema_particoes, flavor='hive')
+    if not caminho.exists():
+        raise FileNotFoundError(f"arquivo frio vazio: {caminho}")
+    # Sem schema explícito o pyarrow usaria o do primeiro arquivo encontrado
+    descoberto = ds.dataset(str(caminho), format='parquet', partitioning=particionamento)
+    schema = pa.unify_schemas([pq.read_schema(arquivo) for arquivo in descoberto.files] + [schema_particoes])
+    return ds.dataset(str(caminho), format='parquet', partitioning=particionamento, schema=schema)
+
+
+def consultar_arquivo(destino: str = ARQUIVO_FRIO_PATH_PADRAO, tabela: str = 'noticias',
+                      inicio: Optional[str] = None, fim: Optional[str] = None,
+                      colunas: Optional[Sequence[str]] = None,
+                      noticia_ids: Optional[Iterable[int]] = None):
+    """
+    Lê o arquivo frio como DataFrame, lendo só as partições do período
+
+    Args:
+        destino: Diretório do arquivo frio
+        tabela: 'noticias' ou 'scores_faciap'
+        inicio: Data mínima de publicação ('2025-01' ou '2025-01-15'); só para noticias
+        fim: Data máxima de publicação; só para noticias
+        colunas: Colunas desejadas (todas se None)
+        noticia_ids: Restringe às notícias informadas
+
+    Returns:
+        pandas.DataFrame, sem as cópias repetidas de um lote rearquivado
+    """
+    dataset = dataset_arquivo(destino, tabela)
+    filtro = None
+    if inicio or fim:
+        if tabela != 'noticias':
+            raise ValueError("inicio/fim só se aplicam à tabela noticias; use noticia_ids para scores")
+        filtro = _filtro_periodo(inicio, fim)
+    if noticia_ids is not None:
+        coluna_id = 'id' if tabela == 'noticias' else 'noticia_id'
+        expressao = ds.field(coluna_id).isin(list(noticia_ids))
+        filtro = expressao if filtro is None else filtro & expressao
+
+    chave = ['id'] if tabela == 'noticias' else ['noticia_id', 'dicionario_hash']
+    lidas = None if colunas is None else list(dict.fromkeys(list(colunas) + chave))
+    df = dataset.to_table(columns=lidas, filter=filtro).to_pandas()
+    df = df.drop_duplicates(subset=chave, keep='last')
+    if colunas is not None:
+        df = df[list(colunas)]
+    return df.reset_index(drop=True)
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+Versão do schema do banco clipping_faciap.db
+
+As alterações de schema ficam em migrations/versions (Alembic) e são
+idempotentes. `garantir_schema` só carrega o Alembic quando o banco está
+atrás da revisão esperada pelo código.
+
+As migrações rodam no deploy (`main.py --migrate`), nos comandos da CLI ou
+uma vez na inicialização dos backends (`migrar_na_inicializacao`), nunca
+dentro de uma requisição: algumas (p.ex. o VACUUM da 0006) bloqueiam o
+banco até terminar.
+"""
+
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Revisão mais recente em migrations/versions
+REVISAO_ATUAL = '0013'
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / 'alembic.ini'
+
+_atualizados = set()
+_lock = threading.Lock()
+
+
+def aplicar_migracoes(db_path: Optional[str] = None, revisao: str = 'head') -> None:
+    """
+    Executa `alembic upgrade` no banco
+
+    Args:
+        db_path: Caminho do banco (DB_PATH se None)
+        revisao: Revisão alvo
+    """
+    from alembic import command
+    from alembic.config import Config
+
+    from core.database.connection import DB_PATH
+
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option('script_location', str(ALEMBIC_INI.parent / 'migrations'))
+    config.attributes['db_path'] = db_path or DB_PATH
+    command.upgrade(config, revisao)
+
+
+def revisao_do_banco(conn: sqlite3.Connection) -> Optional[str]:
+    """Revisão registrada pelo Alembic no banco (None se nunca migrado)"""
+    try:
+        row = conn.execute("SELECT version_num FROM alembic_version").fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
+
+
+def garantir_schema(conn: sqlite3.Connection) -> None:
+    """
+    Migra o banco da conexão para REVISAO_ATUAL, se necessário (uma vez por processo)
+
+    Args:
+        conn: Conexão aberta com o banco
+    """
+    db_path = conn.execute("PRAGMA database_list").fetchone()[2]
+    if db_path in _atualizados:
+        return
+
+    with _lock:
+        if db_path in _atualizados:
+            return
+        if revisao_do_banco(conn) != REVISAO_ATUAL:
+            aplicar_migracoes(db_path)
+        _atualizados.add(db_path)
+
+
+def migrar_na_inicializacao(db_path: Optional[str] = None) -> None:
+    """
+    Aplica as migrações pendentes ao iniciar um processo servidor
+
+    Nada é travado se o banco já está em REVISAO_ATUAL. Senão, a trava de
+    execução do banco é tentada sem esperar: com vários processos (workers
+    do gunicorn) só um migra, e os demais, como também um processo iniciado
+    durante uma coleta, seguem sem migrar em vez de bloquear a importação.
+
+    Args:
+        db_path: Caminho do banco (DB_PATH se None)
+    """
+    from core.database.connection import connect
+    from core.scheduler import TravaExecucao, caminho_trava
+
+    conn = connect(db_path)
+    try:
+        if revisao_do_banco(conn) == REVISAO_ATUAL:
+            return
+        trava = TravaExecucao(caminho_trava(db_path))
+        if not trava.adquirir(bloquear=False):
+            logger.warning("Banco em uso por outra execução; migração deixada para ela ou para o próximo início")
+            return
+        try:
+            garantir_schema(conn)
+        finally:
+            trava.liberar()
+    finally:
+        conn.close()
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Busca textual nas notícias via FTS5 (migração 0004)
+"""
+
+import html
+import re
+import sqlite3
+from typing import List, Tuple
+
+LIMITE_PADRAO = 20
+LIMITE_MAXIMO = 100
+
+# Pesos do bm25 por coluna: título vale mais que o corpo
+PESO_TITULO = 10.0
+PESO_TEXTO = 1.0
+
+_TERMO_RE = re.compile(r'\w+\*?')
+
+# Delimitadores do snippet do FTS5, trocados por <mark> depois do escape do texto
+_INICIO_MARCA = '\x02'
+_FIM_MARCA = '\x03'
+
+
+def montar_consulta_fts(q: str) -> str:
+    """
+    Converte o texto digitado em uma consulta FTS5 segura
+
+    Cada palavra vira um termo entre aspas (todos obrigatórios); trechos entre
+    aspas duplas viram frases e `palavra*` busca por prefixo.
+    """
+    partes = []
+    for frase, solto in re.findall(r'"([^"]*)"|([^\s"]+)', q):
+        if frase:
+            tokens = _TERMO_RE.findall(frase.replace('*', ''))
+            if tokens:
+                partes.append('"' + ' '.join(tokens) + '"')
+            continue
+        for termo in _TERMO_RE.findall(solto):
+            if termo.endswith('*'):
+                partes.append(f'"{termo[:-1]}"*')
+            else:
+                partes.append(f'"{termo}"')
+    return ' '.join(partes)
+
+
+def _trecho_html(trecho: str) -> str:
+    """Escapa o trecho (texto das notícias) e só então insere as marcações"""
+    if not trecho:
+        return trecho
+    return (html.escape(trecho, quote=False)
+            .replace(_INICIO_MARCA, '<mark>').replace(_FIM_MARCA, '</mark>'))
+
+
+def buscar_texto(conn: sqlite3.Connection, q: str, pagina: int = 1,
+                 limite: int = LIMITE_PADRAO) -> Tuple[List[tuple], int]:
+    """
+    Busca notícias por relevância (bm25), ignorando acentos e caixa
+
+    Args:
+        conn: Conexão com o banco
+        q: Texto da busca
+        pagina: Página (a partir de 1)
+        limite: Resultados por página
+
+    Returns:
+        (linhas (id, titulo, fonte, link, data_publicacao, score_interesse,
+        score_risco, favorita, trecho, relevancia), total de resultados).
+        O trecho é HTML: texto escapado com os termos entre <mark>
+    """
+    consulta = montar_consulta_fts(q)
+    if not consulta:
+        raise ValueError("parâmetro q vazio")
+
+    limite = max(1, min(int(limite), LIMITE_MAXIMO))
+    pagina = max(1, int(pagina))
+
+    total = conn.execute(
+        "SELECT count(*) FROM noticias_fts WHERE noticias_fts MATCH ?", (consulta,)
+    ).fetchone()[0]
+
+    linhas = conn.execute("""
+        SELECT n.id, n.titulo, n.fonte, n.link, n.data_publicacao,
+               n.score_interesse, n.score_risco, n.favorita,
+               snippet(noticias_fts, -1, ?, ?, '…', 24) AS trecho,
+               bm25(noticias_fts, ?, ?) AS relevancia
+        FROM noticias_fts
+        JOIN noticias n ON n.id = noticias_fts.rowid
+        WHERE noticias_fts MATCH ?
+        ORDER BY relevancia
+        LIMIT ? OFFSET ?
+    """, (_INICIO_MARCA, _FIM_MARCA, PESO_TITULO, PESO_TEXTO, consulta, limite,
+          (pagina - 1) * limite)).fetchall()
+
+    return [tuple(linha[:8]) + (_trecho_html(linha[8]),) + tuple(linha[9:]) for linha in linhas], total
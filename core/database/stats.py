@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Estatísticas do painel lidas das tabelas agregadas (migração 0007)
+
+Os totais por fonte, dia, categoria e faixa de score são mantidos por
+triggers em noticias a cada inserção, alteração e remoção (inclusive as da
+retenção); ler as estatísticas custa o tamanho dos agregados, não o número
+de notícias. As categorias contadas são as da versão de score espelhada em
+noticias.categorias.
+"""
+
+import sqlite3
+from typing import Dict, Optional
+
+# Dias exibidos em por_dia
+DIAS_PADRAO = 30
+
+# Largura das faixas de estatisticas_score (a última agrupa 100 ou mais)
+LARGURA_FAIXA = 10
+
+
+def _rotulo_faixa(faixa: int) -> str:
+    if faixa >= 10 * LARGURA_FAIXA:
+        return f"{faixa}+"
+    return f"{faixa}-{faixa + LARGURA_FAIXA - 1}"
+
+
+def obter_estatisticas(conn: sqlite3.Connection, dias: Optional[int] = DIAS_PADRAO) -> Dict:
+    """
+    Totais do banco a partir das tabelas agregadas
+
+    Args:
+        conn: Conexão com o banco
+        dias: Dias mais recentes em por_dia (todos se None)
+
+    Returns:
+        {'total_noticias', 'noticias_favoritas', 'por_fonte', 'por_categoria',
+        'por_dia', 'distribuicao_scores', 'media_scores_por_fonte'}
+    """
+    por_fonte = {}
+    media_scores = {}
+    total = favoritas = 0
+    for fonte, quantidade, favoritas_fonte, soma_interesse, soma_risco in conn.execute(
+        "SELECT fonte, total, favoritas, soma_interesse, soma_risco FROM estatisticas_fonte "
+        "ORDER BY total DESC"
+    ):
+        por_fonte[fonte] = quantidade
+        media_scores[fonte] = {
+            'score_interesse': round(soma_interesse / quantidade, 2) if quantidade else 0,
+            'score_risco': round(soma_risco / quantidade, 2) if quantidade else 0,
+        }
+        total += quantidade
+        favoritas += favoritas_fonte
+
+    por_categoria = dict(conn.execute(
+        "SELECT categoria, total FROM estatisticas_categoria ORDER BY total DESC, categoria"
+    ).fetchall())
+
+    if dias is None:
+        linhas_dia = conn.execute(
+            "SELECT dia, sum(total) FROM estatisticas_dia GROUP BY dia ORDER BY dia"
+        )
+    else:
+        linhas_dia = conn.execute(
+            "SELECT dia, sum(total) FROM estatisticas_dia WHERE dia >= date('now', ?) "
+            "GROUP BY dia ORDER BY dia",
+            (f'-{int(dias)} days',)
+        )
+    por_dia = {dia: quantidade for dia, quantidade in linhas_dia if dia}
+
+    distribuicao = {
+        _rotulo_faixa(faixa): quantidade for faixa, quantidade in conn.execute(
+            "SELECT faixa, total FROM estatisticas_score ORDER BY faixa"
+        )
+    }
+
+    return {
+        'total_noticias': total,
+        'noticias_favoritas': favoritas,
+        'por_fonte': por_fonte,
+        'por_categoria': por_categoria,
+        'por_dia': por_dia,
+        'distribuicao_scores': distribuicao,
+        'media_scores_por_fonte': media_scores,
+    }
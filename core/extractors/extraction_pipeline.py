@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+Etapa de extração de conteúdo em paralelo
+
+Um pool limitado de workers baixa e processa as páginas das notícias; os
+resultados são consumidos por um único escritor (a thread que chama `run`),
+que grava os textos em lotes. O resultado de cada link (gravado ou erro)
+pode ser repassado em lotes a `registrar_resultados`, depois da gravação
+dos textos, para que falhas sejam tentadas de novo mais tarde.
+"""
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+LoteTextos = List[Tuple[str, str]]
+
+# (link, erro); erro None se o texto foi gravado
+LoteResultados = List[Tuple[str, Optional[str]]]
+
+ERRO_SEM_TEXTO = "sem texto extraído"
+
+
+class ExtractionPipeline:
+    """
+    Extração concorrente com escrita em lotes
+    """
+
+    def __init__(self, extract_fn: Callable[[str], Optional[str]],
+                 escrever_lote: Callable[[LoteTextos], int],
+                 max_workers: int = 8, max_pendentes: Optional[int] = None,
+                 tamanho_lote: int = 50,
+                 registrar_resultados: Optional[Callable[[LoteResultados], None]] = None):
+        """
+        Args:
+            extract_fn: Função que recebe o link e retorna o texto (ou None se a
+                página não tem texto); exceções contam como falhas
+            escrever_lote: Grava uma lista de (link, texto) e retorna quantos gravou
+            max_workers: Extrações simultâneas
+            max_pendentes: Máximo de links submetidos e ainda não gravados
+                (padrão: 2x max_workers), limita o uso de memória
+            tamanho_lote: Textos por gravação
+            registrar_resultados: Recebe (link, erro) dos links processados,
+                em lotes; páginas sem texto contam como erro
+        """
+        self.extract_fn = extract_fn
+        self.escrever_lote = escrever_lote
+        self.max_workers = max(int(max_workers), 1)
+        self.max_pendentes = max_pendentes or self.max_workers * 2
+        self.tamanho_lote = max(int(tamanho_lote), 1)
+        self.registrar_resultados = registrar_resultados
+
+    def _extrair(self, link: str) -> Tuple[str, Optional[str], Optional[str]]:
+        try:
+            return link, self.extract_fn(link), None
+        except Exception as e:
+            return link, None, str(e)
+
+    def run(self, links: Iterable[str]) -> Dict[str, float]:
+        """
+        Extrai e grava os textos dos links
+
+        Returns:
+            Estatísticas da etapa (contagens, tempo e vazão)
+        """
+        inicio = time.time()
+        stats = {
+            'links': 0,
+            'extraidos': 0,
+            'sem_texto': 0,
+            'falhas': 0,
+            'gravados': 0,
+            'lotes': 0,
+        }
+        lote: LoteTextos = []
+        resultados: LoteResultados = []
+
+        def gravar():
+            nonlocal lote, resultados
+            if lote:
+                stats['gravados'] += self.escrever_lote(lote) or 0
+                stats['lotes'] += 1
+                lote = []
+            # Só depois dos textos gravados
+            if resultados and self.registrar_resultados is not None:
+                self.registrar_resultados(resultados)
+            resultados = []
+
+        links_iter = iter(links)
+        esgotado = False
+        pendentes = set()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                while not esgotado and len(pendentes) < self.max_pendentes:
+                    link = next(links_iter, None)
+                    if link is None:
+                        esgotado = True
+                        break
+                    stats['links'] += 1
+                    pendentes.add(executor.submit(self._extrair, link))
+
+                if not pendentes:
+                    break
+
+                concluidos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+                for futuro in concluidos:
+                    link, texto, erro = futuro.result()
+                    if erro:
+                        stats['falhas'] += 1
+                        logger.warning(f"Falha na extração de {link}: {erro}")
+                    elif texto:
+                        stats['extraidos'] += 1
+                        lote.append((link, texto))
+                    else:
+                        stats['sem_texto'] += 1
+                        erro = ERRO_SEM_TEXTO
+                    resultados.append((link, erro))
+
+                if len(lote) >= self.tamanho_lote or len(resultados) >= self.tamanho_lote * 4:
+                    gravar()
+
+            gravar()
+
+        duracao = time.time() - inicio
+        stats['tempo'] = round(duracao, 3)
+        stats['links_por_segundo'] = round(stats['links'] / duracao, 2) if duracao > 0 else 0.0
+        logger.info(
+            f"📝 Extração: {stats['extraidos']}/{stats['links']} textos, {stats['falhas']} falhas, "
+            f"{stats['links_por_segundo']} links/s"
+        )
+        return stats
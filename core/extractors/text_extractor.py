@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Extração do texto completo das notícias da Câmara e do Senado
+
+O texto sai do container conhecido de cada portal (div#content-noticia,
+div#textoMateria); a varredura de todos os parágrafos da página só é feita
+quando o container não existe ou tem pouco texto.
+"""
+
+from typing import Optional
+
+from core.html_parsing import classe_tem, parse_html, primeiro, remover_tags, textos_de
+from core.http_client import HttpClient, get_http_client
+from core.metrics import medir_etapa
+
+TAGS_REMOVIDAS = ['script', 'style', 'nav', 'footer', 'header', 'aside', 'video', 'audio', 'iframe']
+
+
+def extrair_texto_html(html: bytes, url: str) -> Optional[str]:
+    """
+    Extrai o texto da matéria a partir do HTML da página
+
+    Args:
+        html: Conteúdo da página
+        url: URL da notícia (define o container esperado)
+
+    Returns:
+        Texto da notícia ou None se não houver texto suficiente
+    """
+    raiz = parse_html(html)
+    if raiz is None:
+        return None
+
+    texto = None
+    container = None
+
+    if 'camara.leg.br' in url:
+        container = primeiro(raiz, "//div[@id = 'content-noticia']")
+
+    elif 'senado.leg.br' in url:
+        container = primeiro(
+            raiz,
+            "//div[@id = 'textoMateria']",
+            f"//div[{classe_tem('texto-materia')}]",
+            f"//div[{classe_tem('conteudo-materia')}]"
+        )
+
+    if container is not None:
+        remover_tags(container, TAGS_REMOVIDAS)
+        texto = ' '.join(textos_de(container.xpath('.//p')))
+
+    if not texto or len(texto.split()) < 50:
+        remover_tags(raiz, TAGS_REMOVIDAS)
+        paragrafos = [p for p in textos_de(raiz.xpath('//p')) if len(p) > 40]
+        texto = ' '.join(paragrafos)
+
+    if texto and len(texto.split()) > 20:
+        return texto.strip()
+    return None
+
+
+def extrair_texto(url: str, client: Optional[HttpClient] = None, timeout: float = 20) -> Optional[str]:
+    """
+    Baixa a notícia pelo cliente HTTP compartilhado e extrai seu texto
+
+    Args:
+        url: URL da notícia
+        client: Cliente HTTP (o compartilhado do processo se None)
+        timeout: Timeout da requisição em segundos
+
+    Returns:
+        Texto da notícia ou None se a página não tem texto suficiente
+
+    Raises:
+        requests.RequestException: Erro de rede ou status HTTP de erro; a
+            ExtractionPipeline conta a exceção como falha
+    """
+    client = client or get_http_client()
+    response = client.get(url, timeout=timeout)
+    response.raise_for_status()
+    with medir_etapa('parsing_noticia', itens=1):
+        return extrair_texto_html(response.content, url)
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Arquivo local do HTML bruto baixado pelos scrapers e pelo extrator
+
+Cada corpo é gravado uma única vez, comprimido e endereçado pelo seu
+SHA-256 (objetos/ab/abcdef....html.zst ou .html.gz); um índice SQLite
+registra cada captura por URL e data. O arquivo permite reprocessar
+coleta, extração e scoring sem rede (ClienteReplay / main.py --replay).
+
+A compressão usa zstd quando o pacote `zstandard` está instalado e gzip
+caso contrário; a leitura aceita os dois formatos.
+"""
+
+import gzip
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - dependência opcional
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+ARQUIVO_PATH_PADRAO = os.getenv('CLIPPING_ARQUIVO_HTML', 'arquivo_html')
+
+
+def _comprimir(conteudo: bytes) -> Tuple[bytes, str]:
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=10).compress(conteudo), '.zst'
+    return gzip.compress(conteudo, compresslevel=6), '.gz'
+
+
+def _descomprimir(dados: bytes, extensao: str) -> bytes:
+    if extensao == '.zst':
+        if zstandard is None:
+            raise RuntimeError("objeto comprimido com zstd, mas o pacote zstandard não está instalado")
+        return zstandard.ZstdDecompressor().decompress(dados)
+    return gzip.decompress(dados)
+
+
+class ArquivoHtml:
+    """
+    Armazém endereçado por conteúdo com índice de capturas por URL
+    """
+
+    def __init__(self, caminho: str = ARQUIVO_PATH_PADRAO):
+        """
+        Args:
+            caminho: Diretório do arquivo (criado se não existir)
+        """
+        self.caminho = Path(caminho)
+        self.objetos = self.caminho / 'objetos'
+        self.objetos.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(str(self.caminho / 'indice.db'), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS capturas (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    url TEXT NOT NULL,
+                    buscado_em TEXT NOT NULL,
+                    sha256 TEXT NOT NULL,
+                    status INTEGER NOT NULL,
+                    content_type TEXT,
+                    tamanho INTEGER NOT NULL
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_capturas_url_data ON capturas (url, buscado_em)"
+            )
+
+    def _caminho_objeto(self, sha256: str) -> Optional[Path]:
+        base = self.objetos / sha256[:2] / sha256
+        for extensao in ('.html.zst', '.html.gz'):
+            caminho = base.with_name(base.name + extensao)
+            if caminho.exists():
+                return caminho
+        return None
+
+    def guardar(self, url: str, conteudo: bytes, status: int = 200,
+                content_type: Optional[str] = None,
+                buscado_em: Optional[datetime] = None) -> str:
+        """
+        Registra uma captura, gravando o corpo apenas se ainda não existir
+
+        Returns:
+            SHA-256 do conteúdo
+        """
+        sha256 = hashlib.sha256(conteudo).hexdigest()
+        if self._caminho_objeto(sha256) is None:
+            dados, extensao = _comprimir(conteudo)
+            destino = self.objetos / sha256[:2] / f"{sha256}.html{extensao}"
+            destino.parent.mkdir(exist_ok=True)
+            # Escrita atômica: nunca deixa um objeto truncado com o nome final
+            temporario = destino.with_name(f"{destino.name}.{threading.get_ident()}.tmp")
+            temporario.write_bytes(dados)
+            os.replace(temporario, destino)
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO capturas (url, buscado_em, sha256, status, content_type, tamanho) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, (buscado_em or datetime.now()).isoformat(), sha256, status,
+                 content_type, len(conteudo))
+            )
+        return sha256
+
+    def ler_objeto(self, sha256: str) -> bytes:
+        """Conteúdo original de um objeto; KeyError se não existir"""
+        caminho = self._caminho_objeto(sha256)
+        if caminho is None:
+            raise KeyError(sha256)
+        return _descomprimir(caminho.read_bytes(), caminho.suffix)
+
+    def ultima_captura(self, url: str, ate: Optional[datetime] = None) -> Optional[Dict]:
+        """
+        Captura mais recente da URL (opcionalmente até uma data)
+
+        Returns:
+            {'url', 'buscado_em', 'sha256', 'status', 'content_type'} ou None
+        """
+        sql = ("SELECT url, buscado_em, sha256, status, content_type FROM capturas "
+               "WHERE url = ?")
+        parametros: list = [url]
+        if ate is not None:
+            sql += " AND buscado_em <= ?"
+            parametros.append(ate.isoformat())
+        sql += " ORDER BY buscado_em DESC, id DESC LIMIT 1"
+
+        with self._lock:
+            row = self._conn.execute(sql, parametros).fetchone()
+        if not row:
+            return None
+        return dict(zip(('url', 'buscado_em', 'sha256', 'status', 'content_type'), row))
+
+    def capturas(self, url: str) -> List[Tuple[str, str]]:
+        """Histórico da URL: [(buscado_em, sha256)] do mais antigo ao mais recente"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT buscado_em, sha256 FROM capturas WHERE url = ? ORDER BY buscado_em, id",
+                (url,)
+            ).fetchall()
+
+    def estatisticas(self) -> Dict[str, int]:
+        """Quantidade de capturas, URLs e objetos distintos"""
+        with self._lock:
+            capturas, urls, objetos = self._conn.execute(
+                "SELECT count(*), count(DISTINCT url), count(DISTINCT sha256) FROM capturas"
+            ).fetchone()
+        return {'capturas': capturas, 'urls': urls, 'objetos': objetos}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Utilitários de parsing HTML com lxml
+
+O parser do lxml (libxml2) é várias vezes mais rápido que o html.parser do
+BeautifulSoup nas páginas da Câmara e do Senado. Os seletores são XPath
+sobre os containers conhecidos de cada página, sem percorrer a árvore
+inteira quando o container existe.
+"""
+
+from typing import List, Optional
+
+import lxml.html
+from lxml import etree
+
+_PARSER_UTF8 = lxml.html.HTMLParser(encoding='utf-8')
+
+
+def parse_html(html: bytes) -> Optional[lxml.html.HtmlElement]:
+    """
+    Converte o conteúdo da página em árvore lxml
+
+    Conteúdo UTF-8 válido é decodificado como UTF-8; o restante fica com a
+    detecção do próprio lxml (meta charset).
+
+    Returns:
+        Elemento raiz ou None se a página estiver vazia
+    """
+    if not html or not html.strip():
+        return None
+    try:
+        html.decode('utf-8')
+        parser = _PARSER_UTF8
+    except UnicodeDecodeError:
+        parser = None
+    try:
+        return lxml.html.document_fromstring(html, parser=parser)
+    except (etree.ParserError, ValueError):
+        return None
+
+
+def classe_tem(nome: str) -> str:
+    """Predicado XPath: `nome` é uma das classes do elemento (como class_=nome no BeautifulSoup)"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {nome} ')"
+
+
+def classe_contem(trecho: str) -> str:
+    """Predicado XPath: atributo class contendo o trecho (como class_=lambda x: trecho in x)"""
+    return f"contains(@class, '{trecho}')"
+
+
+def primeiro(elemento, *xpaths: str):
+    """Primeiro resultado do primeiro XPath que encontrar algo, ou None"""
+    for xpath in xpaths:
+        resultado = elemento.xpath(xpath)
+        if resultado:
+            return resultado[0]
+    return None
+
+
+def texto_de(elemento) -> str:
+    """Texto do elemento, equivalente a get_text(strip=True) do BeautifulSoup"""
+    return ''.join(parte.strip() for parte in elemento.itertext())
+
+
+def textos_de(elementos) -> List[str]:
+    """texto_de para cada elemento"""
+    return [texto_de(elemento) for elemento in elementos]
+
+
+def remover_tags(raiz, tags: List[str]) -> None:
+    """Remove as tags e seu conteúdo, preservando o texto que as segue"""
+    etree.strip_elements(raiz, *tags, with_tail=False)
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Cache de respostas da API: ETag, compressão e resultados em memória
+
+- A marca de escrita (migração 0008) é um contador no banco incrementado
+  por triggers a cada alteração visível em noticias: coleta, extração,
+  scoring, favoritos e retenção, de qualquer processo. O ETag de uma
+  resposta é o hash da marca com a rota e os parâmetros; se nada mudou, o
+  cliente recebe 304 sem que a consulta seja executada
+- CacheRespostas guarda o JSON já serializado (e suas versões comprimidas)
+  por ETag, em um LRU com TTL; uma escrita muda a marca e, com ela, a chave
+- gzip sempre; brotli quando o pacote opcional `brotli` está instalado
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dependência opcional
+    brotli = None
+
+from core.metrics import REGISTRO
+
+TTL_PADRAO = float(os.getenv('CLIPPING_CACHE_TTL', '60'))
+
+ENTRADAS_PADRAO = int(os.getenv('CLIPPING_CACHE_ENTRADAS', '256'))
+
+# Respostas menores que isto não compensam a compressão
+TAMANHO_MINIMO_COMPRESSAO = 1024
+
+NIVEL_GZIP = 6
+QUALIDADE_BROTLI = 5
+
+# Em ordem de preferência, para Accept-Encoding
+CODIFICACOES = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+CACHE_CONSULTAS = REGISTRO.contador(
+    "clipping_api_cache_total", "Consultas ao cache de respostas da API", ("resultado",)
+)
+
+
+def ler_marca_escrita(conn) -> int:
+    """Valor atual da marca de escrita do banco"""
+    row = conn.execute("SELECT versao FROM marca_escrita WHERE id = 1").fetchone()
+    return row[0] if row else 0
+
+
+def calcular_etag(*partes) -> str:
+    """Hash curto e estável das partes (marca, rota, parâmetros...)"""
+    bruto = '\x1f'.join(str(parte) for parte in partes).encode('utf-8')
+    return hashlib.sha1(bruto).hexdigest()[:32]
+
+
+def comprimir(corpo: bytes, codificacao: str) -> bytes:
+    """Comprime o corpo com 'gzip' ou 'br'"""
+    if codificacao == 'br':
+        return brotli.compress(corpo, quality=QUALIDADE_BROTLI)
+    if codificacao == 'gzip':
+        return gzip.compress(corpo, compresslevel=NIVEL_GZIP, mtime=0)
+    raise ValueError(f"codificação não suportada: {codificacao}")
+
+
+class RespostaCacheada:
+    """
+    Corpo serializado de uma resposta, com as versões comprimidas geradas sob demanda
+    """
+
+    __slots__ = ('corpo', 'criada_em', '_codificados')
+
+    def __init__(self, corpo: bytes):
+        self.corpo = corpo
+        self.criada_em = time.monotonic()
+        self._codificados: Dict[str, bytes] = {}
+
+    def corpo_para(self, codificacao: Optional[str]) -> bytes:
+        """Corpo na codificação pedida (None ou corpo pequeno: sem compressão)"""
+        if codificacao is None or len(self.corpo) < TAMANHO_MINIMO_COMPRESSAO:
+            return self.corpo
+        codificado = self._codificados.get(codificacao)
+        if codificado is None:
+            codificado = self._codificados[codificacao] = comprimir(self.corpo, codificacao)
+        return codificado
+
+
+class CacheRespostas:
+    """
+    LRU com TTL de respostas serializadas, seguro entre threads
+
+    A chave inclui a marca de escrita, então uma escrita no banco torna as
+    entradas antigas inalcançáveis; `invalidar` apenas devolve a memória
+    mais cedo. O TTL limita respostas que dependem da data atual.
+    """
+
+    def __init__(self, maximo: int = ENTRADAS_PADRAO, ttl: float = TTL_PADRAO):
+        self.maximo = maximo
+        self.ttl = ttl
+        self._entradas: 'OrderedDict[str, RespostaCacheada]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obter(self, chave: str) -> Optional[RespostaCacheada]:
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is not None and time.monotonic() - entrada.criada_em > self.ttl:
+                del self._entradas[chave]
+                entrada = None
+            if entrada is not None:
+                self._entradas.move_to_end(chave)
+        CACHE_CONSULTAS.incrementar(resultado='acerto' if entrada is not None else 'falta')
+        return entrada
+
+    def guardar(self, chave: str, corpo: bytes) -> RespostaCacheada:
+        entrada = RespostaCacheada(corpo)
+        if self.maximo <= 0:
+            return entrada
+        with self._lock:
+            self._entradas[chave] = entrada
+            self._entradas.move_to_end(chave)
+            while len(self._entradas) > self.maximo:
+                self._entradas.popitem(last=False)
+        return entrada
+
+    def invalidar(self) -> None:
+        with self._lock:
+            self._entradas.clear()
+
+    def __len__(self) -> int:
+        return len(self._entradas)
@@ -0,0 +1,363 @@
+# -*- coding: utf-8 -*-
+"""
+Cliente HTTP compartilhado pelos scrapers e pelo extrator de conteúdo
+
+- Sessão única com pool de conexões keep-alive por host
+- Retentativas com backoff exponencial em erros 5xx, de conexão e timeout
+- GET condicional: ETag/Last-Modified ficam em cache local, e uma resposta
+  304 devolve o corpo armazenado sem retransferi-lo (lido do arquivo de HTML
+  pelo SHA-256; só sem o arquivo o cache guarda o corpo). Entradas não
+  revalidadas há CACHE_VALIDADE_DIAS expiram, e o cache guarda no máximo
+  CACHE_MAX_ENTRADAS URLs (sai a revalidada há mais tempo)
+- Latência, bytes e erros por host vão para core.metrics
+- Toda página obtida é registrada no arquivo de HTML bruto (core.html_archive),
+  que o ClienteReplay usa para reprocessar a coleta sem rede
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from core.html_archive import ARQUIVO_PATH_PADRAO, ArquivoHtml
+from core.metrics import registrar_http
+
+logger = logging.getLogger(__name__)
+
+HEADERS_PADRAO = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+CACHE_PATH_PADRAO = "clipping_http_cache.db"
+
+# Dias sem revalidação até a entrada expirar e teto de URLs no cache
+CACHE_VALIDADE_DIAS = int(os.getenv('CLIPPING_HTTP_CACHE_DIAS', '30'))
+CACHE_MAX_ENTRADAS = int(os.getenv('CLIPPING_HTTP_CACHE_MAX', '50000'))
+
+# Gravações entre duas podas do cache
+PODA_A_CADA = 500
+
+
+class RespostaHttp:
+    """
+    Resposta simplificada, com a interface usada pelos parsers
+    """
+
+    __slots__ = ('url', 'status_code', 'content', 'headers', 'nao_modificado')
+
+    def __init__(self, url: str, status_code: int, content: bytes,
+                 headers: Optional[Dict[str, str]] = None, nao_modificado: bool = False):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.nao_modificado = nao_modificado
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8', errors='replace')
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise requests.HTTPError(f"{self.status_code} para {self.url}")
+
+
+class CacheValidadores:
+    """
+    Armazena ETag, Last-Modified e o corpo da última resposta 200 por URL
+
+    O corpo é referenciado pelo SHA-256 do objeto no arquivo de HTML bruto;
+    o corpo comprimido só fica na própria tabela quando não há arquivo.
+
+    atualizado_em é a última gravação ou revalidação (304) da URL: entradas
+    mais antigas que validade_dias são ignoradas e apagadas, e acima de
+    max_entradas saem as menos recentes.
+    """
+
+    def __init__(self, caminho: str = CACHE_PATH_PADRAO, validade_dias: int = CACHE_VALIDADE_DIAS,
+                 max_entradas: int = CACHE_MAX_ENTRADAS):
+        """
+        Args:
+            caminho: Banco do cache
+            validade_dias: Dias sem revalidação até a entrada expirar
+            max_entradas: Máximo de URLs guardadas
+        """
+        self.validade_dias = validade_dias
+        self.max_entradas = max_entradas
+        self._conn = sqlite3.connect(caminho, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._gravacoes = 0
+        with self._lock, self._conn:
+            colunas = {row[1] for row in self._conn.execute("PRAGMA table_info(http_cache)")}
+            if colunas and 'sha256' not in colunas:
+                # Cache do formato anterior (corpo sempre na tabela): é só cache, recomeça vazio
+                self._conn.execute("DROP TABLE http_cache")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS http_cache (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    sha256 TEXT,
+                    corpo BLOB,
+                    atualizado_em TEXT NOT NULL
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_http_cache_atualizado_em ON http_cache (atualizado_em)"
+            )
+            self._podar()
+
+    def _corte(self) -> str:
+        return (datetime.now() - timedelta(days=self.validade_dias)).isoformat()
+
+    def _podar(self) -> int:
+        """Apaga as entradas expiradas e as excedentes; chamar com o lock e em transação"""
+        apagadas = self._conn.execute(
+            "DELETE FROM http_cache WHERE atualizado_em < ?", (self._corte(),)
+        ).rowcount
+        apagadas += self._conn.execute("""
+            DELETE FROM http_cache WHERE url IN (
+                SELECT url FROM http_cache ORDER BY atualizado_em DESC LIMIT -1 OFFSET ?
+            )
+        """, (self.max_entradas,)).rowcount
+        return apagadas
+
+    def podar(self) -> int:
+        """
+        Remove entradas expiradas e as que passam de max_entradas
+
+        Returns:
+            Quantidade de entradas apagadas
+        """
+        with self._lock, self._conn:
+            return self._podar()
+
+    def obter(self, url: str):
+        """
+        Retorna (etag, last_modified, sha256, corpo) ou None (ausente ou expirada)
+
+        corpo é None quando o corpo está no arquivo de HTML (sob sha256).
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, sha256, corpo FROM http_cache WHERE url = ? AND atualizado_em >= ?",
+                (url, self._corte())
+            ).fetchone()
+        if not row:
+            return None
+        return row[0], row[1], row[2], zlib.decompress(row[3]) if row[3] is not None else None
+
+    def salvar(self, url: str, etag: Optional[str], last_modified: Optional[str],
+               sha256: Optional[str] = None, corpo: Optional[bytes] = None):
+        """
+        Grava os validadores da URL com o SHA-256 do corpo arquivado ou,
+        sem arquivo, com o próprio corpo
+        """
+        with self._lock, self._conn:
+            self._conn.execute("""
+                INSERT INTO http_cache (url, etag, last_modified, sha256, corpo, atualizado_em)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (url) DO UPDATE SET
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    sha256 = excluded.sha256,
+                    corpo = excluded.corpo,
+                    atualizado_em = excluded.atualizado_em
+            """, (url, etag, last_modified, sha256, zlib.compress(corpo) if corpo is not None else None,
+                  datetime.now().isoformat()))
+            self._gravacoes += 1
+            if self._gravacoes % PODA_A_CADA == 0:
+                self._podar()
+
+    def tocar(self, url: str):
+        """Registra uma revalidação (304) bem-sucedida"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE http_cache SET atualizado_em = ? WHERE url = ?",
+                (datetime.now().isoformat(), url)
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class HttpClient:
+    """
+    Sessão HTTP com pool, retentativas e GET condicional
+    """
+
+    def __init__(self, pool_hosts: int = 10, pool_por_host: int = 10, retentativas: int = 3,
+                 backoff: float = 0.5, timeout: float = 30,
+                 cache_path: Optional[str] = CACHE_PATH_PADRAO,
+                 arquivo_path: Optional[str] = ARQUIVO_PATH_PADRAO):
+        """
+        Args:
+            pool_hosts: Número de hosts com pool próprio
+            pool_por_host: Conexões mantidas abertas por host
+            retentativas: Tentativas extras em 5xx, erro de conexão e timeout
+            backoff: Fator do backoff exponencial (backoff * 2^(n-1) segundos)
+            timeout: Timeout padrão das requisições em segundos
+            cache_path: Banco do cache de validadores (None desativa o GET condicional)
+            arquivo_path: Diretório do arquivo de HTML bruto (None desativa o arquivo)
+        """
+        self.timeout = timeout
+        retry = Retry(
+            total=retentativas,
+            connect=retentativas,
+            read=retentativas,
+            status=retentativas,
+            backoff_factor=backoff,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            raise_on_status=False,
+            respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_por_host, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update(HEADERS_PADRAO)
+
+        self.cache = CacheValidadores(cache_path) if cache_path else None
+        self.arquivo = ArquivoHtml(arquivo_path) if arquivo_path else None
+
+    def _arquivar(self, resposta: RespostaHttp) -> Optional[str]:
+        """Registra a captura no arquivo; retorna o SHA-256 do corpo (None se não arquivado)"""
+        if self.arquivo is None or resposta.status_code != 200:
+            return None
+        try:
+            return self.arquivo.guardar(resposta.url, resposta.content, resposta.status_code,
+                                        resposta.headers.get('Content-Type'))
+        except Exception as e:
+            logger.warning(f"Falha ao arquivar {resposta.url}: {e}")
+            return None
+
+    def _corpo_em_cache(self, sha256: Optional[str], corpo: Optional[bytes]) -> Optional[bytes]:
+        """Corpo guardado de uma entrada do cache (None se não há como lê-lo)"""
+        if corpo is not None:
+            return corpo
+        if sha256 is None or self.arquivo is None:
+            return None
+        try:
+            return self.arquivo.ler_objeto(sha256)
+        except (KeyError, OSError) as e:
+            logger.warning(f"Objeto {sha256[:12]} ausente do arquivo: {e}")
+            return None
+
+    def get(self, url: str, condicional: bool = True, timeout: Optional[float] = None) -> RespostaHttp:
+        """
+        Executa um GET, revalidando com o servidor quando há cópia em cache
+
+        Args:
+            url: URL a buscar
+            condicional: Envia If-None-Match/If-Modified-Since se houver cache
+            timeout: Timeout específico desta requisição
+        """
+        headers = {}
+        em_cache = self.cache.obter(url) if (condicional and self.cache) else None
+        # Sem o arquivo de HTML não há como ler um corpo guardado só pelo SHA-256
+        if em_cache and em_cache[3] is None and self.arquivo is None:
+            em_cache = None
+        if em_cache:
+            etag, last_modified, _, _ = em_cache
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+
+        inicio = time.perf_counter()
+        response = self.session.get(url, headers=headers, timeout=timeout or self.timeout)
+        registrar_http(url, time.perf_counter() - inicio, len(response.content), response.status_code)
+
+        if response.status_code == 304 and em_cache:
+            corpo = self._corpo_em_cache(em_cache[2], em_cache[3])
+            if corpo is None:
+                # Objeto sumiu do arquivo: busca a página inteira de novo
+                return self.get(url, condicional=False, timeout=timeout)
+            self.cache.tocar(url)
+            resposta = RespostaHttp(url, 200, corpo, dict(response.headers), nao_modificado=True)
+            self._arquivar(resposta)
+            return resposta
+
+        resposta = RespostaHttp(url, response.status_code, response.content, dict(response.headers))
+        sha256 = self._arquivar(resposta)
+        if self.cache and response.status_code == 200:
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                if sha256 is not None:
+                    self.cache.salvar(url, etag, last_modified, sha256=sha256)
+                else:
+                    self.cache.salvar(url, etag, last_modified, corpo=response.content)
+        return resposta
+
+    def close(self):
+        self.session.close()
+        if self.cache:
+            self.cache.close()
+        if self.arquivo:
+            self.arquivo.close()
+
+
+class ClienteReplay:
+    """
+    Cliente com a interface de HttpClient que responde a partir do arquivo de HTML
+
+    Não acessa a rede: cada URL devolve a captura mais recente (até `ate`,
+    se informado) e URLs nunca arquivadas respondem 404.
+    """
+
+    def __init__(self, arquivo: ArquivoHtml, ate: Optional[datetime] = None):
+        """
+        Args:
+            arquivo: Arquivo de HTML bruto
+            ate: Ignora capturas posteriores a esta data
+        """
+        self.arquivo = arquivo
+        self.ate = ate
+
+    def get(self, url: str, condicional: bool = True, timeout: Optional[float] = None) -> RespostaHttp:
+        captura = self.arquivo.ultima_captura(url, self.ate)
+        if captura is None:
+            return RespostaHttp(url, 404, b'')
+        headers = {'Content-Type': captura['content_type']} if captura['content_type'] else {}
+        return RespostaHttp(url, captura['status'], self.arquivo.ler_objeto(captura['sha256']), headers)
+
+    def close(self):
+        self.arquivo.close()
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Cliente HTTP compartilhado pelo processo"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
+
+
+def close_http_client():
+    """Fecha o cliente compartilhado, se existir"""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
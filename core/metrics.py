@@ -0,0 +1,414 @@
+# -*- coding: utf-8 -*-
+"""
+Métricas de execução do pipeline e da API
+
+- Registro do processo (REGISTRO) com contadores, medidores e histogramas,
+  exportado no formato texto do Prometheus pelo /metrics do backend
+- MetricasExecucao: tempos e contagens por etapa de uma execução da coleta,
+  mais latências e bytes HTTP por host, gravados no execution_log
+
+As etapas são medidas com `medir_etapa`, que alimenta o registro e todas
+as execuções ativas; código chamado de várias threads (parsing, extração)
+acumula o tempo somado das chamadas.
+"""
+
+import abc
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+from urllib.parse import urlsplit
+
+# Limites (segundos) dos histogramas de latência
+BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+Rotulos = Tuple[str, ...]
+
+
+def _formatar_valor(valor: float) -> str:
+    if valor == float('inf'):
+        return '+Inf'
+    if float(valor).is_integer():
+        return str(int(valor))
+    return repr(float(valor))
+
+
+def _formatar_rotulos(nomes: Sequence[str], valores: Sequence[str]) -> str:
+    if not nomes:
+        return ''
+    pares = []
+    for nome, valor in zip(nomes, valores):
+        valor = str(valor).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+        pares.append(f'{nome}="{valor}"')
+    return '{' + ','.join(pares) + '}'
+
+
+class _Metrica(abc.ABC):
+    tipo = ''
+
+    def __init__(self, nome: str, ajuda: str, rotulos: Sequence[str] = ()):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)
+        self._lock = threading.Lock()
+
+    def _chave(self, rotulos: Dict[str, str]) -> Rotulos:
+        if set(rotulos) != set(self.rotulos):
+            raise ValueError(f"{self.nome}: rótulos esperados {self.rotulos}, recebidos {tuple(rotulos)}")
+        return tuple(str(rotulos[nome]) for nome in self.rotulos)
+
+    def exportar(self) -> List[str]:
+        return [f"# HELP {self.nome} {self.ajuda}", f"# TYPE {self.nome} {self.tipo}"] + self._amostras()
+
+    @abc.abstractmethod
+    def _amostras(self) -> List[str]:
+        """Linhas de amostra da métrica no formato do Prometheus"""
+
+
+class Contador(_Metrica):
+    """Valor que só cresce (requisições, bytes, itens)"""
+
+    tipo = 'counter'
+
+    def __init__(self, nome: str, ajuda: str, rotulos: Sequence[str] = ()):
+        super().__init__(nome, ajuda, rotulos)
+        self._valores: Dict[Rotulos, float] = {}
+
+    def incrementar(self, valor: float = 1, **rotulos) -> None:
+        chave = self._chave(rotulos)
+        with self._lock:
+            self._valores[chave] = self._valores.get(chave, 0) + valor
+
+    def valor(self, **rotulos) -> float:
+        with self._lock:
+            return self._valores.get(self._chave(rotulos), 0)
+
+    def _amostras(self) -> List[str]:
+        with self._lock:
+            itens = sorted(self._valores.items())
+        return [f"{self.nome}{_formatar_rotulos(self.rotulos, chave)} {_formatar_valor(v)}" for chave, v in itens]
+
+
+class Medidor(Contador):
+    """Valor que pode ser redefinido (resultado da última execução)"""
+
+    tipo = 'gauge'
+
+    def definir(self, valor: float, **rotulos) -> None:
+        chave = self._chave(rotulos)
+        with self._lock:
+            self._valores[chave] = valor
+
+
+class Histograma(_Metrica):
+    """Distribuição em buckets cumulativos, com soma e contagem"""
+
+    tipo = 'histogram'
+
+    def __init__(self, nome: str, ajuda: str, rotulos: Sequence[str] = (),
+                 buckets: Sequence[float] = BUCKETS_LATENCIA):
+        super().__init__(nome, ajuda, rotulos)
+        self.buckets = tuple(sorted(buckets))
+        # rótulos -> (contagem por bucket, sem o +Inf; soma; contagem total)
+        self._series: Dict[Rotulos, Tuple[List[int], float, int]] = {}
+
+    def observar(self, valor: float, **rotulos) -> None:
+        self.mesclar(_contagens_bucket(self.buckets, [valor]), valor, 1, **rotulos)
+
+    def mesclar(self, contagens: Sequence[int], soma: float, total: int, **rotulos) -> None:
+        """Soma contagens não cumulativas por bucket (as de MetricasExecucao.resumo)"""
+        chave = self._chave(rotulos)
+        with self._lock:
+            atuais, soma_atual, total_atual = self._series.get(chave, ([0] * len(self.buckets), 0.0, 0))
+            self._series[chave] = (
+                [a + c for a, c in zip(atuais, contagens)], soma_atual + soma, total_atual + total
+            )
+
+    def _amostras(self) -> List[str]:
+        with self._lock:
+            series = sorted((chave, (list(c), s, t)) for chave, (c, s, t) in self._series.items())
+        linhas = []
+        nomes_bucket = self.rotulos + ('le',)
+        for chave, (contagens, soma, total) in series:
+            acumulado = 0
+            for limite, contagem in zip(self.buckets, contagens):
+                acumulado += contagem
+                rotulos = _formatar_rotulos(nomes_bucket, chave + (_formatar_valor(limite),))
+                linhas.append(f"{self.nome}_bucket{rotulos} {acumulado}")
+            rotulos = _formatar_rotulos(nomes_bucket, chave + ('+Inf',))
+            linhas.append(f"{self.nome}_bucket{rotulos} {total}")
+            rotulos = _formatar_rotulos(self.rotulos, chave)
+            linhas.append(f"{self.nome}_sum{rotulos} {_formatar_valor(round(soma, 6))}")
+            linhas.append(f"{self.nome}_count{rotulos} {total}")
+        return linhas
+
+
+def _contagens_bucket(buckets: Sequence[float], valores: Sequence[float]) -> List[int]:
+    """Contagem não cumulativa por bucket; valores acima do último só entram no +Inf"""
+    contagens = [0] * len(buckets)
+    for valor in valores:
+        indice = bisect.bisect_left(buckets, valor)
+        if indice < len(buckets):
+            contagens[indice] += 1
+    return contagens
+
+
+class RegistroMetricas:
+    """
+    Conjunto de métricas de um processo
+    """
+
+    def __init__(self):
+        self._metricas: Dict[str, _Metrica] = {}
+        self._lock = threading.Lock()
+
+    def _registrar(self, metrica: _Metrica) -> _Metrica:
+        with self._lock:
+            existente = self._metricas.get(metrica.nome)
+            if existente is not None:
+                if type(existente) is not type(metrica) or existente.rotulos != metrica.rotulos:
+                    raise ValueError(f"métrica {metrica.nome} já registrada com outra definição")
+                return existente
+            self._metricas[metrica.nome] = metrica
+            return metrica
+
+    def contador(self, nome: str, ajuda: str, rotulos: Sequence[str] = ()) -> Contador:
+        return self._registrar(Contador(nome, ajuda, rotulos))
+
+    def medidor(self, nome: str, ajuda: str, rotulos: Sequence[str] = ()) -> Medidor:
+        return self._registrar(Medidor(nome, ajuda, rotulos))
+
+    def histograma(self, nome: str, ajuda: str, rotulos: Sequence[str] = (),
+                   buckets: Sequence[float] = BUCKETS_LATENCIA) -> Histograma:
+        return self._registrar(Histograma(nome, ajuda, rotulos, buckets))
+
+    def exportar(self) -> str:
+        """Todas as métricas no formato texto do Prometheus (0.0.4)"""
+        with self._lock:
+            metricas = sorted(self._metricas.values(), key=lambda m: m.nome)
+        linhas = []
+        for metrica in metricas:
+            linhas.extend(metrica.exportar())
+        return '\n'.join(linhas) + '\n'
+
+
+REGISTRO = RegistroMetricas()
+
+CONTENT_TYPE_PROMETHEUS = 'text/plain; version=0.0.4; charset=utf-8'
+
+HTTP_DURACAO = REGISTRO.histograma(
+    'clipping_http_request_duration_seconds', 'Latência das requisições HTTP dos coletores', ('host',)
+)
+HTTP_BYTES = REGISTRO.contador(
+    'clipping_http_response_bytes_total', 'Bytes baixados pelos coletores', ('host',)
+)
+HTTP_ERROS = REGISTRO.contador(
+    'clipping_http_errors_total', 'Respostas HTTP com status de erro', ('host',)
+)
+ETAPA_SEGUNDOS = REGISTRO.contador(
+    'clipping_stage_seconds_total', 'Tempo acumulado por etapa do pipeline', ('etapa',)
+)
+ETAPA_ITENS = REGISTRO.contador(
+    'clipping_stage_items_total', 'Itens processados por etapa do pipeline', ('etapa',)
+)
+ULTIMA_EXECUCAO_SEGUNDOS = REGISTRO.medidor(
+    'clipping_last_run_stage_seconds', 'Tempo de cada etapa na última execução', ('etapa',)
+)
+ULTIMA_EXECUCAO_ITENS = REGISTRO.medidor(
+    'clipping_last_run_stage_items', 'Itens de cada etapa na última execução', ('etapa',)
+)
+ULTIMA_EXECUCAO_FIM = REGISTRO.medidor(
+    'clipping_last_run_timestamp_seconds', 'Fim da última execução (epoch)', ('status',)
+)
+
+
+class _SerieHttp:
+    __slots__ = ('requisicoes', 'erros', 'bytes', 'segundos', 'contagens')
+
+    def __init__(self):
+        self.requisicoes = 0
+        self.erros = 0
+        self.bytes = 0
+        self.segundos = 0.0
+        self.contagens = [0] * len(BUCKETS_LATENCIA)
+
+
+class MetricasExecucao:
+    """
+    Tempos e contagens de uma execução, por etapa e por host
+
+    Enquanto ativa (`with MetricasExecucao() as metricas:`), recebe tudo o
+    que for medido com medir_etapa e registrar_http em qualquer thread.
+    """
+
+    def __init__(self):
+        self.inicio = time.time()
+        self._etapas: Dict[str, Dict[str, float]] = {}
+        self._http: Dict[str, _SerieHttp] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> 'MetricasExecucao':
+        with _execucoes_lock:
+            _execucoes_ativas.add(self)
+        return self
+
+    def __exit__(self, *exc):
+        with _execucoes_lock:
+            _execucoes_ativas.discard(self)
+        return False
+
+    def adicionar_etapa(self, etapa: str, segundos: float, itens: int = 0) -> None:
+        with self._lock:
+            dados = self._etapas.setdefault(etapa, {'segundos': 0.0, 'itens': 0, 'chamadas': 0})
+            dados['segundos'] += segundos
+            dados['itens'] += itens
+            dados['chamadas'] += 1
+
+    def adicionar_http(self, host: str, segundos: float, tamanho: int, erro: bool) -> None:
+        with self._lock:
+            serie = self._http.get(host)
+            if serie is None:
+                serie = self._http[host] = _SerieHttp()
+            serie.requisicoes += 1
+            serie.erros += int(erro)
+            serie.bytes += tamanho
+            serie.segundos += segundos
+            indice = bisect.bisect_left(BUCKETS_LATENCIA, segundos)
+            if indice < len(BUCKETS_LATENCIA):
+                serie.contagens[indice] += 1
+
+    def resumo(self) -> Dict:
+        """
+        Resumo serializável em JSON para o execution_log
+
+        Returns:
+            {'pid', 'duracao', 'etapas': {etapa: {segundos, itens, chamadas,
+            itens_por_segundo}}, 'http': {host: {requisicoes, erros, bytes,
+            segundos, latencia_media, latencia_p50, latencia_p95, buckets}}}
+        """
+        with self._lock:
+            etapas = {}
+            for etapa, dados in self._etapas.items():
+                segundos = dados['segundos']
+                etapas[etapa] = {
+                    'segundos': round(segundos, 4),
+                    'itens': int(dados['itens']),
+                    'chamadas': int(dados['chamadas']),
+                    'itens_por_segundo': round(dados['itens'] / segundos, 2) if segundos > 0 else None,
+                }
+            http = {}
+            for host, serie in self._http.items():
+                http[host] = {
+                    'requisicoes': serie.requisicoes,
+                    'erros': serie.erros,
+                    'bytes': serie.bytes,
+                    'segundos': round(serie.segundos, 4),
+                    'latencia_media': round(serie.segundos / serie.requisicoes, 4) if serie.requisicoes else None,
+                    'latencia_p50': _quantil_bucket(serie.contagens, serie.requisicoes, 0.50),
+                    'latencia_p95': _quantil_bucket(serie.contagens, serie.requisicoes, 0.95),
+                    'buckets': dict(zip(map(str, BUCKETS_LATENCIA), serie.contagens)),
+                }
+        return {
+            'pid': os.getpid(),
+            'duracao': round(time.time() - self.inicio, 4),
+            'etapas': etapas,
+            'http': http,
+        }
+
+
+def _quantil_bucket(contagens: Sequence[int], total: int, quantil: float) -> Optional[float]:
+    """Limite superior do bucket que contém o quantil (None se acima do último bucket)"""
+    if not total:
+        return None
+    alvo = quantil * total
+    acumulado = 0
+    for limite, contagem in zip(BUCKETS_LATENCIA, contagens):
+        acumulado += contagem
+        if acumulado >= alvo:
+            return limite
+    return None
+
+
+def formatar_etapas(resumo: Dict) -> str:
+    """Resumo das etapas em uma linha, da mais lenta para a mais rápida"""
+    etapas = sorted(resumo.get('etapas', {}).items(), key=lambda item: -item[1]['segundos'])
+    return ', '.join(f"{etapa} {dados['segundos']:.1f}s/{dados['itens']}" for etapa, dados in etapas)
+
+
+_execucoes_ativas: Set[MetricasExecucao] = set()
+_execucoes_lock = threading.Lock()
+
+
+def _ativas() -> List[MetricasExecucao]:
+    with _execucoes_lock:
+        return list(_execucoes_ativas)
+
+
+class Medicao:
+    """Etapa em andamento; `itens` pode ser preenchido dentro do bloco"""
+
+    __slots__ = ('itens',)
+
+    def __init__(self, itens: int = 0):
+        self.itens = itens
+
+
+@contextmanager
+def medir_etapa(etapa: str, itens: int = 0) -> Iterator[Medicao]:
+    """
+    Mede o tempo de um bloco e o atribui à etapa
+
+    Exemplo:
+        with medir_etapa('gravacao_noticias') as medicao:
+            medicao.itens = len(noticias)
+            ...
+    """
+    medicao = Medicao(itens)
+    inicio = time.perf_counter()
+    try:
+        yield medicao
+    finally:
+        segundos = time.perf_counter() - inicio
+        ETAPA_SEGUNDOS.incrementar(segundos, etapa=etapa)
+        ETAPA_ITENS.incrementar(medicao.itens, etapa=etapa)
+        for execucao in _ativas():
+            execucao.adicionar_etapa(etapa, segundos, medicao.itens)
+
+
+def registrar_http(url: str, segundos: float, tamanho: int, status: int) -> None:
+    """Registra uma requisição HTTP dos coletores (latência, bytes e erro por host)"""
+    host = urlsplit(url).hostname or ''
+    erro = status >= 400
+    HTTP_DURACAO.observar(segundos, host=host)
+    HTTP_BYTES.incrementar(tamanho, host=host)
+    if erro:
+        HTTP_ERROS.incrementar(host=host)
+    for execucao in _ativas():
+        execucao.adicionar_http(host, segundos, tamanho, erro)
+
+
+def registrar_execucao(resumo: Dict, status: str = 'sucesso') -> None:
+    """
+    Publica no registro o resumo de uma execução (MetricasExecucao.resumo)
+
+    Execuções de outro processo (o agendador roda coletas em um processo
+    filho) também têm suas séries HTTP somadas às do registro.
+    """
+    etapas = resumo.get('etapas', {})
+    for etapa, dados in etapas.items():
+        ULTIMA_EXECUCAO_SEGUNDOS.definir(dados['segundos'], etapa=etapa)
+        ULTIMA_EXECUCAO_ITENS.definir(dados['itens'], etapa=etapa)
+    ULTIMA_EXECUCAO_FIM.definir(round(time.time(), 3), status=status)
+
+    if resumo.get('pid') == os.getpid():
+        return
+    for etapa, dados in etapas.items():
+        ETAPA_SEGUNDOS.incrementar(dados['segundos'], etapa=etapa)
+        ETAPA_ITENS.incrementar(dados['itens'], etapa=etapa)
+    for host, serie in resumo.get('http', {}).items():
+        HTTP_DURACAO.mesclar(list(serie['buckets'].values()), serie['segundos'], serie['requisicoes'], host=host)
+        HTTP_BYTES.incrementar(serie['bytes'], host=host)
+        if serie['erros']:
+            HTTP_ERROS.incrementar(serie['erros'], host=host)
@@ -0,0 +1,543 @@
+# -*- coding: utf-8 -*-
+"""
+Agendador de coletas, extrações e repontuações
+
+- Execuções periódicas com APScheduler (intervalos em minutos por tipo)
+- Fila de tarefas com id, para disparo pela API sem bloquear a requisição;
+  status e resultado ficam na tabela tarefas (migração 0011), visível a
+  todos os workers da API e não só ao que recebeu o pedido
+- Uma execução por vez sobre o banco: a trava é um arquivo ao lado do
+  banco, respeitada também por `main.py --full-collection` em outro processo
+- Por padrão cada tarefa roda em um processo filho, de modo que parsing e
+  scoring não disputam o GIL com as threads que atendem a API
+"""
+
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import sqlite3
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from core.database.connection import DB_PATH, connect
+from core.database.schema import garantir_schema
+from core.metrics import MetricasExecucao, registrar_execucao
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+# Parâmetros aceitos por tipo de tarefa (nome -> tipo)
+PARAMETROS = {
+    'coleta': {
+        'max_pages_camara': int,
+        'max_pages_senado': int,
+        'concorrencia': int,
+        'incremental': bool,
+        'extracao_workers': int,
+        'retomar': bool,
+    },
+    'extracao': {
+        'limite': int,
+        'extracao_workers': int,
+    },
+    'scoring': {
+        'dicionario_path': str,
+        'tamanho_lote': int,
+    },
+}
+TIPOS = tuple(PARAMETROS)
+
+# Tarefas concluídas mantidas para consulta de status
+HISTORICO_MAXIMO = 200
+
+
+def caminho_trava(db_path: Optional[str] = None) -> str:
+    """Arquivo de trava das execuções sobre o banco"""
+    return f"{db_path or DB_PATH}.execucao.lock"
+
+
+class TravaExecucao:
+    """
+    Trava exclusiva entre processos (flock/msvcrt sobre um arquivo)
+
+    O sistema operacional libera a trava se o processo morrer, então não
+    há trava órfã a limpar.
+    """
+
+    def __init__(self, caminho: Optional[str] = None):
+        self.caminho = caminho or caminho_trava()
+        self._arquivo = None
+        self._lock = threading.Lock()
+
+    def _tentar(self) -> bool:
+        arquivo = open(self.caminho, 'a+')
+        try:
+            if fcntl is not None:
+                fcntl.flock(arquivo.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                arquivo.seek(0)
+                msvcrt.locking(arquivo.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            arquivo.close()
+            return False
+        arquivo.seek(0)
+        arquivo.truncate()
+        arquivo.write(str(os.getpid()))
+        arquivo.flush()
+        self._arquivo = arquivo
+        return True
+
+    def adquirir(self, bloquear: bool = True, intervalo: float = 1.0) -> bool:
+        """
+        Adquire a trava
+
+        Args:
+            bloquear: Espera a execução em andamento terminar
+            intervalo: Intervalo entre tentativas em segundos
+
+        Returns:
+            False se não bloqueante e outra execução detém a trava
+        """
+        if not self._lock.acquire(blocking=bloquear):
+            return False
+        while not self._tentar():
+            if not bloquear:
+                self._lock.release()
+                return False
+            time.sleep(intervalo)
+        return True
+
+    def liberar(self) -> None:
+        if self._arquivo is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._arquivo.fileno(), fcntl.LOCK_UN)
+            else:
+                self._arquivo.seek(0)
+                msvcrt.locking(self._arquivo.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._arquivo.close()
+            self._arquivo = None
+            self._lock.release()
+
+    def __enter__(self) -> 'TravaExecucao':
+        self.adquirir()
+        return self
+
+    def __exit__(self, *exc):
+        self.liberar()
+        return False
+
+
+def validar_parametros(tipo: str, parametros: Optional[Dict]) -> Dict:
+    """
+    Confere tipo e parâmetros de uma tarefa
+
+    Raises:
+        ValueError: tipo desconhecido, parâmetro não aceito ou de tipo inválido
+    """
+    if tipo not in PARAMETROS:
+        raise ValueError(f"tipo de tarefa inválido: {tipo} (use {', '.join(TIPOS)})")
+    aceitos = PARAMETROS[tipo]
+    validados = {}
+    for nome, valor in (parametros or {}).items():
+        if nome not in aceitos:
+            raise ValueError(f"parâmetro não aceito para {tipo}: {nome}")
+        esperado = aceitos[nome]
+        if esperado is int and (isinstance(valor, bool) or not isinstance(valor, int) or valor < 0):
+            raise ValueError(f"{nome} deve ser um inteiro não negativo")
+        if esperado is not int and not isinstance(valor, esperado):
+            raise ValueError(f"{nome} deve ser do tipo {esperado.__name__}")
+        validados[nome] = valor
+    return validados
+
+
+def executar_tarefa(tipo: str, parametros: Dict, db_path: Optional[str] = None) -> Dict:
+    """
+    Executa uma tarefa sob a trava do banco (também no processo filho)
+
+    A repontuação periódica só pontua as notícias pendentes; a do acervo
+    inteiro fica para `main.py --rescore-all`.
+
+    Returns:
+        {'resultado': retorno do ClippingSystem em JSON, 'erro': mensagem ou
+        None, 'metricas': resumo da execução}
+    """
+    from main import ClippingSystem
+
+    with TravaExecucao(caminho_trava(db_path)), MetricasExecucao() as metricas:
+        sistema = None
+        try:
+            sistema = ClippingSystem()
+            if tipo == 'coleta':
+                resultado = sistema.run_full_collection(**parametros)
+            elif tipo == 'extracao':
+                resultado = sistema.extract_pending(**parametros)
+            else:
+                resultado = sistema.rescore_pending(**parametros)
+        except Exception as e:
+            # As métricas da execução que falhou também voltam ao processo pai
+            return {'resultado': None, 'erro': str(e) or type(e).__name__, 'metricas': metricas.resumo()}
+        finally:
+            if sistema is not None:
+                sistema.close()
+        return {
+            'resultado': json.loads(json.dumps(resultado, default=str)),
+            'erro': None,
+            'metricas': metricas.resumo(),
+        }
+
+
+def _processo_vivo(pid: int) -> bool:
+    """Se o processo com esse pid ainda existe"""
+    if fcntl is None:  # pragma: no cover - Windows
+        import ctypes
+
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        kernel32.CloseHandle(handle)
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _iso(valor: Optional[datetime]) -> Optional[str]:
+    return valor.isoformat(timespec='seconds') if valor else None
+
+
+def _data(valor: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(valor) if valor else None
+
+
+class Tarefa:
+    """
+    Uma execução enfileirada e seu estado
+    """
+
+    def __init__(self, tipo: str, parametros: Dict, origem: str):
+        self.id = uuid.uuid4().hex
+        self.tipo = tipo
+        self.parametros = parametros
+        self.origem = origem
+        self.status = 'na_fila'
+        self.criada_em = datetime.now()
+        self.iniciada_em: Optional[datetime] = None
+        self.finalizada_em: Optional[datetime] = None
+        self.resultado: Optional[Dict] = None
+        self.erro: Optional[str] = None
+        # Processo cuja fila em memória guarda a tarefa
+        self.processo: Optional[int] = os.getpid()
+
+    @classmethod
+    def de_linha(cls, linha: sqlite3.Row) -> 'Tarefa':
+        """Tarefa a partir de uma linha da tabela tarefas"""
+        tarefa = cls(linha['tipo'], json.loads(linha['parametros'] or '{}'), linha['origem'])
+        tarefa.id = linha['id']
+        tarefa.status = linha['status']
+        tarefa.criada_em = _data(linha['criada_em'])
+        tarefa.iniciada_em = _data(linha['iniciada_em'])
+        tarefa.finalizada_em = _data(linha['finalizada_em'])
+        tarefa.resultado = json.loads(linha['resultado']) if linha['resultado'] else None
+        tarefa.erro = linha['erro']
+        tarefa.processo = linha['processo']
+        return tarefa
+
+    @property
+    def pendente(self) -> bool:
+        return self.status in ('na_fila', 'executando')
+
+    def to_dict(self) -> Dict:
+        return {
+            'id': self.id,
+            'tipo': self.tipo,
+            'parametros': self.parametros,
+            'origem': self.origem,
+            'status': self.status,
+            'criada_em': _iso(self.criada_em),
+            'iniciada_em': _iso(self.iniciada_em),
+            'finalizada_em': _iso(self.finalizada_em),
+            'resultado': self.resultado,
+            'erro': self.erro,
+        }
+
+
+_SQL_SALVA_TAREFA = """
+    INSERT INTO tarefas (id, tipo, parametros, origem, status, criada_em,
+                         iniciada_em, finalizada_em, resultado, erro, processo)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (id) DO UPDATE SET
+        status = excluded.status,
+        iniciada_em = excluded.iniciada_em,
+        finalizada_em = excluded.finalizada_em,
+        resultado = excluded.resultado,
+        erro = excluded.erro
+"""
+
+# Mantém as HISTORICO_MAXIMO tarefas concluídas mais recentes
+_SQL_PODA_TAREFAS = """
+    DELETE FROM tarefas
+    WHERE status NOT IN ('na_fila', 'executando')
+      AND id NOT IN (
+          SELECT id FROM tarefas WHERE status NOT IN ('na_fila', 'executando')
+          ORDER BY criada_em DESC, rowid DESC LIMIT ?
+      )
+"""
+
+
+class ServicoColeta:
+    """
+    Fila de tarefas com um executor único e agendamento periódico
+
+    A fila é do processo que enfileirou a tarefa; o status fica no banco e
+    pode ser consultado de qualquer processo.
+    """
+
+    def __init__(self, intervalos: Optional[Dict[str, float]] = None, isolado: bool = True,
+                 db_path: Optional[str] = None):
+        """
+        Args:
+            intervalos: Minutos entre execuções automáticas por tipo
+                ({'coleta': 60, 'scoring': 1440}); tipos ausentes ou 0 só rodam sob demanda
+            isolado: Executa cada tarefa em um processo filho
+            db_path: Banco das tarefas, cuja trava serializa as execuções (DB_PATH se None)
+        """
+        self.intervalos = {tipo: minutos for tipo, minutos in (intervalos or {}).items() if minutos}
+        for tipo in self.intervalos:
+            validar_parametros(tipo, None)
+        self.isolado = isolado
+        self.db_path = db_path
+
+        self._fila: 'queue.Queue[Optional[Tarefa]]' = queue.Queue()
+        self._lock = threading.Lock()
+        self._executor: Optional[threading.Thread] = None
+        self._processos: Optional[ProcessPoolExecutor] = None
+        self._agendador = None
+
+    def _conectar(self) -> sqlite3.Connection:
+        conn = connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _salvar(self, tarefa: Tarefa) -> None:
+        conn = self._conectar()
+        try:
+            with conn:
+                conn.execute(_SQL_SALVA_TAREFA, (
+                    tarefa.id, tarefa.tipo, json.dumps(tarefa.parametros), tarefa.origem, tarefa.status,
+                    _iso(tarefa.criada_em), _iso(tarefa.iniciada_em), _iso(tarefa.finalizada_em),
+                    json.dumps(tarefa.resultado) if tarefa.resultado is not None else None, tarefa.erro,
+                    tarefa.processo,
+                ))
+                if not tarefa.pendente:
+                    conn.execute(_SQL_PODA_TAREFAS, (HISTORICO_MAXIMO,))
+        finally:
+            conn.close()
+
+    def iniciar(self) -> 'ServicoColeta':
+        """Inicia o executor de tarefas e, se houver intervalos, o APScheduler"""
+        with self._lock:
+            if self._executor is not None:
+                return self
+            conn = connect(self.db_path)
+            try:
+                garantir_schema(conn)
+            finally:
+                conn.close()
+            self._recuperar_orfas()
+            if self.isolado:
+                self._processos = ProcessPoolExecutor(
+                    max_workers=1, mp_context=multiprocessing.get_context('spawn')
+                )
+            self._executor = threading.Thread(target=self._executar_fila, name='servico-coleta', daemon=True)
+            self._executor.start()
+
+        if self.intervalos:
+            from apscheduler.schedulers.background import BackgroundScheduler
+
+            self._agendador = BackgroundScheduler(job_defaults={'coalesce': True, 'max_instances': 1})
+            for tipo, minutos in self.intervalos.items():
+                self._agendador.add_job(
+                    self._disparo_agendado, 'interval', minutes=minutos, args=[tipo],
+                    id=f"clipping-{tipo}", next_run_time=datetime.now()
+                )
+                logger.info(f"⏰ {tipo} agendada a cada {minutos} min")
+            self._agendador.start()
+        return self
+
+    def parar(self, aguardar: bool = True) -> None:
+        """Para o agendamento e o executor (a tarefa em andamento termina antes se aguardar)"""
+        if self._agendador is not None:
+            self._agendador.shutdown(wait=False)
+            self._agendador = None
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            self._fila.put(None)
+            if aguardar:
+                executor.join()
+        if self._processos is not None:
+            self._processos.shutdown(wait=aguardar)
+            self._processos = None
+
+    def _recuperar_orfas(self) -> int:
+        """
+        Marca como erro as tarefas pendentes de processos que já terminaram
+
+        Sem isso, uma tarefa na fila ou em execução quando o processo caiu
+        ficaria pendente para sempre e bloquearia o disparo agendado do tipo.
+
+        Returns:
+            Número de tarefas marcadas
+        """
+        conn = self._conectar()
+        try:
+            linhas = conn.execute(
+                "SELECT id, processo FROM tarefas WHERE status IN ('na_fila', 'executando')"
+            ).fetchall()
+            orfas = [
+                (linha['id'], linha['processo']) for linha in linhas
+                if linha['processo'] is None
+                or (linha['processo'] != os.getpid() and not _processo_vivo(linha['processo']))
+            ]
+            if orfas:
+                agora = _iso(datetime.now())
+                with conn:
+                    conn.executemany(
+                        "UPDATE tarefas SET status = 'erro', finalizada_em = ?, erro = ? "
+                        "WHERE id = ? AND status IN ('na_fila', 'executando')",
+                        [(agora, f"interrompida: processo {processo} encerrado", tarefa_id)
+                         for tarefa_id, processo in orfas]
+                    )
+        finally:
+            conn.close()
+        for tarefa_id, processo in orfas:
+            logger.warning(f"⚠️  Tarefa {tarefa_id} órfã (processo {processo} encerrado) marcada como erro")
+        return len(orfas)
+
+    def _disparo_agendado(self, tipo: str) -> None:
+        # Não acumula execuções periódicas atrás de uma ainda pendente (de qualquer processo)
+        self._recuperar_orfas()
+        conn = self._conectar()
+        try:
+            pendente = conn.execute(
+                "SELECT EXISTS (SELECT 1 FROM tarefas WHERE tipo = ? AND status IN ('na_fila', 'executando'))",
+                (tipo,)
+            ).fetchone()[0]
+        finally:
+            conn.close()
+        if pendente:
+            logger.info(f"⏭️  {tipo} agendada ignorada: já há uma na fila ou em execução")
+            return
+        self.enfileirar(tipo, origem='agendador')
+
+    def enfileirar(self, tipo: str, parametros: Optional[Dict] = None, origem: str = 'api') -> Tarefa:
+        """
+        Coloca uma tarefa na fila e retorna imediatamente
+
+        Raises:
+            ValueError: tipo ou parâmetros inválidos
+        """
+        tarefa = Tarefa(tipo, validar_parametros(tipo, parametros), origem)
+        self.iniciar()
+        self._salvar(tarefa)
+        self._fila.put(tarefa)
+        logger.info(f"📥 Tarefa {tarefa.id} ({tipo}) enfileirada por {origem}")
+        return tarefa
+
+    def obter(self, tarefa_id: str) -> Optional[Tarefa]:
+        conn = self._conectar()
+        try:
+            linha = conn.execute("SELECT * FROM tarefas WHERE id = ?", (tarefa_id,)).fetchone()
+        finally:
+            conn.close()
+        return Tarefa.de_linha(linha) if linha is not None else None
+
+    def listar(self, limite: int = 20) -> List[Tarefa]:
+        """Tarefas mais recentes primeiro"""
+        conn = self._conectar()
+        try:
+            linhas = conn.execute(
+                "SELECT * FROM tarefas ORDER BY criada_em DESC, rowid DESC LIMIT ?", (limite,)
+            ).fetchall()
+        finally:
+            conn.close()
+        return [Tarefa.de_linha(linha) for linha in linhas]
+
+    def _executar_fila(self) -> None:
+        while True:
+            tarefa = self._fila.get()
+            if tarefa is None:
+                return
+
+            tarefa.status = 'executando'
+            tarefa.iniciada_em = datetime.now()
+            self._salvar(tarefa)
+            logger.info(f"▶️  Tarefa {tarefa.id} ({tarefa.tipo}) iniciada")
+            try:
+                if self._processos is not None:
+                    saida = self._processos.submit(
+                        executar_tarefa, tarefa.tipo, tarefa.parametros, self.db_path
+                    ).result()
+                else:
+                    saida = executar_tarefa(tarefa.tipo, tarefa.parametros, self.db_path)
+            except Exception as e:
+                # O processo filho morreu sem devolver as métricas
+                saida = {'resultado': None, 'erro': str(e) or type(e).__name__, 'metricas': {}}
+
+            tarefa.finalizada_em = datetime.now()
+            if saida['erro']:
+                tarefa.status = 'erro'
+                tarefa.erro = saida['erro']
+                registrar_execucao(saida['metricas'], 'erro')
+                logger.error(f"❌ Tarefa {tarefa.id} ({tarefa.tipo}) falhou: {tarefa.erro}")
+            else:
+                tarefa.status = 'sucesso'
+                tarefa.resultado = saida['resultado']
+                registrar_execucao(saida['metricas'], 'sucesso')
+                logger.info(f"✅ Tarefa {tarefa.id} ({tarefa.tipo}) concluída")
+            try:
+                self._salvar(tarefa)
+            except sqlite3.Error as e:
+                logger.error(f"❌ Status da tarefa {tarefa.id} não gravado: {e}")
+
+
+def intervalos_do_ambiente() -> Dict[str, float]:
+    """Intervalos em minutos de CLIPPING_INTERVALO_COLETA, _EXTRACAO e _SCORING"""
+    intervalos = {}
+    for tipo in TIPOS:
+        valor = os.getenv(f"CLIPPING_INTERVALO_{tipo.upper()}")
+        if valor:
+            intervalos[tipo] = float(valor)
+    return intervalos
+
+
+_servico: Optional[ServicoColeta] = None
+_servico_lock = threading.Lock()
+
+
+def get_servico_coleta() -> ServicoColeta:
+    """Serviço compartilhado pelo processo, configurado pelo ambiente"""
+    global _servico
+    with _servico_lock:
+        if _servico is None:
+            _servico = ServicoColeta(intervalos_do_ambiente())
+        return _servico
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+Carregamento único do dicionário FACIAP
+
+Aceita os formatos em uso: colunas termo/categoria (backends) ou
+palavra_chave/eixo_temat (notebook), separador `,` ou `;` e pesos com
+vírgula decimal. O dicionário é compilado uma vez por processo em um
+KeywordMatcher (termos normalizados, pesos e ids de categoria) e só é
+recompilado quando o mtime e o conteúdo do CSV mudam.
+
+A pontuação persistida (coleta, --rescore-all e a API) usa
+`matcher_pontuacao`: termos e textos lematizados com spaCy quando
+CLIPPING_LEMATIZAR está ativo (padrão) e o modelo está instalado; senão o
+matcher sobre o texto em caixa baixa.
+"""
+
+import csv
+import hashlib
+import io
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from core.scoring.keyword_matcher import KeywordMatcher, obter_matcher
+
+logger = logging.getLogger(__name__)
+
+DICIONARIO_PATH_PADRAO = "config/dicionario_faciap.csv"
+
+LEMATIZAR = os.getenv('CLIPPING_LEMATIZAR', '1').lower() not in ('0', 'false', 'nao', 'no')
+
+COLUNAS_TERMO = ('termo', 'palavra_chave')
+COLUNAS_CATEGORIA = ('categoria', 'eixo_temat')
+
+Termo = Tuple[str, str, float, float]
+
+# Dicionário de exemplo, usado quando o CSV não existe ou é inválido
+TERMOS_EXEMPLO: List[Termo] = [
+    ('educação', 'Educação', 8, 3),
+    ('tecnologia', 'Tecnologia', 7, 5),
+    ('inteligência artificial', 'IA', 9, 8),
+    ('dados', 'Dados', 6, 7),
+    ('startup', 'Empreendedorismo', 7, 4),
+    ('inovação', 'Inovação', 8, 3),
+]
+
+
+def _numero(valor: Optional[str]) -> float:
+    """Peso do CSV, aceitando vírgula decimal"""
+    valor = (valor or '').strip().replace(',', '.')
+    return float(valor) if valor else 0.0
+
+
+def _coluna(campos: List[str], opcoes: Tuple[str, ...]) -> str:
+    for opcao in opcoes:
+        if opcao in campos:
+            return opcao
+    raise ValueError(f"dicionário sem coluna {' ou '.join(opcoes)}")
+
+
+def ler_termos_csv(conteudo: bytes) -> List[Termo]:
+    """
+    Interpreta o CSV do dicionário em qualquer um dos formatos aceitos
+
+    Args:
+        conteudo: Bytes do arquivo
+
+    Returns:
+        Tuplas (termo, categoria, peso_interesse, peso_risco)
+    """
+    try:
+        texto = conteudo.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        texto = conteudo.decode('latin-1')
+
+    cabecalho = texto.split('\n', 1)[0]
+    separador = ';' if cabecalho.count(';') > cabecalho.count(',') else ','
+    leitor = csv.DictReader(io.StringIO(texto), delimiter=separador)
+    leitor.fieldnames = [(campo or '').strip().lower() for campo in leitor.fieldnames or []]
+
+    coluna_termo = _coluna(leitor.fieldnames, COLUNAS_TERMO)
+    coluna_categoria = _coluna(leitor.fieldnames, COLUNAS_CATEGORIA)
+
+    termos = []
+    for linha in leitor:
+        termo = (linha.get(coluna_termo) or '').strip()
+        if not termo:
+            continue
+        termos.append((
+            termo,
+            (linha.get(coluna_categoria) or '').strip(),
+            _numero(linha.get('peso_interesse')),
+            _numero(linha.get('peso_risco')),
+        ))
+    return termos
+
+
+class DicionarioCompilado:
+    """
+    Dicionário pronto para uso, com a origem que permite detectar mudanças
+    """
+
+    __slots__ = ('caminho', 'mtime', 'hash_arquivo', 'termos', 'matcher', '_matcher_pontuacao', '_lock')
+
+    def __init__(self, termos: List[Termo], caminho: Optional[str] = None,
+                 mtime: Optional[float] = None, hash_arquivo: Optional[str] = None):
+        self.caminho = caminho
+        self.mtime = mtime
+        self.hash_arquivo = hash_arquivo
+        self.termos = termos
+        self.matcher: KeywordMatcher = obter_matcher(termos)
+        self._matcher_pontuacao: Optional[KeywordMatcher] = None
+        self._lock = threading.Lock()
+
+    @property
+    def matcher_pontuacao(self) -> KeywordMatcher:
+        """
+        Matcher dos scores gravados: lematizado se CLIPPING_LEMATIZAR e o
+        spaCy estão disponíveis (o modelo é carregado no primeiro uso)
+        """
+        if self._matcher_pontuacao is None:
+            with self._lock:
+                if self._matcher_pontuacao is None:
+                    self._matcher_pontuacao = self._compilar_pontuacao()
+        return self._matcher_pontuacao
+
+    def _compilar_pontuacao(self) -> KeywordMatcher:
+        if not LEMATIZAR:
+            return self.matcher
+        from core.scoring.lemmatizer import KeywordMatcherLematizado, get_lematizador
+
+        try:
+            return KeywordMatcherLematizado(self.termos, get_lematizador())
+        except (ImportError, OSError) as e:
+            logger.warning(f"Lematização indisponível ({e}); pontuando sem lematizar")
+            return self.matcher
+
+    @property
+    def versao_pontuacao(self) -> Optional[str]:
+        """
+        Versão do matcher_pontuacao sem compilá-lo: None se a lematização
+        ainda não foi carregada neste processo
+        """
+        if self._matcher_pontuacao is not None:
+            return self._matcher_pontuacao.versao
+        return None if LEMATIZAR else self.matcher.versao
+
+    @property
+    def versao(self) -> str:
+        """Versão do conteúdo (chave do cache de scores)"""
+        return self.matcher.versao
+
+    @property
+    def categorias(self) -> List[str]:
+        """Categorias distintas, na ordem do dicionário"""
+        return self.matcher.nomes_categoria
+
+    def __len__(self):
+        return len(self.termos)
+
+
+_compilados: Dict[str, DicionarioCompilado] = {}
+_lock = threading.Lock()
+
+
+def _recarregar(caminho: str, mtime: Optional[float],
+                atual: Optional[DicionarioCompilado]) -> DicionarioCompilado:
+    if mtime is None:
+        logger.warning(f"Dicionário {caminho} não encontrado; usando dicionário de exemplo")
+        return DicionarioCompilado(TERMOS_EXEMPLO, caminho)
+
+    with open(caminho, 'rb') as arquivo:
+        conteudo = arquivo.read()
+    hash_arquivo = hashlib.sha1(conteudo).hexdigest()
+
+    # Arquivo tocado sem mudança de conteúdo: só atualiza o mtime
+    if atual is not None and atual.hash_arquivo == hash_arquivo:
+        atual.mtime = mtime
+        return atual
+
+    try:
+        termos = ler_termos_csv(conteudo)
+    except (ValueError, csv.Error) as e:
+        # Não tenta de novo até a próxima alteração do arquivo
+        if atual is not None:
+            logger.error(f"Dicionário {caminho} inválido ({e}); mantendo a versão anterior")
+            atual.mtime = mtime
+            return atual
+        logger.error(f"Dicionário {caminho} inválido ({e}); usando dicionário de exemplo")
+        return DicionarioCompilado(TERMOS_EXEMPLO, caminho, mtime)
+
+    logger.info(f"Dicionário {caminho} carregado: {len(termos)} termos")
+    return DicionarioCompilado(termos, caminho, mtime, hash_arquivo)
+
+
+def obter_dicionario(caminho: Optional[str] = None) -> DicionarioCompilado:
+    """
+    Dicionário compilado do processo, recarregado se o CSV mudou
+
+    O custo por chamada é um `stat` no arquivo.
+
+    Args:
+        caminho: CSV do dicionário (DICIONARIO_PATH_PADRAO se None)
+    """
+    caminho = os.path.abspath(caminho or DICIONARIO_PATH_PADRAO)
+    try:
+        mtime = os.stat(caminho).st_mtime
+    except OSError:
+        mtime = None
+
+    atual = _compilados.get(caminho)
+    if atual is not None and atual.mtime == mtime:
+        return atual
+
+    with _lock:
+        atual = _compilados.get(caminho)
+        if atual is None or atual.mtime != mtime:
+            atual = _compilados[caminho] = _recarregar(caminho, mtime, atual)
+        return atual
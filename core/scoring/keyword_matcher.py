@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+Matcher compilado de palavras-chave do dicionário FACIAP
+
+Compila o dicionário uma única vez por versão e encontra todas as
+ocorrências de termos (inclusive compostos) em uma única passada sobre
+o texto, respeitando limites de palavra.
+"""
+
+import hashlib
+import re
+from collections import Counter, OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Quantidade de versões de dicionário mantidas em memória
+_MAX_MATCHERS_CACHE = 4
+
+
+def normalizar_padrao(texto: str) -> str:
+    """Normalização padrão: apenas caixa baixa"""
+    return texto.lower()
+
+
+def tokenizar(texto: str, normalizar: Callable[[str], str] = normalizar_padrao) -> List[str]:
+    """Quebra o texto normalizado em tokens de palavra"""
+    return _TOKEN_RE.findall(normalizar(texto))
+
+
+class ResultadoMatch:
+    """
+    Resultado da aplicação do dicionário sobre um texto
+    """
+
+    __slots__ = ('contagens', 'score_interesse', 'score_risco', 'categorias', 'categoria_dominante')
+
+    def __init__(self, contagens: Dict[str, int], score_interesse: float,
+                 score_risco: float, categorias: List[str],
+                 categoria_dominante: Optional[str] = None):
+        self.contagens = contagens
+        self.score_interesse = score_interesse
+        self.score_risco = score_risco
+        self.categorias = categorias
+        self.categoria_dominante = categoria_dominante
+
+    def to_dict(self) -> dict:
+        return {
+            'contagens': self.contagens,
+            'score_interesse': self.score_interesse,
+            'score_risco': self.score_risco,
+            'categorias': self.categorias,
+            'categoria_dominante': self.categoria_dominante,
+        }
+
+
+class KeywordMatcher:
+    """
+    Índice de termos do dicionário pronto para casamento em passada única
+
+    Os termos são tokenizados e indexados pelo primeiro token. Para cada
+    texto, apenas os tokens distintos do texto que iniciam algum termo são
+    examinados, de modo que o custo não cresce com o tamanho do dicionário.
+    """
+
+    def __init__(self, termos: Iterable[Tuple[str, str, float, float]],
+                 normalizar: Callable[[str], str] = normalizar_padrao):
+        """
+        Args:
+            termos: Tuplas (termo, categoria, peso_interesse, peso_risco)
+            normalizar: Função aplicada igualmente a termos e textos
+        """
+        self.normalizar = normalizar
+        self.termos: List[str] = []
+        self.categorias: List[str] = []
+        self.pesos_interesse: List[float] = []
+        self.pesos_risco: List[float] = []
+        self._tokens_termo: List[Tuple[str, ...]] = []
+        # primeiro token -> índices dos termos que começam por ele
+        self._por_primeiro: Dict[str, List[int]] = {}
+
+        for termo, categoria, peso_interesse, peso_risco in termos:
+            tokens = tuple(tokenizar(str(termo), normalizar))
+            if not tokens:
+                continue
+            idx = len(self.termos)
+            self.termos.append(' '.join(tokens))
+            self.categorias.append(categoria)
+            self.pesos_interesse.append(float(peso_interesse or 0))
+            self.pesos_risco.append(float(peso_risco or 0))
+            self._tokens_termo.append(tokens)
+            self._por_primeiro.setdefault(tokens[0], []).append(idx)
+
+        # Categorias distintas, na ordem do dicionário, e o id da categoria de cada termo
+        self.nomes_categoria: List[str] = list(dict.fromkeys(self.categorias))
+        indice_categoria = {c: i for i, c in enumerate(self.nomes_categoria)}
+        self.ids_categoria: List[int] = [indice_categoria[c] for c in self.categorias]
+
+        self.versao = calcular_versao(
+            zip(self.termos, self.categorias, self.pesos_interesse, self.pesos_risco)
+        )
+
+    def __len__(self):
+        return len(self.termos)
+
+    def contar(self, texto: str) -> Dict[int, int]:
+        """
+        Conta as ocorrências de cada termo no texto
+
+        Returns:
+            Dicionário {índice do termo: ocorrências}, apenas termos presentes
+        """
+        if not texto:
+            return {}
+
+        tokens = tokenizar(texto, self.normalizar)
+        frequencias = Counter(tokens)
+        contagens: Dict[int, int] = {}
+
+        for primeiro in frequencias.keys() & self._por_primeiro.keys():
+            posicoes = None
+            for idx in self._por_primeiro[primeiro]:
+                tokens_termo = self._tokens_termo[idx]
+                if len(tokens_termo) == 1:
+                    contagens[idx] = frequencias[primeiro]
+                    continue
+
+                # Termo composto: só varre o texto se todas as palavras aparecem
+                if any(tok not in frequencias for tok in tokens_termo[1:]):
+                    continue
+                if posicoes is None:
+                    posicoes = [i for i, tok in enumerate(tokens) if tok == primeiro]
+                n = len(tokens_termo)
+                ocorrencias = sum(
+                    1 for i in posicoes if tuple(tokens[i:i + n]) == tokens_termo
+                )
+                if ocorrencias:
+                    contagens[idx] = ocorrencias
+
+        return contagens
+
+    def preparar_textos(self, textos: List[str], conn=None) -> List[str]:
+        """
+        Textos na forma comparada pelo matcher (aqui, os próprios textos)
+
+        Subclasses que transformam os termos (p.ex. lematização) aplicam a
+        mesma transformação aos textos antes de match e da matriz esparsa.
+
+        Args:
+            textos: Textos brutos (título + corpo)
+            conn: Conexão com o banco, para caches da transformação
+        """
+        return textos
+
+    def match(self, texto: str, por_ocorrencia: bool = False) -> ResultadoMatch:
+        """
+        Aplica o dicionário ao texto
+
+        Args:
+            texto: Texto bruto (título + corpo)
+            por_ocorrencia: Se True, os pesos são multiplicados pelo número de
+                ocorrências (critério do notebook); senão cada termo presente
+                conta uma vez (critério dos backends)
+        """
+        contagens = self.contar(texto)
+        score_interesse = 0.0
+        score_risco = 0.0
+        categorias: List[str] = []
+        termos_por_categoria: Dict[int, int] = {}
+
+        # Ordem do dicionário, como no laço original
+        for idx in sorted(contagens):
+            fator = contagens[idx] if por_ocorrencia else 1
+            score_interesse += fator * self.pesos_interesse[idx]
+            score_risco += fator * self.pesos_risco[idx]
+            categoria = self.categorias[idx]
+            if categoria not in categorias:
+                categorias.append(categoria)
+            id_categoria = self.ids_categoria[idx]
+            termos_por_categoria[id_categoria] = termos_por_categoria.get(id_categoria, 0) + 1
+
+        # Categoria dominante: a que tem mais termos ativados (empate: ordem do dicionário)
+        dominante = None
+        if termos_por_categoria:
+            dominante = self.nomes_categoria[
+                min(termos_por_categoria, key=lambda c: (-termos_por_categoria[c], c))
+            ]
+
+        return ResultadoMatch(
+            {self.termos[idx]: n for idx, n in sorted(contagens.items())},
+            score_interesse,
+            score_risco,
+            categorias,
+            dominante
+        )
+
+
+def calcular_versao(termos: Iterable[tuple]) -> str:
+    """Hash estável do conteúdo do dicionário"""
+    digest = hashlib.sha1()
+    for registro in termos:
+        digest.update(repr(tuple(registro)).encode('utf-8'))
+        digest.update(b'\n')
+    return digest.hexdigest()
+
+
+_matchers: "OrderedDict[str, KeywordMatcher]" = OrderedDict()
+
+
+def obter_matcher(termos: Iterable[Tuple[str, str, float, float]],
+                  normalizar: Callable[[str], str] = normalizar_padrao) -> KeywordMatcher:
+    """
+    Retorna o matcher compilado para o dicionário, reaproveitando versões já compiladas
+
+    Args:
+        termos: Tuplas (termo, categoria, peso_interesse, peso_risco)
+        normalizar: Função de normalização de termos e textos
+    """
+    termos = [tuple(t) for t in termos]
+    chave = f"{getattr(normalizar, '__qualname__', normalizar)}:{calcular_versao(termos)}"
+
+    matcher = _matchers.get(chave)
+    if matcher is None:
+        matcher = KeywordMatcher(termos, normalizar)
+        _matchers[chave] = matcher
+        while len(_matchers) > _MAX_MATCHERS_CACHE:
+            _matchers.popitem(last=False)
+    else:
+        _matchers.move_to_end(chave)
+    return matcher
+
+
+def matcher_do_dataframe(df, coluna_termo: Optional[str] = None,
+                         coluna_categoria: Optional[str] = None,
+                         normalizar: Callable[[str], str] = normalizar_padrao) -> KeywordMatcher:
+    """
+    Compila (ou reaproveita) o matcher a partir de um DataFrame de dicionário
+
+    Aceita tanto o formato dos backends (termo/categoria) quanto o do
+    notebook (palavra_chave/eixo_temat).
+    """
+    if coluna_termo is None:
+        coluna_termo = 'termo' if 'termo' in df.columns else 'palavra_chave'
+    if coluna_categoria is None:
+        coluna_categoria = 'categoria' if 'categoria' in df.columns else 'eixo_temat'
+
+    return obter_matcher(
+        df[[coluna_termo, coluna_categoria, 'peso_interesse', 'peso_risco']].itertuples(index=False, name=None),
+        normalizar
+    )
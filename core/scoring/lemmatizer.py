@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+Lematização em lote com spaCy e cache persistente
+
+Só o lema e `is_stop` de cada token são usados, então o modelo é carregado
+sem parser e NER e os textos passam por `nlp.pipe` em lotes (opcionalmente
+em vários processos). O resultado fica em lemas_cache, chaveado pelo hash do
+texto limpo e pelo modelo: um texto já visto nunca é lematizado de novo.
+
+KeywordMatcherLematizado aplica o dicionário sobre termos e textos
+lematizados; é o matcher da pontuação quando CLIPPING_LEMATIZAR está ativo
+(core.scoring.dictionary_loader).
+
+O lematizador compartilhado usa CLIPPING_LEMATIZAR_PROCESSOS processos e
+lotes de CLIPPING_LEMATIZAR_LOTE textos no nlp.pipe.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from typing import Iterable, List, Optional, Tuple
+
+from core.database.bulk_ops import lemas_em_cache, save_lemas_bulk
+from core.scoring.keyword_matcher import KeywordMatcher, calcular_versao
+
+MODELO_PADRAO = "pt_core_news_sm"
+COMPONENTES_DESATIVADOS = ("parser", "ner")
+
+PROCESSOS = int(os.getenv('CLIPPING_LEMATIZAR_PROCESSOS', '1'))
+TAMANHO_LOTE = int(os.getenv('CLIPPING_LEMATIZAR_LOTE', '64'))
+
+
+def limpar_texto(texto: Optional[str]) -> str:
+    """Minúsculas, sem acentos e sem pontuação (mesma limpeza do notebook)"""
+    texto = (texto or "").lower()
+    texto = unicodedata.normalize('NFKD', texto).encode('ASCII', 'ignore').decode('utf-8')
+    texto = re.sub(r'[\W_]+', ' ', texto)
+    return texto.strip()
+
+
+def hash_texto(texto_limpo: str) -> str:
+    """Chave do cache para um texto já limpo"""
+    return hashlib.sha1(texto_limpo.encode('utf-8')).hexdigest()
+
+
+class Lematizador:
+    """
+    Lematiza textos em lote, reaproveitando o cache em lemas_cache
+    """
+
+    def __init__(self, modelo: str = MODELO_PADRAO, batch_size: int = 64, n_process: int = 1):
+        """
+        Args:
+            modelo: Nome do modelo spaCy
+            batch_size: Textos por lote no nlp.pipe
+            n_process: Processos do nlp.pipe (1 = no processo atual)
+        """
+        self.modelo = modelo
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self._nlp = None
+        self._lock = threading.Lock()
+
+    @property
+    def nlp(self):
+        """Modelo spaCy, carregado no primeiro uso"""
+        if self._nlp is None:
+            with self._lock:
+                if self._nlp is None:
+                    import spacy
+                    self._nlp = spacy.load(self.modelo, disable=list(COMPONENTES_DESATIVADOS))
+        return self._nlp
+
+    def _lematizar(self, textos: List[str]) -> List[str]:
+        """Executa o spaCy sobre textos já limpos"""
+        return [
+            ' '.join(token.lemma_ for token in doc if not token.is_stop)
+            for doc in self.nlp.pipe(textos, batch_size=self.batch_size, n_process=self.n_process)
+        ]
+
+    def lematizar_lote(self, conn: Optional[sqlite3.Connection],
+                       textos: Iterable[Optional[str]]) -> List[str]:
+        """
+        Lematiza os textos, na mesma ordem
+
+        Args:
+            conn: Conexão com o banco do cache (None = sem cache)
+            textos: Textos brutos
+
+        Returns:
+            Textos limpos e lematizados, sem stopwords
+        """
+        limpos = [limpar_texto(texto) for texto in textos]
+        hashes = [hash_texto(texto) for texto in limpos]
+
+        lemas = lemas_em_cache(conn, self.modelo, hashes) if conn is not None else {}
+
+        # Textos repetidos no lote são lematizados uma vez
+        faltantes = {h: texto for h, texto in zip(hashes, limpos) if h not in lemas}
+        if faltantes:
+            novos = dict(zip(faltantes, self._lematizar(list(faltantes.values()))))
+            lemas.update(novos)
+            if conn is not None:
+                save_lemas_bulk(conn, self.modelo, novos.items())
+
+        return [lemas[h] for h in hashes]
+
+    def lematizar(self, texto: Optional[str], conn: Optional[sqlite3.Connection] = None) -> str:
+        """Lematiza um único texto"""
+        return self.lematizar_lote(conn, [texto])[0]
+
+
+class KeywordMatcherLematizado(KeywordMatcher):
+    """
+    KeywordMatcher sobre a forma lematizada de termos e textos
+
+    Os termos do dicionário são lematizados ao compilar; os textos, em lote
+    por `preparar_textos`, com o cache de lemas_cache. A versão inclui o
+    modelo, de modo que os scores lematizados têm cache próprio.
+    """
+
+    def __init__(self, termos: Iterable[Tuple[str, str, float, float]],
+                 lematizador: Lematizador, conn: Optional[sqlite3.Connection] = None):
+        """
+        Args:
+            termos: Tuplas (termo, categoria, peso_interesse, peso_risco)
+            lematizador: Lematizador dos termos e textos
+            conn: Conexão com o banco do cache de lemas (None = sem cache)
+        """
+        termos = list(termos)
+        lemas = lematizador.lematizar_lote(conn, [termo for termo, *_ in termos])
+        # Termos formados só por stopwords somem na lematização e são descartados pelo matcher
+        super().__init__(
+            [(lema, categoria, peso_interesse, peso_risco)
+             for lema, (_, categoria, peso_interesse, peso_risco) in zip(lemas, termos)],
+            limpar_texto
+        )
+        self.lematizador = lematizador
+        self.versao = calcular_versao([(self.versao, 'lemas', lematizador.modelo)])
+
+    def preparar_textos(self, textos: List[str], conn: Optional[sqlite3.Connection] = None) -> List[str]:
+        """Textos limpos e lematizados, reaproveitando lemas_cache"""
+        return self.lematizador.lematizar_lote(conn, textos)
+
+
+_lematizador: Optional[Lematizador] = None
+
+
+def get_lematizador(n_process: Optional[int] = None, batch_size: Optional[int] = None) -> Lematizador:
+    """
+    Lematizador compartilhado do processo (modelo carregado uma vez)
+
+    Args:
+        n_process: Processos do nlp.pipe (None = mantém o atual, de início PROCESSOS)
+        batch_size: Textos por lote no nlp.pipe (None = mantém o atual, de início TAMANHO_LOTE)
+    """
+    global _lematizador
+    if _lematizador is None:
+        _lematizador = Lematizador(batch_size=TAMANHO_LOTE, n_process=PROCESSOS)
+    # Só valem para as próximas chamadas ao nlp.pipe; o modelo não é recarregado
+    if n_process is not None:
+        _lematizador.n_process = n_process
+    if batch_size is not None:
+        _lematizador.batch_size = batch_size
+    return _lematizador
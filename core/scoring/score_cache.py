@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Cache persistente de scores por notícia e versão do dicionário
+
+Os scores ficam em scores_faciap, chaveados por (noticia_id, dicionario_hash),
+e são espelhados em noticias.score_interesse/score_risco/score_versao. Uma
+notícia só é pontuada novamente quando o dicionário muda (novo hash) ou
+quando seu texto é alterado (o trigger trg_noticias_invalida_score apaga o
+cache e zera score_versao).
+"""
+
+import json
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.database.bulk_ops import save_scores_bulk
+from core.scoring.keyword_matcher import KeywordMatcher
+
+Score = Tuple[float, float, List[str]]
+
+# Notícia sem score ou com score de outra versão (intervalos usam ix_noticias_score_versao)
+_CONDICAO_PENDENTE = "score_versao IS NULL OR score_versao < ? OR score_versao > ?"
+
+
+def texto_para_score(titulo: Optional[str], texto: Optional[str]) -> str:
+    """Texto sobre o qual o dicionário é aplicado (corpo + título)"""
+    return (texto or "") + " " + (titulo or "")
+
+
+def decodificar_categorias(valor: Optional[str]) -> List[str]:
+    """Converte a coluna categorias (JSON) em lista"""
+    if not valor:
+        return []
+    try:
+        return json.loads(valor)
+    except ValueError:
+        # Formato legado separado por vírgulas
+        return [c.strip() for c in valor.split(',') if c.strip()]
+
+
+def calcular_e_salvar(conn: sqlite3.Connection,
+                      noticias: Iterable[Tuple[int, Optional[str], Optional[str]]],
+                      matcher: KeywordMatcher) -> Dict[int, Score]:
+    """
+    Pontua as notícias e persiste o resultado em uma única transação
+
+    Args:
+        conn: Conexão com o banco
+        noticias: Tuplas (id, titulo, texto_completo)
+        matcher: Dicionário compilado; sua versão identifica o cache
+
+    Returns:
+        {noticia_id: (score_interesse, score_risco, categorias)}
+    """
+    scores: Dict[int, Score] = {}
+    dominantes: Dict[int, Optional[str]] = {}
+    noticias = list(noticias)
+    textos = matcher.preparar_textos([texto_para_score(titulo, texto) for _, titulo, texto in noticias], conn)
+    for (noticia_id, _, _), texto in zip(noticias, textos):
+        resultado = matcher.match(texto)
+        scores[noticia_id] = (resultado.score_interesse, resultado.score_risco, resultado.categorias)
+        dominantes[noticia_id] = resultado.categoria_dominante
+
+    save_scores_bulk(conn, (
+        {
+            'noticia_id': noticia_id,
+            'score_interesse': score_interesse,
+            'score_risco': score_risco,
+            'categorias': categorias,
+            'categoria_dominante': dominantes[noticia_id]
+        }
+        for noticia_id, (score_interesse, score_risco, categorias) in scores.items()
+    ), matcher.versao)
+
+    return scores
+
+
+def existem_pendentes(conn: sqlite3.Connection, dicionario_hash: Optional[str]) -> bool:
+    """
+    Verifica, pelo índice de score_versao, se há notícias a pontuar
+
+    Com dicionario_hash None, só as notícias nunca pontuadas contam.
+    """
+    if dicionario_hash is None:
+        return bool(conn.execute(
+            "SELECT EXISTS (SELECT 1 FROM noticias WHERE score_versao IS NULL)"
+        ).fetchone()[0])
+    row = conn.execute("""
+        SELECT EXISTS (SELECT 1 FROM noticias WHERE score_versao IS NULL)
+            OR EXISTS (SELECT 1 FROM noticias WHERE score_versao < ?)
+            OR EXISTS (SELECT 1 FROM noticias WHERE score_versao > ?)
+    """, (dicionario_hash, dicionario_hash)).fetchone()
+    return bool(row[0])
+
+
+def rescore_pendentes(conn: sqlite3.Connection, matcher: KeywordMatcher,
+                      tamanho_lote: int = 500) -> int:
+    """
+    Pontua todas as notícias sem score para a versão atual do dicionário
+
+    Args:
+        conn: Conexão com o banco
+        matcher: Dicionário compilado
+        tamanho_lote: Notícias por transação
+
+    Returns:
+        Quantidade de notícias pontuadas
+    """
+    if not existem_pendentes(conn, matcher.versao):
+        return 0
+
+    total = 0
+    ultimo_id = 0
+    while True:
+        lote = conn.execute(f"""
+            SELECT id, titulo, texto_completo
+            FROM noticias
+            WHERE ({_CONDICAO_PENDENTE}) AND id > ?
+            ORDER BY id
+            LIMIT ?
+        """, (matcher.versao, matcher.versao, ultimo_id, tamanho_lote)).fetchall()
+        if not lote:
+            return total
+
+        calcular_e_salvar(conn, lote, matcher)
+        total += len(lote)
+        ultimo_id = lote[-1][0]
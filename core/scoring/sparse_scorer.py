@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+Repontuação em lote com matriz esparsa documento-termo
+
+O corpus é tokenizado uma única vez em uma matriz de contagens
+(documentos x vocabulário). O dicionário vira uma matriz esparsa
+vocabulário x termos e vetores de pesos, e scores e categorias de todas as
+notícias saem de produtos matriz-vetor. Termos compostos só são
+verificados nos documentos que contêm todas as suas palavras.
+
+Os resultados são idênticos aos de KeywordMatcher.match, de modo que os
+dois caminhos compartilham o cache de scores_faciap.
+"""
+
+import sqlite3
+import time
+from itertools import chain
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from core.database.bulk_ops import save_scores_bulk
+from core.scoring.keyword_matcher import KeywordMatcher, normalizar_padrao, tokenizar
+from core.scoring.score_cache import texto_para_score
+
+TAMANHO_BLOCO_PADRAO = 5000
+
+
+class MatrizDocumentos:
+    """
+    Contagens de tokens do corpus em formato CSR (documentos x vocabulário)
+    """
+
+    def __init__(self, textos: Sequence[Optional[str]],
+                 normalizar: Callable[[str], str] = normalizar_padrao):
+        """
+        Args:
+            textos: Textos dos documentos, na ordem das linhas
+            normalizar: Mesma normalização do matcher
+        """
+        self.normalizar = normalizar
+        self.tokens = [tokenizar(texto, normalizar) if texto else [] for texto in textos]
+
+        # Vocabulário e contagens montados em C (pandas/scipy), sem laço por token
+        tamanhos = np.fromiter(map(len, self.tokens), dtype=np.int64, count=len(self.tokens))
+        todos = np.fromiter(chain.from_iterable(self.tokens), dtype=object, count=int(tamanhos.sum()))
+        codigos, unicos = pd.factorize(todos)
+        self.vocabulario: Dict[str, int] = {token: i for i, token in enumerate(unicos)}
+
+        self.contagens = sparse.csr_matrix(
+            (np.ones(len(codigos), dtype=np.int32), (np.repeat(np.arange(len(self.tokens)), tamanhos), codigos)),
+            shape=(len(self.tokens), max(len(self.vocabulario), 1))
+        )
+        self.contagens.sum_duplicates()
+
+    def __len__(self):
+        return self.contagens.shape[0]
+
+
+class ResultadoLote(NamedTuple):
+    """Scores de um lote de documentos, alinhados às linhas da matriz"""
+    score_interesse: np.ndarray
+    score_risco: np.ndarray
+    categorias: List[List[str]]
+    categoria_dominante: List[Optional[str]]
+
+
+def _contar_sequencia(tokens: List[str], sequencia: Tuple[str, ...]) -> int:
+    n = len(sequencia)
+    primeiro = sequencia[0]
+    return sum(
+        1 for i, tok in enumerate(tokens)
+        if tok == primeiro and tuple(tokens[i:i + n]) == sequencia
+    )
+
+
+def contagens_de_termos(matriz: MatrizDocumentos, matcher: KeywordMatcher) -> sparse.csr_matrix:
+    """
+    Ocorrências de cada termo do dicionário em cada documento
+
+    Returns:
+        Matriz CSR documentos x termos
+    """
+    n_termos = len(matcher)
+    vocabulario = matriz.vocabulario
+
+    # Termos de uma palavra: projeção das colunas do vocabulário
+    linhas, colunas = [], []
+    compostos = []
+    for idx, tokens in enumerate(matcher._tokens_termo):
+        if len(tokens) == 1:
+            coluna = vocabulario.get(tokens[0])
+            if coluna is not None:
+                linhas.append(coluna)
+                colunas.append(idx)
+        elif all(tok in vocabulario for tok in tokens):
+            compostos.append(idx)
+
+    projecao = sparse.csr_matrix(
+        (np.ones(len(linhas), dtype=np.int32), (linhas, colunas)),
+        shape=(matriz.contagens.shape[1], n_termos)
+    )
+    resultado = (matriz.contagens @ projecao).tocsr()
+
+    # Termos compostos: candidatos são os documentos com todas as palavras
+    if compostos:
+        presenca = (matriz.contagens > 0).tocsc()
+        extras_linhas, extras_colunas, extras_dados = [], [], []
+        for idx in compostos:
+            colunas_termo = [vocabulario[tok] for tok in matcher._tokens_termo[idx]]
+            candidatos = np.asarray(presenca[:, colunas_termo].sum(axis=1)).ravel() == len(colunas_termo)
+            for doc in np.flatnonzero(candidatos):
+                ocorrencias = _contar_sequencia(matriz.tokens[doc], matcher._tokens_termo[idx])
+                if ocorrencias:
+                    extras_linhas.append(doc)
+                    extras_colunas.append(idx)
+                    extras_dados.append(ocorrencias)
+        if extras_dados:
+            resultado = resultado + sparse.csr_matrix(
+                (extras_dados, (extras_linhas, extras_colunas)), shape=resultado.shape
+            )
+
+    resultado.eliminate_zeros()
+    resultado.sort_indices()
+    return resultado
+
+
+def pontuar_matriz(matriz: MatrizDocumentos, matcher: KeywordMatcher,
+                   por_ocorrencia: bool = False) -> ResultadoLote:
+    """
+    Aplica o dicionário a todos os documentos da matriz
+
+    Args:
+        matriz: Corpus tokenizado
+        matcher: Dicionário compilado
+        por_ocorrencia: Mesmo critério de KeywordMatcher.match
+    """
+    termos = contagens_de_termos(matriz, matcher)
+    if not por_ocorrencia:
+        termos.data[:] = 1
+
+    pesos_interesse = np.asarray(matcher.pesos_interesse, dtype=np.float64)
+    pesos_risco = np.asarray(matcher.pesos_risco, dtype=np.float64)
+    score_interesse = termos @ pesos_interesse if len(matcher) else np.zeros(len(matriz))
+    score_risco = termos @ pesos_risco if len(matcher) else np.zeros(len(matriz))
+
+    # Categorias: ordem do dicionário, como em KeywordMatcher.match
+    nomes_categoria = matcher.nomes_categoria
+    categoria_do_termo = np.asarray(matcher.ids_categoria, dtype=np.int32)
+    categorias: List[List[str]] = []
+    for doc in range(len(matriz)):
+        presentes = categoria_do_termo[termos.indices[termos.indptr[doc]:termos.indptr[doc + 1]]]
+        categorias.append([nomes_categoria[c] for c in dict.fromkeys(presentes.tolist())])
+
+    # Categoria dominante: a que tem mais termos ativados (empate: ordem do dicionário)
+    dominante: List[Optional[str]] = [None] * len(matriz)
+    if len(matcher):
+        indicadora = sparse.csr_matrix(
+            (np.ones(len(matcher), dtype=np.int32), (np.arange(len(matcher)), categoria_do_termo)),
+            shape=(len(matcher), len(nomes_categoria))
+        )
+        por_categoria = ((termos > 0).astype(np.int32) @ indicadora).toarray()
+        ativos = por_categoria.any(axis=1)
+        maiores = por_categoria.argmax(axis=1)
+        dominante = [nomes_categoria[c] if ativo else None for c, ativo in zip(maiores, ativos)]
+
+    return ResultadoLote(
+        np.asarray(score_interesse, dtype=np.float64).ravel(),
+        np.asarray(score_risco, dtype=np.float64).ravel(),
+        categorias,
+        dominante
+    )
+
+
+def _blocos_de_noticias(conn: sqlite3.Connection, tamanho_bloco: int) -> Iterator[List[tuple]]:
+    ultimo_id = 0
+    while True:
+        bloco = conn.execute("""
+            SELECT id, titulo, texto_completo
+            FROM noticias
+            WHERE id > ?
+            ORDER BY id
+            LIMIT ?
+        """, (ultimo_id, tamanho_bloco)).fetchall()
+        if not bloco:
+            return
+        yield bloco
+        ultimo_id = bloco[-1][0]
+
+
+def rescore_todas(conn: sqlite3.Connection, matcher: KeywordMatcher,
+                  tamanho_bloco: int = TAMANHO_BLOCO_PADRAO) -> Dict[str, float]:
+    """
+    Repontua todo o acervo com o dicionário e grava em lote
+
+    Args:
+        conn: Conexão com o banco
+        matcher: Dicionário compilado; sua versão identifica o cache
+        tamanho_bloco: Notícias tokenizadas e gravadas por vez
+
+    Returns:
+        {'noticias', 'blocos', 'tempo_pontuacao', 'tempo_gravacao', 'tempo'}
+    """
+    inicio = time.perf_counter()
+    stats = {'noticias': 0, 'blocos': 0, 'tempo_pontuacao': 0.0, 'tempo_gravacao': 0.0}
+
+    for bloco in _blocos_de_noticias(conn, tamanho_bloco):
+        t0 = time.perf_counter()
+        textos = matcher.preparar_textos([texto_para_score(titulo, texto) for _, titulo, texto in bloco], conn)
+        matriz = MatrizDocumentos(textos, matcher.normalizar)
+        resultado = pontuar_matriz(matriz, matcher)
+        t1 = time.perf_counter()
+
+        save_scores_bulk(conn, (
+            {
+                'noticia_id': noticia_id,
+                'score_interesse': resultado.score_interesse[i],
+                'score_risco': resultado.score_risco[i],
+                'categorias': resultado.categorias[i],
+                'categoria_dominante': resultado.categoria_dominante[i]
+            }
+            for i, (noticia_id, _, _) in enumerate(bloco)
+        ), matcher.versao)
+
+        stats['tempo_pontuacao'] += t1 - t0
+        stats['tempo_gravacao'] += time.perf_counter() - t1
+        stats['noticias'] += len(bloco)
+        stats['blocos'] += 1
+
+    stats['tempo'] = time.perf_counter() - inicio
+    return stats
@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+"""
+Coleta concorrente das páginas de listagem da Câmara e do Senado
+
+As páginas são buscadas em uma janela deslizante de até `concorrencia`
+requisições por fonte, sob um limite de taxa por host (token bucket). A
+coleta para assim que uma página atinge notícias anteriores a `data_limite`
+e descarta as páginas posteriores já em voo.
+
+No modo incremental, a coleta também para na primeira página cujos links
+já estão todos gravados no banco.
+
+Uma página que responde 404 marca o fim da paginação. Uma página com erro
+não interrompe a coleta: as páginas seguintes continuam sendo buscadas.
+
+Com uma fronteira (core.database.frontier), cada página concluída fica
+registrada com suas notícias. Uma coleta normal sempre busca de novo as
+primeiras páginas, onde entram as notícias novas; só com `retomar` (a
+retomada de uma carga longa interrompida) as páginas já concluídas são
+puladas e as páginas com erro esperam o backoff vencer.
+"""
+
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, NamedTuple, Optional, Set
+
+from core.http_client import HttpClient, get_http_client
+from core.metrics import medir_etapa
+from core.scrapers.listing_parsers import (
+    ItemListagem,
+    parse_listagem_camara,
+    parse_listagem_senado,
+)
+from core.scrapers.rate_limiter import HostLimiter
+
+if TYPE_CHECKING:
+    from core.database.frontier import Fronteira
+
+logger = logging.getLogger(__name__)
+
+DATA_LIMITE_PADRAO = datetime(2025, 7, 1)
+
+
+class FonteListagem(NamedTuple):
+    """Descrição de uma fonte paginada de notícias"""
+    nome: str
+    url_base: str
+    formato_pagina: str
+    parser: Callable[[bytes, str], List[ItemListagem]]
+
+    def url_pagina(self, pagina: int) -> str:
+        """URL da página `pagina` (a primeira é a própria url_base)"""
+        if pagina == 1:
+            return self.url_base
+        return self.formato_pagina.format(base=self.url_base, pagina=pagina)
+
+
+def fonte_camara(url_base: str = "https://www.camara.leg.br/noticias/ultimas") -> FonteListagem:
+    return FonteListagem('Câmara dos Deputados', url_base, '{base}?pagina={pagina}', parse_listagem_camara)
+
+
+def fonte_senado(url_base: str = "https://www12.senado.leg.br/noticias/ultimas") -> FonteListagem:
+    return FonteListagem('Senado Federal', url_base, '{base}/{pagina}', parse_listagem_senado)
+
+
+class ResultadoPagina(NamedTuple):
+    """Resultado do processamento de uma página de listagem"""
+    pagina: int
+    noticias: List[dict]
+    antigas: int
+    encerra: bool
+    erro: Optional[str] = None
+
+
+class ListingCrawler:
+    """
+    Coletor de listagens com busca concorrente e parada antecipada
+    """
+
+    def __init__(self, concorrencia: int = 4, taxa_por_host: Optional[float] = 2.0,
+                 data_limite: datetime = DATA_LIMITE_PADRAO, timeout: int = 30,
+                 client: Optional[HttpClient] = None,
+                 links_conhecidos: Optional[Callable[[Iterable[str]], Set[str]]] = None,
+                 fronteira: Optional['Fronteira'] = None, retomar: bool = False):
+        """
+        Args:
+            concorrencia: Páginas simultâneas por host
+            taxa_por_host: Requisições por segundo por host (None = sem limite, p.ex. no replay)
+            data_limite: Notícias anteriores a esta data encerram a coleta
+            timeout: Timeout de cada requisição em segundos
+            client: Cliente HTTP (o compartilhado do processo se None)
+            links_conhecidos: Função que, dada uma lista de links, retorna os já
+                gravados; ativa o modo incremental
+            fronteira: Fronteira persistente; ativa o checkpoint das listagens
+            retomar: Pula as páginas já concluídas e as que aguardam o backoff
+                no checkpoint da fronteira (retomada de uma carga interrompida)
+        """
+        self.concorrencia = max(int(concorrencia), 1)
+        self.data_limite = data_limite
+        self.timeout = timeout
+        self.limiter = HostLimiter(self.concorrencia, taxa_por_host, rajada=self.concorrencia)
+        self.client = client or get_http_client()
+        self.links_conhecidos = links_conhecidos
+        self.fronteira = fronteira
+        self.retomar = retomar
+
+    def _baixar(self, url: str) -> Optional[bytes]:
+        """Corpo da página, ou None se ela não existe (404)"""
+        with self.limiter.limitar(url):
+            response = self.client.get(url, timeout=self.timeout)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.content
+
+    def _processar_pagina(self, fonte: FonteListagem, pagina: int) -> ResultadoPagina:
+        url = fonte.url_pagina(pagina)
+        try:
+            html = self._baixar(url)
+            if html is None:
+                logger.info(f"📄 {fonte.nome} p.{pagina}: página inexistente (404), fim da listagem")
+                return ResultadoPagina(pagina, [], 0, True)
+            with medir_etapa('parsing_listagem') as medicao:
+                itens = fonte.parser(html, fonte.url_base)
+                medicao.itens = len(itens)
+        except Exception as e:
+            logger.error(f"❌ {fonte.nome}: erro na página {pagina}: {e}")
+            # O erro não encerra a coleta: as páginas seguintes ainda são buscadas
+            return ResultadoPagina(pagina, [], 0, False, str(e))
+
+        noticias = []
+        antigas = 0
+        conhecidas = 0
+        for item in itens:
+            if item.data_publicacao is None:
+                continue
+            if item.data_publicacao >= self.data_limite:
+                noticias.append({
+                    'fonte': fonte.nome,
+                    'titulo': item.titulo,
+                    'link': item.link,
+                    'data_publicacao': item.data_publicacao,
+                    'data_texto': item.data_texto,
+                    'data_coleta': datetime.now()
+                })
+            else:
+                antigas += 1
+
+        # Página vazia ou que já cruzou a data limite encerra a coleta
+        encerra = antigas > 0 or not noticias
+
+        if self.links_conhecidos and noticias:
+            gravados = self.links_conhecidos([n['link'] for n in noticias])
+            conhecidas = len(gravados)
+            noticias = [n for n in noticias if n['link'] not in gravados]
+            # Página só com notícias já gravadas: o restante já foi coletado antes
+            encerra = encerra or not noticias
+
+        logger.info(
+            f"📄 {fonte.nome} p.{pagina}: {len(noticias)} novas, {conhecidas} já gravadas, "
+            f"{antigas} anteriores ao limite"
+        )
+        return ResultadoPagina(pagina, noticias, antigas, encerra)
+
+    def crawl(self, fonte: FonteListagem, max_pages: int) -> List[dict]:
+        """
+        Coleta as páginas 1..max_pages de uma fonte
+
+        Args:
+            fonte: Fonte de listagem
+            max_pages: Número máximo de páginas
+
+        Returns:
+            Notícias válidas na ordem das páginas (na retomada, só as das
+            páginas buscadas agora; as demais já estão na fronteira)
+        """
+        resultados: Dict[int, ResultadoPagina] = {}
+        em_voo = {}
+        proxima = 1
+        limite = max_pages
+        pagina_final: Optional[int] = None
+        puladas: Set[int] = set()
+        aguardando: Set[int] = set()
+
+        if self.fronteira is not None:
+            checkpoint = self.fronteira.retomar_listagem(
+                fonte.nome, {pagina: fonte.url_pagina(pagina) for pagina in range(1, max_pages + 1)}
+            )
+            if self.retomar:
+                # Páginas com erro ainda no backoff são puladas, sem limitar as seguintes
+                aguardando = checkpoint.aguardando
+                puladas = checkpoint.concluidas | aguardando
+                limite = max(limite, checkpoint.limite)
+                pagina_final = checkpoint.pagina_final
+            if self.retomar and checkpoint.retomada:
+                logger.info(
+                    f"↩️ {fonte.nome}: retomando a coleta ({len(checkpoint.concluidas)} páginas já concluídas, "
+                    f"{len(aguardando)} aguardando nova tentativa)"
+                )
+
+        with ThreadPoolExecutor(max_workers=self.concorrencia) as executor:
+            while True:
+                while ((pagina_final is None or proxima < pagina_final) and proxima <= limite
+                       and len(em_voo) < self.concorrencia):
+                    if proxima not in puladas:
+                        em_voo[executor.submit(self._processar_pagina, fonte, proxima)] = proxima
+                    proxima += 1
+
+                if not em_voo:
+                    break
+
+                concluidos, _ = wait(list(em_voo), return_when=FIRST_COMPLETED)
+                for futuro in concluidos:
+                    pagina = em_voo.pop(futuro)
+                    resultado = futuro.result()
+                    resultados[pagina] = resultado
+                    if self.fronteira is not None:
+                        if resultado.erro:
+                            self.fronteira.falhar(fonte.url_pagina(pagina), resultado.erro)
+                        else:
+                            self.fronteira.concluir_listagem(
+                                fonte.nome, fonte.url_pagina(pagina), resultado.noticias, resultado.encerra
+                            )
+                    if resultado.encerra and (pagina_final is None or pagina < pagina_final):
+                        pagina_final = pagina
+
+                if pagina_final is not None:
+                    # Descarta páginas além da última necessária
+                    for futuro, pagina in list(em_voo.items()):
+                        if pagina > pagina_final:
+                            futuro.cancel()
+                            del em_voo[futuro]
+
+        noticias = []
+        for pagina in sorted(resultados):
+            if pagina_final is not None and pagina > pagina_final:
+                break
+            noticias.extend(resultados[pagina].noticias)
+
+        # Só erros em páginas até o fim da coleta mantêm o checkpoint: uma
+        # falha além da data limite ou do fim da listagem não faz falta
+        pendentes = aguardando | {pagina for pagina, resultado in resultados.items() if resultado.erro}
+        if pagina_final is not None:
+            pendentes = {pagina for pagina in pendentes if pagina <= pagina_final}
+        if self.fronteira is not None and not pendentes:
+            self.fronteira.encerrar_listagem(fonte.nome)
+
+        logger.info(f"✅ {fonte.nome}: {len(noticias)} notícias em {min(len(resultados), pagina_final or max_pages)} páginas")
+        return noticias
+
+    def crawl_fontes(self, paginas_por_fonte: Dict[FonteListagem, int]) -> Dict[str, List[dict]]:
+        """
+        Coleta várias fontes em paralelo (hosts distintos não disputam o mesmo limite)
+
+        Returns:
+            {nome da fonte: notícias}
+        """
+        with ThreadPoolExecutor(max_workers=max(len(paginas_por_fonte), 1)) as executor:
+            futuros = {
+                fonte.nome: executor.submit(self.crawl, fonte, max_pages)
+                for fonte, max_pages in paginas_por_fonte.items()
+            }
+            return {nome: futuro.result() for nome, futuro in futuros.items()}
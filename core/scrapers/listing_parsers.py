@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Parsers das páginas de listagem de notícias da Câmara e do Senado
+
+Usam lxml e vão direto aos containers conhecidos de cada listagem; as
+buscas heurísticas do Senado só rodam quando esses seletores falham.
+"""
+
+import re
+from datetime import datetime
+from typing import List, NamedTuple, Optional
+from urllib.parse import urljoin
+
+from core.html_parsing import classe_contem, classe_tem, parse_html, primeiro, texto_de
+
+_DATA_SENADO_RE = re.compile(r'(\d{2}/\d{2}/\d{4})\s*(\d{2}h\d{2}|\d{2}:\d{2})?')
+
+
+class ItemListagem(NamedTuple):
+    """Notícia encontrada em uma página de listagem"""
+    titulo: str
+    link: str
+    data_publicacao: Optional[datetime]
+    data_texto: str
+
+
+def parse_date_camara(date_string: str) -> Optional[datetime]:
+    """Converte data da Câmara (17/07/2025 15:31) para datetime"""
+    try:
+        return datetime.strptime(date_string.strip(), '%d/%m/%Y %H:%M')
+    except ValueError:
+        try:
+            return datetime.strptime(date_string.strip(), '%d/%m/%Y')
+        except ValueError:
+            return None
+
+
+def parse_date_senado(date_string: str) -> Optional[datetime]:
+    """Converte data do Senado (17/07/2025 15h34) para datetime"""
+    try:
+        date_clean = date_string.strip().replace('h', ':')
+        return datetime.strptime(date_clean, '%d/%m/%Y %H:%M')
+    except ValueError:
+        try:
+            return datetime.strptime(date_string.split()[0], '%d/%m/%Y')
+        except (ValueError, IndexError):
+            return None
+
+
+def parse_listagem_camara(html: bytes, url_base: str) -> List[ItemListagem]:
+    """
+    Extrai as notícias de uma página de listagem da Câmara
+
+    Args:
+        html: Conteúdo da página
+        url_base: URL usada para resolver links relativos
+    """
+    raiz = parse_html(html)
+    if raiz is None:
+        return []
+    container = primeiro(raiz, f"//ul[{classe_tem('l-lista-noticias')}]")
+    if container is None:
+        return []
+
+    itens = []
+    for article in container.xpath(f".//article[{classe_contem('chamada')}]"):
+        title_link = primeiro(article, f".//a[{classe_contem('titulo')}]", ".//a")
+        data_element = primeiro(article, f".//span[{classe_contem('data')}]")
+        if title_link is None or data_element is None:
+            continue
+
+        data_texto = texto_de(data_element)
+        itens.append(ItemListagem(
+            titulo=texto_de(title_link),
+            link=urljoin(url_base, title_link.get('href', '')),
+            data_publicacao=parse_date_camara(data_texto),
+            data_texto=data_texto
+        ))
+    return itens
+
+
+def parse_listagem_senado(html: bytes, url_base: str) -> List[ItemListagem]:
+    """
+    Extrai as notícias de uma página de listagem do Senado
+
+    Args:
+        html: Conteúdo da página
+        url_base: URL usada para resolver links relativos
+    """
+    raiz = parse_html(html)
+    if raiz is None:
+        return []
+
+    container = primeiro(
+        raiz,
+        "//div[@class = 'col-xs-12 col-md-9']",
+        "//ul[@class = 'list-unstyled lista-resultados']",
+        f"//div[{classe_contem('lista')}]"
+    )
+    if container is None:
+        container = raiz
+
+    items = container.xpath('.//li')
+    if not items:
+        classes = ' or '.join(classe_contem(p) for p in ['noticia', 'item', 'story', 'article'])
+        items = container.xpath(f".//div[{classes}]")
+    if not items:
+        links_noticias = container.xpath(".//a[contains(@href, '/noticias/')]")
+        items = [link.getparent() for link in links_noticias if link.getparent() is not None]
+
+    itens = []
+    for item in items:
+        title_link = primeiro(item, ".//a[contains(@href, '/noticias/')]", ".//a")
+        if title_link is None:
+            continue
+
+        titulo = texto_de(title_link)
+        if len(titulo) < 10:  # Título muito curto, provavelmente não é uma notícia
+            continue
+
+        data_match = _DATA_SENADO_RE.search(''.join(item.itertext()))
+        if not data_match:
+            continue
+
+        data_texto = data_match.group(0)
+        itens.append(ItemListagem(
+            titulo=titulo,
+            link=urljoin(url_base, title_link.get('href', '')),
+            data_publicacao=parse_date_senado(data_texto),
+            data_texto=data_texto
+        ))
+    return itens
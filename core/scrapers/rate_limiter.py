@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Limitação de taxa e de concorrência por host para os scrapers
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """
+    Token bucket thread-safe
+
+    Libera até `capacidade` requisições em rajada e, em regime, no máximo
+    `taxa` requisições por segundo.
+    """
+
+    def __init__(self, taxa: float, capacidade: float = 1.0):
+        """
+        Args:
+            taxa: Tokens repostos por segundo
+            capacidade: Tamanho máximo da rajada
+        """
+        if taxa <= 0:
+            raise ValueError("taxa deve ser positiva")
+        self.taxa = float(taxa)
+        self.capacidade = max(float(capacidade), 1.0)
+        self._tokens = self.capacidade
+        self._ultimo = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _repor(self, agora: float) -> None:
+        self._tokens = min(self.capacidade, self._tokens + (agora - self._ultimo) * self.taxa)
+        self._ultimo = agora
+
+    def acquire(self) -> float:
+        """
+        Bloqueia até haver um token disponível
+
+        Returns:
+            Tempo de espera em segundos
+        """
+        espera_total = 0.0
+        while True:
+            with self._lock:
+                self._repor(time.monotonic())
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return espera_total
+                espera = (1 - self._tokens) / self.taxa
+            time.sleep(espera)
+            espera_total += espera
+
+
+class HostLimiter:
+    """
+    Aplica, para cada host, um limite de requisições simultâneas e um token bucket
+    """
+
+    def __init__(self, max_concorrencia: int = 4, taxa: Optional[float] = 2.0, rajada: float = 4.0):
+        """
+        Args:
+            max_concorrencia: Requisições simultâneas por host
+            taxa: Requisições por segundo por host (None = sem limite de taxa)
+            rajada: Requisições liberadas de imediato antes de aplicar a taxa
+        """
+        self.max_concorrencia = max(int(max_concorrencia), 1)
+        self.taxa = taxa
+        self.rajada = rajada
+        self._semaforos: Dict[str, threading.BoundedSemaphore] = {}
+        self._buckets: Dict[str, Optional[TokenBucket]] = {}
+        self._lock = threading.Lock()
+
+    def _do_host(self, host: str):
+        with self._lock:
+            if host not in self._semaforos:
+                self._semaforos[host] = threading.BoundedSemaphore(self.max_concorrencia)
+                self._buckets[host] = TokenBucket(self.taxa, self.rajada) if self.taxa else None
+            return self._semaforos[host], self._buckets[host]
+
+    @contextmanager
+    def limitar(self, url: str):
+        """Context manager que envolve uma requisição a `url`"""
+        semaforo, bucket = self._do_host(urlparse(url).netloc)
+        with semaforo:
+            if bucket is not None:
+                bucket.acquire()
+            yield
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Relatório do tempo de importação na inicialização
+
+Reexecuta um script com `python -X importtime` e resume a saída por módulo,
+para acompanhar o custo de inicialização da CLI e dos backends.
+"""
+
+import re
+import subprocess
+import sys
+import time
+from typing import List, NamedTuple, Sequence, Tuple
+
+# "import time: self [us] | cumulative | imported package"
+_LINHA_IMPORTTIME = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)\s*$')
+
+
+class TempoImport(NamedTuple):
+    """Tempo de importação de um módulo, em microssegundos"""
+    modulo: str
+    proprio_us: int
+    acumulado_us: int
+    nivel: int
+
+
+def ler_importtime(saida: str) -> List[TempoImport]:
+    """
+    Interpreta a saída de `-X importtime` (stderr)
+
+    Args:
+        saida: Texto do stderr
+
+    Returns:
+        Um TempoImport por linha reconhecida; nivel 0 = import direto do script
+    """
+    tempos = []
+    for linha in saida.splitlines():
+        match = _LINHA_IMPORTTIME.match(linha)
+        if match:
+            proprio, acumulado, recuo, modulo = match.groups()
+            tempos.append(TempoImport(modulo, int(proprio), int(acumulado), (len(recuo) - 1) // 2))
+    return tempos
+
+
+def relatorio_importtime(tempos: Sequence[TempoImport], limite: int = 25) -> List[str]:
+    """
+    Linhas do relatório: total e os módulos mais caros por tempo acumulado
+
+    Args:
+        tempos: Resultado de ler_importtime
+        limite: Quantidade de módulos listados
+
+    Returns:
+        Linhas de texto prontas para o log
+    """
+    raizes = [t for t in tempos if t.nivel == 0]
+    total_ms = sum(t.acumulado_us for t in raizes) / 1000
+
+    linhas = [f"Importações: {len(tempos)} módulos, {total_ms:.1f} ms no total"]
+    linhas.append(f"{'acumulado (ms)':>15} {'próprio (ms)':>13}  módulo")
+    for t in sorted(tempos, key=lambda t: t.acumulado_us, reverse=True)[:limite]:
+        linhas.append(f"{t.acumulado_us / 1000:>15.1f} {t.proprio_us / 1000:>13.1f}  {'  ' * t.nivel}{t.modulo}")
+    return linhas
+
+
+def perfilar_inicializacao(script: str, argumentos: Sequence[str], limite: int = 25) -> Tuple[int, List[str]]:
+    """
+    Executa o script com `-X importtime` e monta o relatório
+
+    Args:
+        script: Caminho do script
+        argumentos: Argumentos repassados ao script
+        limite: Quantidade de módulos listados
+
+    Returns:
+        (código de saída do script, linhas do relatório)
+    """
+    inicio = time.perf_counter()
+    processo = subprocess.run(
+        [sys.executable, '-X', 'importtime', script, *argumentos],
+        stderr=subprocess.PIPE, text=True
+    )
+    duracao = time.perf_counter() - inicio
+
+    # O stderr restante é do próprio script (logs, tracebacks)
+    outras = [l for l in processo.stderr.splitlines() if not l.startswith('import time:')]
+    if outras:
+        sys.stderr.write('\n'.join(outras) + '\n')
+
+    linhas = relatorio_importtime(ler_importtime(processo.stderr), limite)
+    linhas.append(f"Tempo total do processo: {duracao * 1000:.0f} ms")
+    return processo.returncode, linhas
@@ -6,33 +6,100 @@ Script principal do Sistema de Clipping Legislativo FACIAP
 import sys
 import time
 from datetime import datetime
+from functools import cached_property
 from pathlib import Path
+from typing import Optional
 
 # Adiciona o diretório do projeto ao path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from core.scrapers.camara_scraper import CamaraScraper
-from core.scrapers.senado_scraper import SenadoScraper
-from core.extractors.content_extractor import ContentExtractor
-from core.scoring.news_scorer import news_scorer
-from core.database.db_manager import db_manager
+from core.database.connection import connect
+from core.database.schema import aplicar_migracoes, garantir_schema
+from core.database.bulk_ops import (
+    links_a_extrair,
+    links_existentes,
+    links_sem_texto,
+    save_noticias_bulk,
+    update_textos_bulk,
+)
+from core.metrics import MetricasExecucao, formatar_etapas, medir_etapa, registrar_execucao
 from utils.logger import logger
 
+# Dicionário FACIAP usado pelos backends
+DICIONARIO_PATH = 'config/dicionario_faciap.csv'
+
 class ClippingSystem:
     """
     Sistema principal de clipping legislativo
     """
     
-    def __init__(self):
-        """Inicializa o sistema"""
-        self.camara_scraper = CamaraScraper()
-        self.senado_scraper = SenadoScraper()
-        self.content_extractor = ContentExtractor()
-        self.scorer = news_scorer
-        self.db = db_manager
+    def __init__(self, replay: bool = False, arquivo_path: Optional[str] = None,
+                 replay_ate: Optional[datetime] = None):
+        """
+        Inicializa o sistema
+        
+        Args:
+            replay: Coleta e extração leem o arquivo de HTML bruto em vez da rede
+            arquivo_path: Diretório do arquivo de HTML bruto (padrão do core.html_archive se None)
+            replay_ate: No replay, ignora capturas posteriores a esta data
+        """
+        self.replay = replay
+        self.arquivo_path = arquivo_path
+        self.replay_ate = replay_ate
+        
+        conn = connect()
+        try:
+            garantir_schema(conn)
+        finally:
+            conn.close()
         
         logger.info("Sistema de Clipping FACIAP inicializado")
     
+    # Componentes carregados no primeiro uso: spaCy, bs4/lxml, requests e o
+    # engine do SQLAlchemy só entram no processo dos comandos que precisam deles
+    
+    @cached_property
+    def camara_scraper(self):
+        from core.scrapers.camara_scraper import CamaraScraper
+        return CamaraScraper()
+    
+    @cached_property
+    def senado_scraper(self):
+        from core.scrapers.senado_scraper import SenadoScraper
+        return SenadoScraper()
+    
+    @cached_property
+    def content_extractor(self):
+        from core.extractors.content_extractor import ContentExtractor
+        return ContentExtractor()
+    
+    @cached_property
+    def http_client(self):
+        from core.html_archive import ARQUIVO_PATH_PADRAO, ArquivoHtml
+        from core.http_client import ClienteReplay, HttpClient, get_http_client
+        
+        if self.replay:
+            arquivo = ArquivoHtml(self.arquivo_path or ARQUIVO_PATH_PADRAO)
+            return ClienteReplay(arquivo, self.replay_ate)
+        if self.arquivo_path:
+            return HttpClient(arquivo_path=self.arquivo_path)
+        return get_http_client()
+    
+    @cached_property
+    def scorer(self):
+        from core.scoring.news_scorer import news_scorer
+        return news_scorer
+    
+    @cached_property
+    def fronteira(self):
+        from core.database.frontier import Fronteira
+        return Fronteira()
+    
+    @cached_property
+    def db(self):
+        from core.database.db_manager import db_manager
+        return db_manager
+    
     def test_scrapers(self, max_pages: int = 3):
         """
         Testa os scrapers das duas fontes
@@ -113,13 +180,38 @@ class ClippingSystem:
         results = self.scorer.test_scoring(test_cases)
         return results
     
-    def run_full_collection(self, max_pages_camara: int = 10, max_pages_senado: int = 10):
+    def _links_conhecidos(self, links):
+        """Links já gravados no banco (marca d'água da coleta incremental)"""
+        conn = connect()
+        try:
+            return links_existentes(conn, links)
+        finally:
+            conn.close()
+    
+    def _gravar_textos(self, lote):
+        """Escritor da etapa de extração: grava um lote de (link, texto)"""
+        with medir_etapa('gravacao_textos', itens=len(lote)):
+            conn = connect()
+            try:
+                contagem = update_textos_bulk(conn, lote)
+                return contagem['inseridas'] + contagem['atualizadas']
+            finally:
+                conn.close()
+    
+    def run_full_collection(self, max_pages_camara: int = 10, max_pages_senado: int = 10,
+                            concorrencia: int = 0, incremental: bool = False,
+                            extracao_workers: int = 8, retomar: bool = False):
         """
         Executa coleta completa de notícias
         
         Args:
             max_pages_camara: Páginas da Câmara
             max_pages_senado: Páginas do Senado
+            concorrencia: Páginas simultâneas por host (0 usa os scrapers sequenciais)
+            incremental: Para na primeira página sem notícias novas
+            extracao_workers: Páginas de notícia extraídas simultaneamente
+            retomar: Retoma uma coleta interrompida, pulando as páginas de
+                listagem já concluídas no checkpoint da fronteira
         """
         start_time = time.time()
         execution_log = {
@@ -130,122 +222,321 @@ class ClippingSystem:
             'log_detalhes': {}
         }
         
-        try:
-            logger.info("🚀 INICIANDO COLETA COMPLETA...")
-            
-            # Coleta notícias
-            logger.info("📰 Coletando notícias da Câmara...")
-            camara_news = self.camara_scraper.scrape_news(max_pages_camara)
-            
-            logger.info("📰 Coletando notícias do Senado...")
-            senado_news = self.senado_scraper.scrape_news(max_pages_senado)
-            
-            all_news = camara_news + senado_news
-            execution_log['noticias_coletadas'] = len(all_news)
-            
-            if not all_news:
-                logger.warning("Nenhuma notícia coletada")
-                execution_log['status'] = 'sem_noticias'
-                return execution_log
-            
-            logger.info(f"📊 Total coletado: {len(all_news)} notícias")
-            
-            # Salva notícias no banco
-            logger.info("💾 Salvando notícias no banco de dados...")
-            saved_count = 0
-            
-            for news in all_news:
-                saved_news = self.db.save_noticia(news)
-                if saved_news:
-                    saved_count += 1
-            
-            logger.info(f"💾 Notícias salvas: {saved_count}")
-            
-            # Extrai conteúdo textual
-            logger.info("📝 Extraindo conteúdo textual...")
-            extraction_count = 0
-            
-            for news in all_news:
-                if 'link' in news:
-                    texto = self.content_extractor.extract_text(news['link'])
-                    if texto:
-                        # Busca a notícia no banco para atualizar
-                        db_news = self.db.get_noticia_by_link(news['link'])
-                        if db_news:
-                            self.db.update_noticia_texto(
-                                db_news.id, 
-                                texto, 
-                                len(texto.split())
-                            )
-                            extraction_count += 1
-            
-            logger.info(f"📝 Textos extraídos: {extraction_count}")
-            
-            # Calcula scores
-            logger.info("🎯 Calculando scores...")
-            scoring_count = 0
-            
-            # Busca notícias com texto para calcular scores
-            noticias_db, _ = self.db.get_noticias(limit=1000)  # Pega todas recentes
-            
-            for noticia in noticias_db:
-                if noticia.texto_completo:
-                    score_data = self.scorer.calculate_scores(
-                        noticia.texto_completo,
-                        noticia.titulo
-                    )
-                    score_data['noticia_id'] = noticia.id
+        with MetricasExecucao() as metricas:
+            try:
+                from core.extractors.extraction_pipeline import ExtractionPipeline
+                from core.extractors.text_extractor import extrair_texto
+                from core.scrapers.listing_crawler import ListingCrawler, fonte_camara, fonte_senado
+                
+                logger.info("🚀 INICIANDO COLETA COMPLETA...")
+                
+                # Coleta notícias (o replay usa o crawler, que lê pelo cliente HTTP, sem limite de taxa)
+                with medir_etapa('coleta_listagens') as medicao:
+                    if concorrencia > 0 or incremental or retomar or self.replay:
+                        concorrencia = max(concorrencia, 1)
+                        modo = "incremental" if incremental else "completa"
+                        origem = "do arquivo de HTML" if self.replay else "em paralelo"
+                        logger.info(f"📰 Coleta {modo} de Câmara e Senado {origem} ({concorrencia} páginas/host)...")
+                        crawler = ListingCrawler(
+                            concorrencia=concorrencia,
+                            taxa_por_host=None if self.replay else 2.0,
+                            client=self.http_client,
+                            links_conhecidos=self._links_conhecidos if incremental else None,
+                            fronteira=self.fronteira,
+                            retomar=retomar
+                        )
+                        camara, senado = fonte_camara(), fonte_senado()
+                        coletadas = crawler.crawl_fontes({camara: max_pages_camara, senado: max_pages_senado})
+                        camara_news = coletadas[camara.nome]
+                        senado_news = coletadas[senado.nome]
+                    else:
+                        logger.info("📰 Coletando notícias da Câmara...")
+                        camara_news = self.camara_scraper.scrape_news(max_pages_camara)
+                        
+                        logger.info("📰 Coletando notícias do Senado...")
+                        senado_news = self.senado_scraper.scrape_news(max_pages_senado)
                     
-                    saved_score = self.db.save_score(score_data)
-                    if saved_score:
-                        scoring_count += 1
-            
-            logger.info(f"🎯 Scores calculados: {scoring_count}")
-            
-            # Limpeza de dados antigos
-            logger.info("🧹 Limpando dados antigos...")
-            cleaned_count = self.db.cleanup_old_news()
-            logger.info(f"🧹 Notícias antigas removidas: {cleaned_count}")
-            
-            # Finaliza execução
-            execution_time = time.time() - start_time
-            execution_log.update({
-                'noticias_processadas': scoring_count,
-                'tempo_execucao': execution_time,
-                'status': 'sucesso',
-                'log_detalhes': {
-                    'camara_coletadas': len(camara_news),
-                    'senado_coletadas': len(senado_news),
-                    'salvas_banco': saved_count,
-                    'textos_extraidos': extraction_count,
-                    'scores_calculados': scoring_count,
-                    'limpeza_antigas': cleaned_count
-                }
-            })
-            
-            # Salva log da execução
-            self.db.save_execucao(execution_log)
-            
-            logger.info(f"✅ COLETA COMPLETA FINALIZADA em {execution_time:.1f}s")
-            logger.info(f"📊 Resumo: {len(all_news)} coletadas, {scoring_count} processadas")
-            
-            return execution_log
-            
-        except Exception as e:
-            execution_time = time.time() - start_time
-            execution_log.update({
-                'tempo_execucao': execution_time,
-                'status': 'erro',
-                'log_detalhes': {'erro': str(e)}
-            })
-            
-            self.db.save_execucao(execution_log)
-            logger.error(f"❌ Erro na coleta completa: {e}")
-            raise
+                    all_news = camara_news + senado_news
+                    medicao.itens = len(all_news)
+                execution_log['noticias_coletadas'] = len(all_news)
+                
+                # A extração segue a fronteira: as notícias desta coleta, as de uma
+                # coleta interrompida e as falhas cujo backoff venceu
+                self.fronteira.registrar_noticias(all_news)
+                links_coletados = {news.get('link') for news in all_news}
+                pendentes = self.fronteira.noticias_pendentes()
+                retomadas = [news for news in pendentes if news['link'] not in links_coletados]
+                if retomadas:
+                    logger.info(f"↩️ {len(retomadas)} notícias pendentes de execuções anteriores")
+                    all_news = all_news + retomadas
+                
+                if not all_news:
+                    logger.warning("Nenhuma notícia coletada")
+                    execution_log['status'] = 'sem_noticias'
+                    execution_log['log_detalhes'] = {'metricas': metricas.resumo()}
+                    return execution_log
+                
+                logger.info(f"📊 Total coletado: {len(all_news)} notícias")
+                
+                # Salva notícias no banco
+                logger.info("💾 Salvando notícias no banco de dados...")
+                with medir_etapa('gravacao_noticias', itens=len(all_news)):
+                    conn = connect()
+                    try:
+                        save_stats = save_noticias_bulk(conn, all_news)
+                    finally:
+                        conn.close()
+                saved_count = save_stats['inseridas'] + save_stats['atualizadas']
+                
+                logger.info(
+                    f"💾 Notícias salvas: {save_stats['inseridas']} novas, "
+                    f"{save_stats['atualizadas']} atualizadas, {save_stats['ignoradas']} ignoradas"
+                )
+                
+                # Extrai conteúdo textual: só links sem texto ou com revisita vencida
+                conn = connect()
+                try:
+                    links_extracao = links_a_extrair(conn, (news['link'] for news in pendentes))
+                finally:
+                    conn.close()
+                a_extrair = set(links_extracao)
+                inalterados = [(news['link'], None) for news in pendentes if news['link'] not in a_extrair]
+                if inalterados:
+                    # Texto já gravado e verificado recentemente: sai da fronteira
+                    self.fronteira.registrar_extracoes(inalterados)
+                logger.info(
+                    f"📝 Extraindo conteúdo textual ({len(links_extracao)} links, "
+                    f"{len(inalterados)} com texto já gravado)..."
+                )
+                pipeline = ExtractionPipeline(
+                    lambda link: extrair_texto(link, self.http_client),
+                    self._gravar_textos,
+                    max_workers=extracao_workers,
+                    registrar_resultados=self.fronteira.registrar_extracoes
+                )
+                with medir_etapa('extracao') as medicao:
+                    extraction_stats = pipeline.run(links_extracao)
+                    medicao.itens = extraction_stats['links']
+                extraction_count = extraction_stats['gravados']
+                
+                logger.info(f"📝 Textos extraídos: {extraction_count}")
+                
+                # Calcula scores só das notícias pendentes: texto novo ou alterado
+                # (o trigger da migração 0003 zera score_versao) ou pontuadas com
+                # outra versão do dicionário
+                logger.info("🎯 Calculando scores...")
+                scoring_count = self.rescore_pending()['noticias']
+                
+                logger.info(f"🎯 Scores calculados: {scoring_count}")
+                
+                # Notícias antigas vão para o arquivo frio em Parquet
+                retencao_stats = self.archive_old_news()
+                cleaned_count = retencao_stats['noticias']
+                
+                # Finaliza execução
+                execution_time = time.time() - start_time
+                resumo_metricas = metricas.resumo()
+                execution_log.update({
+                    'noticias_processadas': scoring_count,
+                    'tempo_execucao': execution_time,
+                    'status': 'sucesso',
+                    'log_detalhes': {
+                        'camara_coletadas': len(camara_news),
+                        'senado_coletadas': len(senado_news),
+                        'salvas_banco': saved_count,
+                        'textos_extraidos': extraction_count,
+                        'extracao': extraction_stats,
+                        'scores_calculados': scoring_count,
+                        'limpeza_antigas': cleaned_count,
+                        'retencao': retencao_stats,
+                        'retomadas': len(retomadas),
+                        'textos_inalterados': len(inalterados),
+                        'fronteira': self.fronteira.resumo(),
+                        'metricas': resumo_metricas
+                    }
+                })
+                
+                # Salva log da execução
+                self.db.save_execucao(execution_log)
+                registrar_execucao(resumo_metricas, 'sucesso')
+                
+                logger.info(f"✅ COLETA COMPLETA FINALIZADA em {execution_time:.1f}s")
+                logger.info(f"📊 Resumo: {len(all_news)} coletadas, {scoring_count} processadas")
+                logger.info(f"⏱️  Etapas: {formatar_etapas(resumo_metricas)}")
+                
+                return execution_log
+                
+            except Exception as e:
+                execution_time = time.time() - start_time
+                resumo_metricas = metricas.resumo()
+                execution_log.update({
+                    'tempo_execucao': execution_time,
+                    'status': 'erro',
+                    'log_detalhes': {'erro': str(e), 'metricas': resumo_metricas}
+                })
+                
+                self.db.save_execucao(execution_log)
+                registrar_execucao(resumo_metricas, 'erro')
+                logger.error(f"❌ Erro na coleta completa: {e}")
+                raise
+    
+    def extract_pending(self, limite: int = 500, extracao_workers: int = 8):
+        """
+        Extrai o texto das notícias gravadas que ainda não têm texto
+        
+        Args:
+            limite: Notícias por execução (as mais recentes primeiro)
+            extracao_workers: Páginas de notícia extraídas simultaneamente
+        """
+        from core.extractors.extraction_pipeline import ExtractionPipeline
+        from core.extractors.text_extractor import extrair_texto
+        
+        conn = connect()
+        try:
+            links = links_sem_texto(conn, limite)
+        finally:
+            conn.close()
+        
+        logger.info(f"📝 Extraindo {len(links)} notícias sem texto...")
+        pipeline = ExtractionPipeline(
+            lambda link: extrair_texto(link, self.http_client),
+            self._gravar_textos,
+            max_workers=extracao_workers,
+            registrar_resultados=self.fronteira.registrar_extracoes
+        )
+        with medir_etapa('extracao', itens=len(links)):
+            stats = pipeline.run(links)
+        
+        logger.info(f"📝 Textos extraídos: {stats['gravados']}")
+        return stats
+    
+    def archive_old_news(self, dias: Optional[int] = None, destino: Optional[str] = None):
+        """
+        Move as notícias antigas e seus scores para o arquivo frio em Parquet
+        
+        Args:
+            dias: Dias mantidos no banco (padrão de core.database.retention se None)
+            destino: Diretório do arquivo frio (padrão de core.database.retention se None)
+        """
+        from core.database.retention import (
+            ARQUIVO_FRIO_PATH_PADRAO,
+            DIAS_RETENCAO_PADRAO,
+            arquivar_antigas,
+        )
+        
+        dias = DIAS_RETENCAO_PADRAO if dias is None else dias
+        destino = destino or ARQUIVO_FRIO_PATH_PADRAO
+        logger.info(f"🧊 Arquivando notícias com mais de {dias} dias em {destino}...")
+        with medir_etapa('retencao') as medicao:
+            conn = connect()
+            try:
+                stats = arquivar_antigas(conn, destino, dias)
+            finally:
+                conn.close()
+            medicao.itens = stats['noticias']
+        
+        logger.info(
+            f"🧊 {stats['noticias']} notícias e {stats['scores']} scores arquivados "
+            f"em {stats['lotes']} lotes; {stats['paginas_liberadas']} páginas liberadas"
+        )
+        return stats
+    
+    def export_news(self, formato: str = 'csv', caminho: Optional[str] = None,
+                    incluir_texto: bool = False, **filtros):
+        """
+        Exporta as notícias com scores em fluxo, sem carregar tudo em memória
+        
+        Args:
+            formato: 'csv', 'ndjson' ou 'parquet'
+            caminho: Arquivo de saída (clipping_legislativo_<data>.<formato> se None)
+            incluir_texto: Inclui o texto completo
+            **filtros: data_inicio, data_fim, fonte e score_min (ver core.database.export)
+        """
+        from core.database.export import FORMATOS, exportar
+        
+        if formato not in FORMATOS:
+            raise ValueError(f"formato deve ser um de: {', '.join(FORMATOS)}")
+        if caminho is None:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            caminho = f"clipping_legislativo_{timestamp}.{FORMATOS[formato][1]}"
+        
+        inicio = time.time()
+        conn = connect()
+        try:
+            with open(caminho, 'wb') as destino:
+                escritos = exportar(conn, formato, destino, incluir_texto, **filtros)
+        finally:
+            conn.close()
+        
+        logger.info(f"💾 Exportação salva: {caminho} ({escritos / 1e6:.1f} MB em {time.time() - inicio:.1f}s)")
+        return caminho
+    
+    def rescore_pending(self, dicionario_path: str = DICIONARIO_PATH, tamanho_lote: int = 500):
+        """
+        Pontua só as notícias pendentes: texto novo ou alterado (o trigger da
+        migração 0003 zera score_versao) ou pontuadas com outra versão do dicionário
+        
+        Args:
+            dicionario_path: CSV do dicionário FACIAP
+            tamanho_lote: Notícias por transação
+        """
+        from core.scoring.dictionary_loader import obter_dicionario
+        from core.scoring.score_cache import rescore_pendentes
+        
+        matcher = obter_dicionario(dicionario_path).matcher_pontuacao
+        with medir_etapa('scoring') as medicao:
+            conn = connect()
+            try:
+                noticias = rescore_pendentes(conn, matcher, tamanho_lote)
+            finally:
+                conn.close()
+            medicao.itens = noticias
+        return {'noticias': noticias, 'versao': matcher.versao}
+    
+    def rescore_all(self, dicionario_path: str = DICIONARIO_PATH, tamanho_bloco: int = 5000,
+                    n_process: Optional[int] = None, batch_size: Optional[int] = None):
+        """
+        Repontua todo o acervo com o dicionário (matriz esparsa) e grava em lote
+        
+        Args:
+            dicionario_path: CSV do dicionário FACIAP
+            tamanho_bloco: Notícias tokenizadas por bloco
+            n_process: Processos da lematização (None = CLIPPING_LEMATIZAR_PROCESSOS)
+            batch_size: Textos por lote na lematização (None = CLIPPING_LEMATIZAR_LOTE)
+        """
+        from core.scoring.dictionary_loader import obter_dicionario
+        from core.scoring.sparse_scorer import rescore_todas
+        
+        if n_process is not None or batch_size is not None:
+            from core.scoring.lemmatizer import get_lematizador
+            get_lematizador(n_process, batch_size)
+        
+        matcher = obter_dicionario(dicionario_path).matcher_pontuacao
+        logger.info(f"🎯 Repontuando acervo com {len(matcher)} termos (versão {matcher.versao[:12]})...")
+        
+        with medir_etapa('scoring') as medicao:
+            conn = connect()
+            try:
+                stats = rescore_todas(conn, matcher, tamanho_bloco)
+            finally:
+                conn.close()
+            medicao.itens = stats['noticias']
+        
+        logger.info(
+            f"✅ {stats['noticias']} notícias repontuadas em {stats['tempo']:.1f}s "
+            f"(pontuação {stats['tempo_pontuacao']:.1f}s, gravação {stats['tempo_gravacao']:.1f}s)"
+        )
+        return stats
     
     def get_statistics(self):
-        """Retorna estatísticas do sistema"""
-        stats = self.db.get_stats()
+        """Retorna estatísticas do sistema (lidas das tabelas agregadas)"""
+        from core.database.stats import obter_estatisticas
+        
+        conn = connect()
+        try:
+            stats = obter_estatisticas(conn)
+        finally:
+            conn.close()
         logger.info("📊 ESTATÍSTICAS DO SISTEMA:")
         logger.info(f"Total de notícias: {stats.get('total_noticias', 0)}")
         logger.info(f"Notícias favoritas: {stats.get('noticias_favoritas', 0)}")
@@ -260,15 +551,28 @@ class ClippingSystem:
             for categoria, count in stats['por_categoria'].items():
                 logger.info(f"  {categoria}: {count}")
         
+        if stats.get('por_dia'):
+            logger.info("Notícias por dia (últimos 30 dias):")
+            for dia, count in stats['por_dia'].items():
+                logger.info(f"  {dia}: {count}")
+        
         return stats
     
     def close(self):
         """Fecha recursos do sistema"""
         try:
-            self.camara_scraper.close()
-            self.senado_scraper.close()
-            self.content_extractor.close()
-            self.db.close()
+            # Fecha só os componentes que chegaram a ser carregados
+            for nome in ('camara_scraper', 'senado_scraper', 'content_extractor'):
+                if nome in self.__dict__:
+                    self.__dict__[nome].close()
+            if 'http_client' in self.__dict__:
+                if self.replay or self.arquivo_path:
+                    self.http_client.close()
+                else:
+                    from core.http_client import close_http_client
+                    close_http_client()
+            if 'db' in self.__dict__:
+                self.db.close()
             logger.info("Sistema fechado com sucesso")
         except Exception as e:
             logger.error(f"Erro ao fechar sistema: {e}")
@@ -283,12 +587,79 @@ def main():
     parser.add_argument('--test-scoring', action='store_true', help='Testa sistema de scoring')
     parser.add_argument('--full-collection', action='store_true', help='Executa coleta completa')
     parser.add_argument('--stats', action='store_true', help='Mostra estatísticas')
+    parser.add_argument('--migrate', action='store_true', help='Aplica as migrações do banco e sai')
     parser.add_argument('--pages-camara', type=int, default=10, help='Páginas da Câmara')
     parser.add_argument('--pages-senado', type=int, default=10, help='Páginas do Senado')
+    parser.add_argument('--concurrency', type=int, default=0, help='Páginas simultâneas por host na coleta (0 = sequencial)')
+    parser.add_argument('--incremental', action='store_true', help='Coleta só até a última notícia já gravada')
+    parser.add_argument('--resume', action='store_true', help='Retoma uma coleta interrompida a partir do checkpoint das listagens')
+    parser.add_argument('--extraction-workers', type=int, default=8, help='Extrações de conteúdo simultâneas')
+    parser.add_argument('--replay', action='store_true', help='Executa a coleta completa a partir do arquivo de HTML, sem rede')
+    parser.add_argument('--replay-ate', type=datetime.fromisoformat, help='No replay, usa só capturas até esta data (ISO 8601)')
+    parser.add_argument('--archive-dir', help='Diretório do arquivo de HTML bruto')
+    parser.add_argument('--rescore-all', action='store_true', help='Repontua todas as notícias com o dicionário atual')
+    parser.add_argument('--dicionario', default=DICIONARIO_PATH, help='CSV do dicionário FACIAP')
+    parser.add_argument('--lemmatize-processes', type=int, help='--rescore-all: processos da lematização (padrão: CLIPPING_LEMATIZAR_PROCESSOS ou 1)')
+    parser.add_argument('--lemmatize-batch', type=int, help='--rescore-all: textos por lote na lematização (padrão: CLIPPING_LEMATIZAR_LOTE ou 64)')
+    parser.add_argument('--profile-startup', action='store_true', help='Executa o comando com -X importtime e mostra o custo de importação por módulo')
+    parser.add_argument('--archive-old', action='store_true', help='Move as notícias antigas para o arquivo frio em Parquet')
+    parser.add_argument('--retention-days', type=int, help='Dias mantidos no banco pelo --archive-old (padrão: CLIPPING_DIAS_RETENCAO ou 90)')
+    parser.add_argument('--cold-dir', help='Diretório do arquivo frio em Parquet')
+    parser.add_argument('--export', choices=['csv', 'ndjson', 'parquet'], help='Exporta as notícias com scores no formato indicado')
+    parser.add_argument('--export-output', help='Arquivo de saída do --export')
+    parser.add_argument('--date-from', help='--export: data mínima de publicação (AAAA-MM-DD)')
+    parser.add_argument('--date-to', help='--export: data máxima de publicação, inclusiva (AAAA-MM-DD)')
+    parser.add_argument('--source', help='--export: fonte exata (p.ex. "Senado Federal")')
+    parser.add_argument('--min-score', type=float, help='--export: score total mínimo')
+    parser.add_argument('--include-text', action='store_true', help='--export: inclui o texto completo')
+    parser.add_argument('--extract-pending', action='store_true', help='Extrai o texto das notícias gravadas sem texto')
+    parser.add_argument('--scheduler', action='store_true', help='Roda coleta, extração e scoring periodicamente até ser interrompido')
+    parser.add_argument('--collection-interval', type=float, default=60, help='Minutos entre coletas no --scheduler (0 desativa)')
+    parser.add_argument('--extraction-interval', type=float, default=0, help='Minutos entre extrações no --scheduler (0 desativa)')
+    parser.add_argument('--scoring-interval', type=float, default=0, help='Minutos entre repontuações no --scheduler (0 desativa)')
     
     args = parser.parse_args()
     
-    system = ClippingSystem()
+    if args.profile_startup:
+        from core.startup_profile import perfilar_inicializacao
+        argumentos = [a for a in sys.argv[1:] if a != '--profile-startup']
+        codigo, linhas = perfilar_inicializacao(__file__, argumentos)
+        for linha in linhas:
+            logger.info(linha)
+        sys.exit(codigo)
+    
+    if args.migrate:
+        aplicar_migracoes()
+        logger.info("✅ Banco de dados migrado")
+        return
+    
+    if args.scheduler:
+        from core.scheduler import ServicoColeta
+        servico = ServicoColeta({
+            'coleta': args.collection_interval,
+            'extracao': args.extraction_interval,
+            'scoring': args.scoring_interval,
+        }).iniciar()
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            logger.info("⏹️  Encerrando agendador...")
+        finally:
+            servico.parar()
+        return
+    
+    system = ClippingSystem(replay=args.replay, arquivo_path=args.archive_dir, replay_ate=args.replay_ate)
+    
+    # Execuções que escrevem no banco não se sobrepõem às do agendador nem a outro cron
+    trava = None
+    if args.full_collection or args.replay or args.rescore_all or args.extract_pending or args.archive_old:
+        from core.scheduler import TravaExecucao
+        trava = TravaExecucao()
+        if not trava.adquirir(bloquear=False):
+            logger.warning(f"⏭️  Outra execução está em andamento ({trava.caminho}); nada a fazer")
+            system.close()
+            sys.exit(1)
     
     try:
         if args.test_scrapers:
@@ -300,8 +671,28 @@ def main():
         elif args.test_scoring:
             system.test_scoring()
         
-        elif args.full_collection:
-            system.run_full_collection(args.pages_camara, args.pages_senado)
+        elif args.full_collection or args.replay:
+            system.run_full_collection(
+                args.pages_camara, args.pages_senado, args.concurrency, args.incremental,
+                args.extraction_workers, args.resume
+            )
+        
+        elif args.rescore_all:
+            system.rescore_all(args.dicionario, n_process=args.lemmatize_processes,
+                               batch_size=args.lemmatize_batch)
+        
+        elif args.extract_pending:
+            system.extract_pending(extracao_workers=args.extraction_workers)
+        
+        elif args.archive_old:
+            system.archive_old_news(args.retention_days, args.cold_dir)
+        
+        elif args.export:
+            system.export_news(
+                args.export, args.export_output, args.include_text,
+                data_inicio=args.date_from, data_fim=args.date_to,
+                fonte=args.source, score_min=args.min_score
+            )
         
         elif args.stats:
             system.get_statistics()
@@ -326,6 +717,8 @@ def main():
     
     finally:
         system.close()
+        if trava is not None:
+            trava.liberar()
 
 if __name__ == "__main__":
     main()
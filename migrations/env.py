@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+Ambiente do Alembic para o banco SQLite do clipping
+"""
+
+import os
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+config = context.config
+
+# Caminho do banco: argumento programático > CLIPPING_DB_PATH > alembic.ini
+db_path = config.attributes.get('db_path') or os.getenv('CLIPPING_DB_PATH')
+url = f"sqlite:///{db_path}" if db_path else config.get_main_option("sqlalchemy.url")
+
+
+def run_migrations_offline() -> None:
+    """Gera o SQL das migrações sem conectar ao banco"""
+    context.configure(
+        url=url,
+        target_metadata=None,
+        literal_binds=True,
+        render_as_batch=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Aplica as migrações no banco"""
+    engine = create_engine(url, poolclass=pool.NullPool)
+    with engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=None,
+            render_as_batch=True,
+            transaction_per_migration=True,
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
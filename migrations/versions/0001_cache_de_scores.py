@@ -0,0 +1,63 @@
+"""Cache de scores por versão do dicionário
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-09-01 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _colunas(tabela: str) -> set:
+    return {row[1] for row in op.get_bind().exec_driver_sql(f"PRAGMA table_info({tabela})")}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if 'dicionario_hash' not in _colunas('scores_faciap'):
+        op.add_column('scores_faciap', sa.Column('dicionario_hash', sa.Text()))
+
+    # Um score por notícia e versão do dicionário
+    op.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS ux_scores_faciap_noticia_dicionario
+        ON scores_faciap (noticia_id, dicionario_hash)
+    """)
+
+    # Texto ou título alterado invalida os scores em cache da notícia
+    op.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_noticias_invalida_score
+        AFTER UPDATE OF titulo, texto_completo ON noticias
+        WHEN OLD.titulo IS NOT NEW.titulo OR OLD.texto_completo IS NOT NEW.texto_completo
+        BEGIN
+            DELETE FROM scores_faciap
+            WHERE noticia_id = NEW.id AND dicionario_hash IS NOT NULL;
+        END
+    """)
+
+    op.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_noticias_remove_score
+        AFTER DELETE ON noticias
+        BEGIN
+            DELETE FROM scores_faciap WHERE noticia_id = OLD.id;
+        END
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS trg_noticias_remove_score")
+    op.execute("DROP TRIGGER IF EXISTS trg_noticias_invalida_score")
+    op.execute("DROP INDEX IF EXISTS ux_scores_faciap_noticia_dicionario")
+    # DROP COLUMN nativo: o modo batch recriaria a tabela sem os demais índices
+    if 'dicionario_hash' in _colunas('scores_faciap'):
+        op.execute("ALTER TABLE scores_faciap DROP COLUMN dicionario_hash")
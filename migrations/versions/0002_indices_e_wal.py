@@ -0,0 +1,56 @@
+"""Índices de consulta e modo WAL
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-09-01 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# scores_faciap.noticia_id já é o prefixo de ux_scores_faciap_noticia_dicionario (0001)
+INDICES = {
+    # ORDER BY data_publicacao DESC LIMIT n
+    'ix_noticias_data_publicacao': "noticias (data_publicacao, id)",
+    # Filtro por fonte ordenado por data
+    'ix_noticias_fonte_data': "noticias (fonte, data_publicacao, id)",
+    # Ordenações por score
+    'ix_noticias_score_interesse': "noticias (score_interesse, id)",
+    'ix_noticias_score_risco': "noticias (score_risco, id)",
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for nome, definicao in INDICES.items():
+        op.execute(f"CREATE INDEX IF NOT EXISTS {nome} ON {definicao}")
+
+    # Favoritas são poucas: índice parcial
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_noticias_favoritas_data
+        ON noticias (data_publicacao, id) WHERE favorita = 1
+    """)
+
+    op.execute("ANALYZE")
+
+    # journal_mode é persistente no arquivo, mas não pode mudar dentro de transação
+    with op.get_context().autocommit_block():
+        op.execute("PRAGMA journal_mode=WAL")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute("PRAGMA journal_mode=DELETE")
+
+    op.execute("DROP INDEX IF EXISTS ix_noticias_favoritas_data")
+    for nome in INDICES:
+        op.execute(f"DROP INDEX IF EXISTS {nome}")
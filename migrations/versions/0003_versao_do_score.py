@@ -0,0 +1,68 @@
+"""Versão do score em noticias e índice de score total
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-09-01 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _colunas(tabela: str) -> set:
+    return {row[1] for row in op.get_bind().exec_driver_sql(f"PRAGMA table_info({tabela})")}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Versão do dicionário dos scores espelhados em noticias; NULL = pendente
+    if 'score_versao' not in _colunas('noticias'):
+        op.add_column('noticias', sa.Column('score_versao', sa.Text()))
+
+    op.execute("CREATE INDEX IF NOT EXISTS ix_noticias_score_versao ON noticias (score_versao)")
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_noticias_score_total
+        ON noticias ((score_interesse + score_risco), id)
+    """)
+
+    # Invalidação também marca a notícia como pendente de score
+    op.execute("DROP TRIGGER IF EXISTS trg_noticias_invalida_score")
+    op.execute("""
+        CREATE TRIGGER trg_noticias_invalida_score
+        AFTER UPDATE OF titulo, texto_completo ON noticias
+        WHEN OLD.titulo IS NOT NEW.titulo OR OLD.texto_completo IS NOT NEW.texto_completo
+        BEGIN
+            DELETE FROM scores_faciap
+            WHERE noticia_id = NEW.id AND dicionario_hash IS NOT NULL;
+            UPDATE noticias SET score_versao = NULL WHERE id = NEW.id;
+        END
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS trg_noticias_invalida_score")
+    op.execute("""
+        CREATE TRIGGER trg_noticias_invalida_score
+        AFTER UPDATE OF titulo, texto_completo ON noticias
+        WHEN OLD.titulo IS NOT NEW.titulo OR OLD.texto_completo IS NOT NEW.texto_completo
+        BEGIN
+            DELETE FROM scores_faciap
+            WHERE noticia_id = NEW.id AND dicionario_hash IS NOT NULL;
+        END
+    """)
+    op.execute("DROP INDEX IF EXISTS ix_noticias_score_total")
+    op.execute("DROP INDEX IF EXISTS ix_noticias_score_versao")
+    # DROP COLUMN nativo, como na 0007/0010: o modo batch recriaria noticias
+    # sem os triggers e índices das outras migrações
+    if 'score_versao' in _colunas('noticias'):
+        op.execute("ALTER TABLE noticias DROP COLUMN score_versao")
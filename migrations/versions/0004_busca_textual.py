@@ -0,0 +1,70 @@
+"""Índice FTS5 sobre título e texto das notícias
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-09-01 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Tabela de conteúdo externo: o texto continua só em noticias
+    op.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS noticias_fts USING fts5(
+            titulo,
+            texto_completo,
+            content='noticias',
+            content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+    """)
+
+    op.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_noticias_fts_insert
+        AFTER INSERT ON noticias
+        BEGIN
+            INSERT INTO noticias_fts (rowid, titulo, texto_completo)
+            VALUES (NEW.id, NEW.titulo, NEW.texto_completo);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_noticias_fts_delete
+        AFTER DELETE ON noticias
+        BEGIN
+            INSERT INTO noticias_fts (noticias_fts, rowid, titulo, texto_completo)
+            VALUES ('delete', OLD.id, OLD.titulo, OLD.texto_completo);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_noticias_fts_update
+        AFTER UPDATE OF titulo, texto_completo ON noticias
+        WHEN OLD.titulo IS NOT NEW.titulo OR OLD.texto_completo IS NOT NEW.texto_completo
+        BEGIN
+            INSERT INTO noticias_fts (noticias_fts, rowid, titulo, texto_completo)
+            VALUES ('delete', OLD.id, OLD.titulo, OLD.texto_completo);
+            INSERT INTO noticias_fts (rowid, titulo, texto_completo)
+            VALUES (NEW.id, NEW.titulo, NEW.texto_completo);
+        END
+    """)
+
+    # (Re)indexa o conteúdo existente
+    op.execute("INSERT INTO noticias_fts (noticias_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS trg_noticias_fts_update")
+    op.execute("DROP TRIGGER IF EXISTS trg_noticias_fts_delete")
+    op.execute("DROP TRIGGER IF EXISTS trg_noticias_fts_insert")
+    op.execute("DROP TABLE IF EXISTS noticias_fts")
@@ -0,0 +1,36 @@
+"""Cache de textos lematizados
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2025-09-01 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Lema por hash do texto limpo e modelo spaCy; independe da notícia
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS lemas_cache (
+            texto_hash TEXT NOT NULL,
+            modelo TEXT NOT NULL,
+            lema TEXT NOT NULL,
+            criado_em TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (texto_hash, modelo)
+        ) WITHOUT ROWID
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TABLE IF EXISTS lemas_cache")
@@ -0,0 +1,34 @@
+"""Vacuum incremental
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2025-09-01 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A retenção devolve as páginas liberadas aos poucos com
+    # PRAGMA incremental_vacuum; mudar auto_vacuum em um banco existente
+    # só vale após um VACUUM completo, feito uma única vez aqui
+    with op.get_context().autocommit_block():
+        op.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        op.execute("VACUUM")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute("PRAGMA auto_vacuum=NONE")
+        op.execute("VACUUM")
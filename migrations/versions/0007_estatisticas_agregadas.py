@@ -0,0 +1,183 @@
+"""Estatísticas agregadas mantidas por triggers
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2025-09-01 00:00:00
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, Sequence[str], None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABELAS = {
+    'estatisticas_fonte': """
+        fonte TEXT PRIMARY KEY,
+        total INTEGER NOT NULL DEFAULT 0,
+        favoritas INTEGER NOT NULL DEFAULT 0,
+        soma_interesse REAL NOT NULL DEFAULT 0,
+        soma_risco REAL NOT NULL DEFAULT 0
+    """,
+    'estatisticas_dia': """
+        dia TEXT NOT NULL,
+        fonte TEXT NOT NULL,
+        total INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (dia, fonte)
+    """,
+    'estatisticas_categoria': """
+        categoria TEXT PRIMARY KEY,
+        total INTEGER NOT NULL DEFAULT 0
+    """,
+    # Faixas de 10 pontos do score total (interesse + risco); 100 = 100 ou mais
+    'estatisticas_score': """
+        faixa INTEGER PRIMARY KEY,
+        total INTEGER NOT NULL DEFAULT 0
+    """,
+}
+
+TRIGGERS = ('trg_noticias_stats_insert', 'trg_noticias_stats_delete', 'trg_noticias_stats_update')
+
+
+def _colunas(tabela: str) -> set:
+    return {row[1] for row in op.get_bind().exec_driver_sql(f"PRAGMA table_info({tabela})")}
+
+
+def _favorita(linha: str) -> str:
+    return f"(COALESCE({linha}.favorita, 0) != 0)"
+
+
+def _dia(linha: str) -> str:
+    return f"COALESCE(substr({linha}.data_publicacao, 1, 10), '')"
+
+
+def _faixa(linha: str) -> str:
+    total = f"(COALESCE({linha}.score_interesse, 0) + COALESCE({linha}.score_risco, 0))"
+    return f"MIN(MAX(CAST({total} / 10 AS INTEGER), 0), 10) * 10"
+
+
+def _categorias(linha: str) -> str:
+    return f"json_each(CASE WHEN json_valid({linha}.categorias) THEN {linha}.categorias ELSE '[]' END)"
+
+
+def _somar(linha: str, sinal: int) -> str:
+    """Corpo de trigger que soma (1) ou subtrai (-1) a linha NEW/OLD dos agregados"""
+    return f"""
+        INSERT INTO estatisticas_fonte (fonte, total, favoritas, soma_interesse, soma_risco)
+        VALUES ({linha}.fonte, {sinal}, {sinal} * {_favorita(linha)},
+                {sinal} * COALESCE({linha}.score_interesse, 0), {sinal} * COALESCE({linha}.score_risco, 0))
+        ON CONFLICT (fonte) DO UPDATE SET
+            total = total + excluded.total,
+            favoritas = favoritas + excluded.favoritas,
+            soma_interesse = soma_interesse + excluded.soma_interesse,
+            soma_risco = soma_risco + excluded.soma_risco;
+        INSERT INTO estatisticas_dia (dia, fonte, total)
+        VALUES ({_dia(linha)}, {linha}.fonte, {sinal})
+        ON CONFLICT (dia, fonte) DO UPDATE SET total = total + excluded.total;
+        INSERT INTO estatisticas_categoria (categoria, total)
+        SELECT DISTINCT value, {sinal} FROM {_categorias(linha)} WHERE value IS NOT NULL
+        ON CONFLICT (categoria) DO UPDATE SET total = total + excluded.total;
+        INSERT INTO estatisticas_score (faixa, total)
+        VALUES ({_faixa(linha)}, {sinal})
+        ON CONFLICT (faixa) DO UPDATE SET total = total + excluded.total;
+    """
+
+
+# Remove as linhas zeradas pela subtração de OLD
+_LIMPAR = f"""
+        DELETE FROM estatisticas_fonte WHERE fonte = OLD.fonte AND total = 0;
+        DELETE FROM estatisticas_dia WHERE dia = {_dia('OLD')} AND fonte = OLD.fonte AND total = 0;
+        DELETE FROM estatisticas_categoria WHERE total = 0;
+        DELETE FROM estatisticas_score WHERE faixa = {_faixa('OLD')} AND total = 0;
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Categorias da versão espelhada em noticias (junto com os scores)
+    if 'categorias' not in _colunas('noticias'):
+        op.add_column('noticias', sa.Column('categorias', sa.Text()))
+    op.execute("""
+        UPDATE noticias SET categorias = (
+            SELECT s.categorias FROM scores_faciap s
+            WHERE s.noticia_id = noticias.id AND s.dicionario_hash = noticias.score_versao
+        )
+        WHERE score_versao IS NOT NULL
+    """)
+
+    for nome, colunas in TABELAS.items():
+        op.execute(f"DROP TABLE IF EXISTS {nome}")
+        op.execute(f"CREATE TABLE {nome} ({colunas}) WITHOUT ROWID")
+
+    # Estado inicial a partir das notícias já gravadas
+    op.execute(f"""
+        INSERT INTO estatisticas_fonte (fonte, total, favoritas, soma_interesse, soma_risco)
+        SELECT fonte, count(*), sum({_favorita('noticias')}),
+               sum(COALESCE(score_interesse, 0)), sum(COALESCE(score_risco, 0))
+        FROM noticias GROUP BY fonte
+    """)
+    op.execute(f"""
+        INSERT INTO estatisticas_dia (dia, fonte, total)
+        SELECT {_dia('noticias')}, fonte, count(*) FROM noticias GROUP BY 1, 2
+    """)
+    op.execute(f"""
+        INSERT INTO estatisticas_categoria (categoria, total)
+        SELECT c.value, count(DISTINCT noticias.id)
+        FROM noticias, {_categorias('noticias')} AS c
+        WHERE c.value IS NOT NULL
+        GROUP BY c.value
+    """)
+    op.execute(f"""
+        INSERT INTO estatisticas_score (faixa, total)
+        SELECT {_faixa('noticias')}, count(*) FROM noticias GROUP BY 1
+    """)
+
+    for nome in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {nome}")
+    op.execute(f"""
+        CREATE TRIGGER trg_noticias_stats_insert AFTER INSERT ON noticias
+        BEGIN
+            {_somar('NEW', 1)}
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER trg_noticias_stats_delete AFTER DELETE ON noticias
+        BEGIN
+            {_somar('OLD', -1)}
+            {_LIMPAR}
+        END
+    """)
+    # O upsert da coleta reescreve titulo/fonte/data: só conta se algo mudou
+    op.execute(f"""
+        CREATE TRIGGER trg_noticias_stats_update
+        AFTER UPDATE OF fonte, data_publicacao, favorita, score_interesse, score_risco, categorias
+        ON noticias
+        WHEN OLD.fonte IS NOT NEW.fonte
+            OR OLD.data_publicacao IS NOT NEW.data_publicacao
+            OR OLD.favorita IS NOT NEW.favorita
+            OR OLD.score_interesse IS NOT NEW.score_interesse
+            OR OLD.score_risco IS NOT NEW.score_risco
+            OR OLD.categorias IS NOT NEW.categorias
+        BEGIN
+            {_somar('OLD', -1)}
+            {_somar('NEW', 1)}
+            {_LIMPAR}
+        END
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for nome in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {nome}")
+    for nome in TABELAS:
+        op.execute(f"DROP TABLE IF EXISTS {nome}")
+    # DROP COLUMN nativo, como na 0010: o modo batch perderia os triggers de noticias
+    if 'categorias' in _colunas('noticias'):
+        op.execute("ALTER TABLE noticias DROP COLUMN categorias")
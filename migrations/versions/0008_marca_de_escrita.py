@@ -0,0 +1,69 @@
+"""Marca de escrita: contador incrementado a cada alteração em noticias
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2025-09-01 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, Sequence[str], None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGGERS = ('trg_noticias_marca_insert', 'trg_noticias_marca_delete', 'trg_noticias_marca_update')
+
+# Colunas que aparecem nas respostas da API
+COLUNAS_VISIVEIS = (
+    'titulo', 'fonte', 'link', 'data_publicacao', 'texto_completo', 'favorita',
+    'score_interesse', 'score_risco', 'categorias', 'score_versao',
+)
+
+_INCREMENTAR = "UPDATE marca_escrita SET versao = versao + 1 WHERE id = 1;"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS marca_escrita (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            versao INTEGER NOT NULL
+        )
+    """)
+    op.execute("INSERT OR IGNORE INTO marca_escrita (id, versao) VALUES (1, 1)")
+
+    for nome in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {nome}")
+    op.execute(f"""
+        CREATE TRIGGER trg_noticias_marca_insert AFTER INSERT ON noticias
+        BEGIN
+            {_INCREMENTAR}
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER trg_noticias_marca_delete AFTER DELETE ON noticias
+        BEGIN
+            {_INCREMENTAR}
+        END
+    """)
+    # O upsert da coleta regrava as mesmas colunas: só conta se algo mudou
+    mudou = ' OR '.join(f"OLD.{coluna} IS NOT NEW.{coluna}" for coluna in COLUNAS_VISIVEIS)
+    op.execute(f"""
+        CREATE TRIGGER trg_noticias_marca_update AFTER UPDATE ON noticias
+        WHEN {mudou}
+        BEGIN
+            {_INCREMENTAR}
+        END
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for nome in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {nome}")
+    op.execute("DROP TABLE IF EXISTS marca_escrita")
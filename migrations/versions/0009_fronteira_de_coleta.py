@@ -0,0 +1,52 @@
+"""Fronteira persistente da coleta: páginas de listagem e notícias pendentes
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2025-09-01 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, Sequence[str], None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # tipo: 'listagem' (página de uma fonte) ou 'noticia' (link a extrair)
+    # status: pendente, concluida, falha ou abandonada
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS fronteira (
+            url TEXT PRIMARY KEY,
+            tipo TEXT NOT NULL,
+            fonte TEXT NOT NULL,
+            pagina INTEGER,
+            status TEXT NOT NULL DEFAULT 'pendente',
+            tentativas INTEGER NOT NULL DEFAULT 0,
+            proxima_tentativa TEXT,
+            ultimo_erro TEXT,
+            dados TEXT,
+            atualizado_em TEXT NOT NULL
+        )
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_fronteira_tipo_status
+        ON fronteira (tipo, status, proxima_tentativa)
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_fronteira_listagem
+        ON fronteira (fonte, pagina) WHERE tipo = 'listagem'
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS idx_fronteira_listagem")
+    op.execute("DROP INDEX IF EXISTS idx_fronteira_tipo_status")
+    op.execute("DROP TABLE IF EXISTS fronteira")
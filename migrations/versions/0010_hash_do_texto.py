@@ -0,0 +1,64 @@
+"""Hash do texto extraído e data da última verificação
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2025-09-01 00:00:00
+
+"""
+import hashlib
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, Sequence[str], None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TAMANHO_LOTE = 1000
+
+
+def _colunas(tabela: str) -> set:
+    return {row[1] for row in op.get_bind().exec_driver_sql(f"PRAGMA table_info({tabela})")}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    colunas = _colunas('noticias')
+    if 'texto_hash' not in colunas:
+        op.add_column('noticias', sa.Column('texto_hash', sa.Text()))
+    if 'texto_verificado_em' not in colunas:
+        op.add_column('noticias', sa.Column('texto_verificado_em', sa.Text()))
+
+    # Mesmo hash de core.database.bulk_ops.hash_texto; a verificação das
+    # notícias existentes conta a partir da coleta
+    conexao = op.get_bind()
+    ultimo_id = 0
+    while True:
+        linhas = conexao.exec_driver_sql(
+            "SELECT id, texto_completo FROM noticias "
+            "WHERE id > ? AND texto_completo IS NOT NULL AND texto_completo != '' AND texto_hash IS NULL "
+            "ORDER BY id LIMIT ?",
+            (ultimo_id, TAMANHO_LOTE)
+        ).fetchall()
+        if not linhas:
+            break
+        ultimo_id = linhas[-1][0]
+        conexao.exec_driver_sql(
+            "UPDATE noticias SET texto_hash = ?, texto_verificado_em = COALESCE(texto_verificado_em, data_coleta) "
+            "WHERE id = ?",
+            [(hashlib.sha256(texto.encode('utf-8')).hexdigest(), noticia_id) for noticia_id, texto in linhas]
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # DROP COLUMN nativo (SQLite 3.35+): o modo batch recriaria a tabela sem
+    # os triggers e o índice de expressão de noticias
+    colunas = _colunas('noticias')
+    for coluna in ('texto_verificado_em', 'texto_hash'):
+        if coluna in colunas:
+            op.execute(f"ALTER TABLE noticias DROP COLUMN {coluna}")
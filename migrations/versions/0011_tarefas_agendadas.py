@@ -0,0 +1,46 @@
+"""Tarefas do agendador: fila e status compartilhados entre processos
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2025-09-01 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, Sequence[str], None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # status: na_fila, executando, sucesso ou erro
+    # parametros e resultado em JSON
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS tarefas (
+            id TEXT PRIMARY KEY,
+            tipo TEXT NOT NULL,
+            parametros TEXT NOT NULL DEFAULT '{}',
+            origem TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'na_fila',
+            criada_em TEXT NOT NULL,
+            iniciada_em TEXT,
+            finalizada_em TEXT,
+            resultado TEXT,
+            erro TEXT
+        )
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS idx_tarefas_criada_em ON tarefas (criada_em)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_tarefas_tipo_status ON tarefas (tipo, status)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS idx_tarefas_tipo_status")
+    op.execute("DROP INDEX IF EXISTS idx_tarefas_criada_em")
+    op.execute("DROP TABLE IF EXISTS tarefas")
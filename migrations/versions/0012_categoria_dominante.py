@@ -0,0 +1,65 @@
+"""Categoria dominante do score, em scores_faciap e espelhada em noticias
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2025-09-01 00:00:00
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0012'
+down_revision: Union[str, Sequence[str], None] = '0011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_INCREMENTAR = "UPDATE marca_escrita SET versao = versao + 1 WHERE id = 1;"
+
+# Colunas que aparecem nas respostas da API (as da 0008 mais a nova)
+COLUNAS_VISIVEIS = (
+    'titulo', 'fonte', 'link', 'data_publicacao', 'texto_completo', 'favorita',
+    'score_interesse', 'score_risco', 'categorias', 'score_versao',
+)
+
+
+def _colunas(tabela: str) -> set:
+    return {row[1] for row in op.get_bind().exec_driver_sql(f"PRAGMA table_info({tabela})")}
+
+
+def _trigger_marca(colunas: Sequence[str]) -> None:
+    mudou = ' OR '.join(f"OLD.{coluna} IS NOT NEW.{coluna}" for coluna in colunas)
+    op.execute("DROP TRIGGER IF EXISTS trg_noticias_marca_update")
+    op.execute(f"""
+        CREATE TRIGGER trg_noticias_marca_update AFTER UPDATE ON noticias
+        WHEN {mudou}
+        BEGIN
+            {_INCREMENTAR}
+        END
+    """)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for tabela in ('scores_faciap', 'noticias'):
+        if 'categoria_dominante' not in _colunas(tabela):
+            op.add_column(tabela, sa.Column('categoria_dominante', sa.Text()))
+    # Todas as notícias voltam a pendentes: a repontuação normal (coleta ou
+    # agendador) preenche categoria_dominante. Sem o trigger da marca, que
+    # dispararia uma vez por linha; a marca sobe uma vez só.
+    op.execute("DROP TRIGGER IF EXISTS trg_noticias_marca_update")
+    op.execute("UPDATE noticias SET score_versao = NULL WHERE score_versao IS NOT NULL")
+    op.execute(_INCREMENTAR)
+    _trigger_marca(COLUNAS_VISIVEIS + ('categoria_dominante',))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _trigger_marca(COLUNAS_VISIVEIS)
+    # DROP COLUMN nativo, como na 0007/0010: o modo batch perderia os triggers
+    for tabela in ('noticias', 'scores_faciap'):
+        if 'categoria_dominante' in _colunas(tabela):
+            op.execute(f"ALTER TABLE {tabela} DROP COLUMN categoria_dominante")
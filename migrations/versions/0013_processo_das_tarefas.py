@@ -0,0 +1,36 @@
+"""Processo dono de cada tarefa, para recuperar tarefas órfãs
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2025-09-01 00:00:00
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0013'
+down_revision: Union[str, Sequence[str], None] = '0012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _colunas(tabela: str) -> set:
+    return {row[1] for row in op.get_bind().exec_driver_sql(f"PRAGMA table_info({tabela})")}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # pid do processo cuja fila em memória guarda a tarefa; tarefas antigas
+    # ficam com NULL e, se pendentes, são tratadas como órfãs
+    if 'processo' not in _colunas('tarefas'):
+        op.add_column('tarefas', sa.Column('processo', sa.Integer()))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if 'processo' in _colunas('tarefas'):
+        op.execute("ALTER TABLE tarefas DROP COLUMN processo")
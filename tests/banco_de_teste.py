@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+Banco de teste: tabelas originais do db_manager mais todas as migrações
+"""
+
+from core.database.connection import connect
+from core.database.schema import aplicar_migracoes
+
+# Tabelas criadas pelo db_manager; o restante do schema vem das migrações
+SCHEMA_BASE = """
+    CREATE TABLE IF NOT EXISTS noticias (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        titulo TEXT NOT NULL,
+        fonte TEXT NOT NULL,
+        link TEXT UNIQUE NOT NULL,
+        data_publicacao TEXT,
+        texto_completo TEXT,
+        score_interesse REAL DEFAULT 0,
+        score_risco REAL DEFAULT 0,
+        favorita BOOLEAN DEFAULT 0,
+        data_coleta TEXT DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE IF NOT EXISTS scores_faciap (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        noticia_id INTEGER,
+        score_interesse REAL,
+        score_risco REAL,
+        categorias TEXT,
+        data_calculo TEXT DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (noticia_id) REFERENCES noticias (id)
+    );
+"""
+
+
+def preparar_banco(caminho: str, revisao: str = 'head') -> None:
+    """Cria o schema base e aplica as migrações até `revisao`"""
+    conn = connect(caminho)
+    try:
+        conn.executescript(SCHEMA_BASE)
+    finally:
+        conn.close()
+    aplicar_migracoes(caminho, revisao)
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Fixtures compartilhadas: banco migrado em diretório temporário e servidor
+HTTP local que responde páginas pré-definidas
+"""
+
+import sqlite3
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+RAIZ = Path(__file__).resolve().parent.parent
+if str(RAIZ) not in sys.path:
+    sys.path.insert(0, str(RAIZ))
+
+from banco_de_teste import preparar_banco  # noqa: E402
+
+
+@pytest.fixture
+def banco(tmp_path) -> str:
+    """Caminho de um banco com o schema base e todas as migrações"""
+    caminho = str(tmp_path / "clipping_teste.db")
+    preparar_banco(caminho)
+    return caminho
+
+
+@pytest.fixture
+def conn(banco):
+    conexao = sqlite3.connect(banco)
+    yield conexao
+    conexao.close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        servidor = self.server
+        with servidor.lock:
+            servidor.requisicoes.append(self.path)
+        status, corpo, *extras = servidor.paginas.get(self.path, (404, b''))
+        self.send_response(status)
+        for nome, valor in (extras[0] if extras else {}).items():
+            self.send_header(nome, valor)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+
+class ServidorStub:
+    """
+    Servidor HTTP em thread; `paginas` mapeia caminho -> (status, corpo) ou
+    (status, corpo, headers)
+    """
+
+    def __init__(self):
+        self._servidor = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self._servidor.paginas = {}
+        self._servidor.requisicoes = []
+        self._servidor.lock = threading.Lock()
+        self._thread = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self) -> str:
+        host, porta = self._servidor.server_address[:2]
+        return f"http://{host}:{porta}"
+
+    @property
+    def paginas(self) -> dict:
+        return self._servidor.paginas
+
+    @property
+    def requisicoes(self) -> list:
+        with self._servidor.lock:
+            return list(self._servidor.requisicoes)
+
+    def limpar_requisicoes(self):
+        with self._servidor.lock:
+            self._servidor.requisicoes.clear()
+
+    def fechar(self):
+        self._servidor.shutdown()
+        self._servidor.server_close()
+        self._thread.join()
+
+
+@pytest.fixture
+def servidor_http():
+    servidor = ServidorStub()
+    yield servidor
+    servidor.fechar()
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Respostas condicionais (ETag/304) da API do backend_real
+"""
+
+import importlib
+import os
+import sqlite3
+import sys
+
+import pytest
+
+from banco_de_teste import preparar_banco
+
+
+@pytest.fixture(scope='module')
+def cliente(tmp_path_factory):
+    # O backend usa o banco clipping_faciap.db do diretório atual
+    diretorio = tmp_path_factory.mktemp('backend')
+    preparar_banco(str(diretorio / 'clipping_faciap.db'))
+    with sqlite3.connect(diretorio / 'clipping_faciap.db') as conn:
+        conn.execute(
+            "INSERT INTO noticias (titulo, fonte, link, data_publicacao) "
+            "VALUES ('Notícia', 'Senado Federal', 'https://exemplo.gov.br/1', '2025-07-15')"
+        )
+
+    anterior = os.getcwd()
+    os.chdir(diretorio)
+    try:
+        sys.modules.pop('backend_real', None)
+        backend = importlib.import_module('backend_real')
+        backend.app.config['TESTING'] = True
+        yield backend.app.test_client()
+    finally:
+        os.chdir(anterior)
+
+
+def test_etag_e_304_sem_mudancas(cliente):
+    resposta = cliente.get('/api/stats')
+    assert resposta.status_code == 200
+    etag = resposta.headers['ETag']
+    assert resposta.headers['Cache-Control'] == 'no-cache'
+
+    revalidada = cliente.get('/api/stats', headers={'If-None-Match': etag})
+    assert revalidada.status_code == 304
+    assert revalidada.data == b''
+
+    # Outros parâmetros são outra representação
+    assert cliente.get('/api/stats?dias=7', headers={'If-None-Match': etag}).status_code == 200
+
+
+def test_escrita_no_banco_troca_o_etag(cliente):
+    etag = cliente.get('/api/stats').headers['ETag']
+
+    assert cliente.post('/api/noticias/1/favoritar').status_code == 200
+
+    resposta = cliente.get('/api/stats', headers={'If-None-Match': etag})
+    assert resposta.status_code == 200
+    assert resposta.headers['ETag'] != etag
+    assert resposta.get_json()['noticias_favoritas'] == 1
+
+
+def test_noticias_servem_os_scores_gravados_sem_repontuar(cliente):
+    dados = cliente.get('/api/noticias').get_json()
+
+    assert dados['total'] == 1
+    assert dados['scores_desatualizados'] is True
+    with sqlite3.connect('clipping_faciap.db') as conn:
+        assert conn.execute("SELECT score_versao FROM noticias").fetchone()[0] is None
+    # O matcher lematizado (que carrega o spaCy) não foi compilado
+    backend = sys.modules['backend_real']
+    assert backend.obter_dicionario(backend.DICIONARIO_PATH)._matcher_pontuacao is None
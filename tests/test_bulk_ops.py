@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Contagens das gravações em lote de bulk_ops e formato das datas gravadas
+"""
+
+import re
+from datetime import datetime, timedelta
+
+from core.database.bulk_ops import (hash_texto, links_a_extrair, save_noticias_bulk, save_scores_bulk,
+                                    update_textos_bulk)
+
+FORMATO_DATA = re.compile(r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(\.\d+)?$')
+
+
+def _noticia(n: int, titulo: str = None) -> dict:
+    return {
+        'titulo': titulo or f'Notícia {n}',
+        'fonte': 'Câmara dos Deputados',
+        'link': f'https://exemplo.gov.br/noticias/{n}',
+        'data_publicacao': f'2025-07-{n:02d} 10:00:00',
+        'data_coleta': '2025-07-20 12:00:00',
+    }
+
+
+def test_save_noticias_bulk_conta_inseridas_atualizadas_e_ignoradas(conn):
+    lote = [_noticia(1), _noticia(2), _noticia(3), {'link': 'https://exemplo.gov.br/sem-titulo'},
+            _noticia(3)]
+
+    # Sem título e link repetido no lote são ignorados
+    assert save_noticias_bulk(conn, lote, tamanho_lote=2) == {'inseridas': 3, 'atualizadas': 0, 'ignoradas': 2}
+    assert conn.execute("SELECT count(*) FROM noticias").fetchone()[0] == 3
+
+    # Notícias idênticas às gravadas não são reescritas
+    contagem = save_noticias_bulk(conn, [_noticia(1), _noticia(2, 'Título corrigido'), _noticia(4)])
+    assert contagem == {'inseridas': 1, 'atualizadas': 1, 'ignoradas': 1}
+    assert conn.execute(
+        "SELECT titulo FROM noticias WHERE link = ?", (_noticia(2)['link'],)
+    ).fetchone()[0] == 'Título corrigido'
+
+
+def test_save_scores_bulk_grava_e_espelha_em_noticias(conn):
+    save_noticias_bulk(conn, [_noticia(1), _noticia(2)])
+    ids = [row[0] for row in conn.execute("SELECT id FROM noticias ORDER BY id")]
+    scores = [{'noticia_id': ids[0], 'score_interesse': 3, 'score_risco': 1, 'categorias': ['tributos']},
+              {'noticia_id': ids[1], 'score_interesse': 0, 'score_risco': 2, 'categorias': []},
+              {'score_interesse': 5}]
+
+    assert save_scores_bulk(conn, scores, 'v1', tamanho_lote=1) == {'inseridas': 2, 'atualizadas': 0, 'ignoradas': 1}
+    assert save_scores_bulk(conn, scores[:1], 'v1') == {'inseridas': 0, 'atualizadas': 1, 'ignoradas': 0}
+
+    assert conn.execute("SELECT count(*) FROM scores_faciap WHERE dicionario_hash = 'v1'").fetchone()[0] == 2
+    assert conn.execute(
+        "SELECT score_interesse, score_risco, categorias, score_versao FROM noticias WHERE id = ?", (ids[0],)
+    ).fetchone() == (3.0, 1.0, '["tributos"]', 'v1')
+
+
+def test_update_textos_bulk_pula_texto_com_mesmo_hash(conn):
+    save_noticias_bulk(conn, [_noticia(1), _noticia(2)])
+    link1, link2 = _noticia(1)['link'], _noticia(2)['link']
+
+    contagem = update_textos_bulk(conn, [(link1, 'Texto original'), (link2, 'Outro texto'),
+                                         ('https://exemplo.gov.br/inexistente', 'x')])
+    assert contagem == {'inseridas': 2, 'atualizadas': 0, 'ignoradas': 1}
+
+    with conn:
+        conn.execute("UPDATE noticias SET score_versao = 'v1', texto_verificado_em = '2000-01-01'")
+
+    contagem = update_textos_bulk(conn, [(link1, 'Texto original'), (link2, 'Texto revisado')])
+    assert contagem == {'inseridas': 0, 'atualizadas': 1, 'ignoradas': 1}
+
+    linhas = {
+        link: resto for link, *resto in conn.execute(
+            "SELECT link, texto_completo, texto_hash, score_versao, texto_verificado_em FROM noticias"
+        )
+    }
+    # Texto igual: só a verificação é registrada; o score continua válido
+    texto, hash_gravado, versao, verificado = linhas[link1]
+    assert (texto, hash_gravado, versao) == ('Texto original', hash_texto('Texto original'), 'v1')
+    assert verificado > '2000-01-01'
+    # Texto alterado invalida o score
+    texto, hash_gravado, versao, _ = linhas[link2]
+    assert (texto, hash_gravado, versao) == ('Texto revisado', hash_texto('Texto revisado'), None)
+
+
+def test_datas_gravadas_em_um_so_formato(conn):
+    recente = str(datetime.now() - timedelta(days=1))
+    save_noticias_bulk(conn, [{**_noticia(1), 'data_coleta': None, 'data_publicacao': recente}])
+    update_textos_bulk(conn, [(_noticia(1)['link'], 'Texto')])
+    save_scores_bulk(conn, [{'noticia_id': 1, 'score_interesse': 1}], 'v1')
+
+    datas = conn.execute(
+        "SELECT n.data_coleta, n.texto_verificado_em, s.data_calculo "
+        "FROM noticias n JOIN scores_faciap s ON s.noticia_id = n.id"
+    ).fetchone()
+    assert all(FORMATO_DATA.match(data) for data in datas), datas
+
+    # Verificada agora: fora da revisita; com revisita de 0 dias, entra
+    assert links_a_extrair(conn, [_noticia(1)['link']]) == []
+    assert links_a_extrair(conn, [_noticia(1)['link']], revisita_dias=0) == [_noticia(1)['link']]
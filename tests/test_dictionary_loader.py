@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Formatos do CSV do dicionário e recarga por mtime/conteúdo
+"""
+
+import os
+
+import pytest
+
+from core.scoring.dictionary_loader import TERMOS_EXEMPLO, ler_termos_csv, obter_dicionario
+
+ESPERADO = [('Reforma tributária', 'Tributos', 8.5, 2.0), ('ICMS', 'Tributos', 7.0, 0.0)]
+
+
+@pytest.mark.parametrize('conteudo', [
+    'termo,categoria,peso_interesse,peso_risco\nReforma tributária,Tributos,8.5,2\nICMS,Tributos,7,\n'
+    .encode('utf-8'),
+    '\ufeffpalavra_chave;eixo_temat;peso_interesse;peso_risco\nReforma tributária;Tributos;8,5;2\nICMS;Tributos;7;\n'
+    .encode('utf-8'),
+    ' Termo ; Categoria ;Peso_Interesse;Peso_Risco\r\nReforma tributária;Tributos;8,5;2\r\n;;;\r\nICMS;Tributos;7;0\r\n'
+    .encode('latin-1'),
+])
+def test_formatos_aceitos(conteudo):
+    assert ler_termos_csv(conteudo) == ESPERADO
+
+
+def test_coluna_obrigatoria_ausente():
+    with pytest.raises(ValueError):
+        ler_termos_csv(b'nome,categoria\nICMS,Tributos\n')
+
+
+def _escrever(caminho, conteudo: str, mtime: float):
+    caminho.write_text(conteudo, encoding='utf-8')
+    os.utime(caminho, (mtime, mtime))
+
+
+def test_recarrega_quando_o_conteudo_muda(tmp_path):
+    caminho = tmp_path / 'dicionario.csv'
+    _escrever(caminho, 'termo,categoria,peso_interesse,peso_risco\nICMS,Tributos,7,1\n', 1_000_000)
+
+    primeiro = obter_dicionario(str(caminho))
+    assert primeiro.termos == [('ICMS', 'Tributos', 7.0, 1.0)]
+    assert obter_dicionario(str(caminho)) is primeiro
+
+    # Arquivo tocado sem mudança: mesma compilação
+    os.utime(caminho, (1_000_100, 1_000_100))
+    assert obter_dicionario(str(caminho)) is primeiro
+
+    _escrever(caminho, 'termo,categoria,peso_interesse,peso_risco\nICMS,Tributos,9,1\n', 1_000_200)
+    segundo = obter_dicionario(str(caminho))
+    assert segundo is not primeiro
+    assert segundo.versao != primeiro.versao
+    assert segundo.termos == [('ICMS', 'Tributos', 9.0, 1.0)]
+
+    # CSV inválido mantém a versão anterior
+    _escrever(caminho, 'nome;outra\nx;y\n', 1_000_300)
+    assert obter_dicionario(str(caminho)) is segundo
+
+
+def test_arquivo_ausente_usa_dicionario_de_exemplo(tmp_path):
+    dicionario = obter_dicionario(str(tmp_path / 'nao_existe.csv'))
+
+    assert dicionario.termos == TERMOS_EXEMPLO
+    assert dicionario.categorias[0] == 'Educação'
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Exportação em fluxo: os três formatos com os mesmos dados e filtros
+"""
+
+import csv
+import io
+import json
+
+import pyarrow.parquet as pq
+import pytest
+
+from core.database.export import COLUNAS, colunas_exportadas, exportar, gerar_exportacao
+
+
+@pytest.fixture
+def noticias(conn):
+    with conn:
+        conn.executemany(
+            "INSERT INTO noticias (titulo, fonte, link, data_publicacao, data_coleta, texto_completo, "
+            "score_interesse, score_risco, favorita, categorias, categoria_dominante) "
+            "VALUES (?, ?, ?, ?, '2025-07-20 12:00:00', ?, ?, ?, ?, ?, ?)",
+            [(f'Notícia {i}, "com" aspas', 'Senado Federal' if i % 2 else 'Câmara dos Deputados',
+              f'https://exemplo.gov.br/{i}', f'2025-07-{i:02d} 10:00:00', f'Texto {i}\ncom quebra',
+              float(i), 1.0, i == 3, json.dumps(['Tributos', 'Agro'] if i % 2 else []),
+              'Tributos' if i % 2 else None)
+             for i in range(1, 8)]
+        )
+    return conn
+
+
+def test_csv_ndjson_e_parquet_exportam_as_mesmas_linhas(noticias):
+    csv_texto = ''.join(gerar_exportacao(noticias, 'csv', tamanho_lote=3))
+    linhas_csv = list(csv.DictReader(io.StringIO(csv_texto)))
+    ndjson = [json.loads(linha) for linha in ''.join(gerar_exportacao(noticias, 'ndjson', tamanho_lote=3)).splitlines()]
+    tabela = pq.read_table(io.BytesIO(b''.join(gerar_exportacao(noticias, 'parquet', tamanho_lote=3))))
+
+    assert len(linhas_csv) == len(ndjson) == tabela.num_rows == 7
+    assert tuple(linhas_csv[0]) == tuple(ndjson[0]) == tuple(tabela.column_names) == COLUNAS
+    # Um row group por lote
+    assert pq.ParquetFile(io.BytesIO(b''.join(gerar_exportacao(noticias, 'parquet', tamanho_lote=3)))) \
+        .num_row_groups == 3
+
+    assert ndjson[0]['categorias'] == ['Tributos', 'Agro'] and ndjson[0]['favorita'] is False
+    assert linhas_csv[0]['categorias'] == 'Tributos; Agro'
+    assert linhas_csv[0]['titulo'] == 'Notícia 1, "com" aspas'
+    assert tabela.to_pylist()[2]['favorita'] is True
+    assert tabela.to_pylist()[1]['categorias'] == []
+    assert [r['id'] for r in ndjson] == tabela.column('id').to_pylist()
+
+
+def test_filtros_e_texto_completo(noticias):
+    ndjson = ''.join(gerar_exportacao(noticias, 'ndjson', incluir_texto=True, fonte='Senado Federal',
+                                      data_inicio='2025-07-02', data_fim='2025-07-05', score_min=5))
+    linhas = [json.loads(linha) for linha in ndjson.splitlines()]
+
+    assert [linha['id'] for linha in linhas] == [5]
+    assert tuple(linhas[0]) == colunas_exportadas(True)
+    assert linhas[0]['texto_completo'] == 'Texto 5\ncom quebra'
+
+
+def test_exportar_para_arquivo_e_formato_invalido(noticias):
+    destino = io.BytesIO()
+    assert exportar(noticias, 'csv', destino) == len(destino.getvalue())
+
+    with pytest.raises(ValueError):
+        gerar_exportacao(noticias, 'xlsx')
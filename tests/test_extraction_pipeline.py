@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+ExtractionPipeline: contagens, escrita em lotes e limite de links em voo
+"""
+
+import threading
+import time
+
+import pytest
+
+from core.extractors.extraction_pipeline import ERRO_SEM_TEXTO, ExtractionPipeline
+from core.extractors.text_extractor import extrair_texto
+from core.http_client import HttpClient
+
+PARAGRAFO = 'A comissão aprovou o projeto que altera as regras de tributação das pequenas empresas. '
+
+
+def test_conta_textos_falhas_e_paginas_sem_texto():
+    def extrair(link):
+        if link.endswith('erro'):
+            raise RuntimeError('timeout')
+        return None if link.endswith('vazio') else f'texto de {link}'
+
+    lotes, resultados = [], []
+    pipeline = ExtractionPipeline(extrair, lambda lote: lotes.append(list(lote)) or len(lote),
+                                  max_workers=3, tamanho_lote=2, registrar_resultados=resultados.extend)
+    links = [f'https://exemplo.gov.br/{i}' for i in range(5)] + ['https://exemplo.gov.br/erro',
+                                                                 'https://exemplo.gov.br/vazio']
+
+    stats = pipeline.run(links)
+
+    assert {chave: stats[chave] for chave in ('links', 'extraidos', 'sem_texto', 'falhas', 'gravados')} == \
+        {'links': 7, 'extraidos': 5, 'sem_texto': 1, 'falhas': 1, 'gravados': 5}
+    assert stats['lotes'] == len(lotes)
+    assert sorted(texto for lote in lotes for _, texto in lote) == sorted(f'texto de {link}' for link in links[:5])
+    erros = dict(resultados)
+    assert len(erros) == 7
+    assert erros['https://exemplo.gov.br/erro'] == 'timeout'
+    assert erros['https://exemplo.gov.br/vazio'] == ERRO_SEM_TEXTO
+    assert all(erros[link] is None for link in links[:5])
+
+
+def test_resultados_so_sao_registrados_depois_da_gravacao():
+    gravados = set()
+    registrados_antes_de_gravar = []
+
+    def registrar(lote):
+        registrados_antes_de_gravar.extend(link for link, erro in lote if erro is None and link not in gravados)
+
+    def escrever(lote):
+        gravados.update(link for link, _ in lote)
+        return len(lote)
+
+    ExtractionPipeline(lambda link: link, escrever, max_workers=4, tamanho_lote=3,
+                       registrar_resultados=registrar).run(f'l{i}' for i in range(20))
+
+    assert registrados_antes_de_gravar == []
+    assert len(gravados) == 20
+
+
+def test_limita_os_links_em_voo():
+    em_voo = 0
+    maximo = 0
+    lock = threading.Lock()
+
+    def extrair(link):
+        nonlocal em_voo, maximo
+        with lock:
+            em_voo += 1
+            maximo = max(maximo, em_voo)
+        time.sleep(0.01)
+        with lock:
+            em_voo -= 1
+        return link
+
+    stats = ExtractionPipeline(extrair, len, max_workers=3, max_pendentes=4).run(f'l{i}' for i in range(30))
+
+    assert stats['gravados'] == 30
+    assert maximo <= 3
+
+
+@pytest.fixture
+def cliente():
+    client = HttpClient(retentativas=0, cache_path=None, arquivo_path=None)
+    yield client
+    client.close()
+
+
+def test_extrair_texto_propaga_erros_http(servidor_http, cliente):
+    servidor_http.paginas['/noticia'] = (200, (
+        '<html><body><div id="textoMateria">' + f'<p>{PARAGRAFO * 3}</p>' * 2 + '</div></body></html>'
+    ).encode('utf-8'))
+    servidor_http.paginas['/quebrada'] = (500, b'erro')
+    servidor_http.paginas['/curta'] = (200, b'<html><body><p>Curta.</p></body></html>')
+
+    assert extrair_texto(servidor_http.url + '/noticia', cliente).startswith('A comissão aprovou')
+    assert extrair_texto(servidor_http.url + '/curta', cliente) is None
+
+    pipeline = ExtractionPipeline(lambda link: extrair_texto(link, cliente), len, max_workers=2)
+    stats = pipeline.run([servidor_http.url + caminho for caminho in ('/noticia', '/quebrada', '/curta', '/404')])
+    assert (stats['extraidos'], stats['sem_texto'], stats['falhas']) == (1, 1, 2)
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Backoff das falhas e checkpoint das listagens na Fronteira
+"""
+
+from datetime import datetime, timedelta
+
+from core.database.frontier import Fronteira
+
+URLS = {pagina: f'https://exemplo.gov.br/noticias?pagina={pagina}' for pagina in range(1, 5)}
+
+
+def _entrada(conn, url):
+    return conn.execute(
+        "SELECT status, tentativas, proxima_tentativa, ultimo_erro FROM fronteira WHERE url = ?", (url,)
+    ).fetchone()
+
+
+def _segundos_ate(proxima: str) -> float:
+    return (datetime.strptime(proxima, '%Y-%m-%d %H:%M:%S') - datetime.now()).total_seconds()
+
+
+def test_falhar_dobra_o_backoff_ate_o_teto_e_abandona(banco, conn):
+    fronteira = Fronteira(banco, max_tentativas=4, backoff_base=60, backoff_maximo=150)
+    fronteira.retomar_listagem('Teste', URLS)
+    url = URLS[2]
+
+    esperados = [60, 120, 150]
+    for tentativa, segundos in enumerate(esperados, start=1):
+        fronteira.falhar(url, f'erro {tentativa}')
+        status, tentativas, proxima, erro = _entrada(conn, url)
+        assert (status, tentativas, erro) == ('falha', tentativa, f'erro {tentativa}')
+        assert abs(_segundos_ate(proxima) - segundos) <= 2
+
+    fronteira.falhar(url, 'erro final')
+    assert _entrada(conn, url)[:2] == ('abandonada', 4)
+
+
+def test_retomar_listagem_separa_concluidas_e_em_backoff(banco, conn):
+    fronteira = Fronteira(banco)
+    checkpoint = fronteira.retomar_listagem('Teste', {1: URLS[1], 2: URLS[2]})
+    assert checkpoint.concluidas == set() and checkpoint.aguardando == set()
+    assert checkpoint.limite == 2 and not checkpoint.retomada
+
+    fronteira.concluir_listagem('Teste', URLS[1], [{'link': 'https://exemplo.gov.br/n/1', 'titulo': 'N'}], False)
+    fronteira.falhar(URLS[2], 'timeout')
+
+    # Uma coleta com mais páginas mantém o estado das já registradas
+    checkpoint = fronteira.retomar_listagem('Teste', URLS)
+    assert checkpoint.retomada
+    assert checkpoint.concluidas == {1}
+    assert checkpoint.aguardando == {2}
+    assert checkpoint.limite == 4
+    # A notícia da página concluída entrou na fronteira na mesma transação
+    assert [n['link'] for n in fronteira.noticias_pendentes()] == ['https://exemplo.gov.br/n/1']
+
+    # Backoff vencido: a página volta a ser buscada
+    passado = (datetime.now() - timedelta(minutes=1)).strftime('%Y-%m-%d %H:%M:%S')
+    with conn:
+        conn.execute("UPDATE fronteira SET proxima_tentativa = ? WHERE url = ?", (passado, URLS[2]))
+    assert fronteira.retomar_listagem('Teste', URLS).aguardando == set()
+
+
+def test_pagina_final_e_encerrar_listagem(banco):
+    fronteira = Fronteira(banco)
+    fronteira.retomar_listagem('Teste', URLS)
+    fronteira.concluir_listagem('Teste', URLS[3], [], True)
+    fronteira.concluir_listagem('Teste', URLS[4], [], True)
+
+    assert fronteira.retomar_listagem('Teste', URLS).pagina_final == 3
+
+    fronteira.encerrar_listagem('Teste')
+    assert 'listagem' not in fronteira.resumo()
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+GET condicional: o 304 devolve o corpo guardado uma única vez (no arquivo
+de HTML ou, sem ele, no próprio cache)
+"""
+
+import sqlite3
+
+import pytest
+
+from core.http_client import CacheValidadores, HttpClient
+
+CORPO = '<html><body><p>Notícia</p></body></html>'.encode('utf-8')
+
+
+@pytest.fixture
+def caminhos(tmp_path):
+    return str(tmp_path / 'http_cache.db'), str(tmp_path / 'arquivo')
+
+
+def _linha_do_cache(cache_path: str, url: str):
+    with sqlite3.connect(cache_path) as conn:
+        return conn.execute("SELECT sha256, corpo FROM http_cache WHERE url = ?", (url,)).fetchone()
+
+
+@pytest.mark.parametrize('com_arquivo', [True, False])
+def test_304_devolve_o_corpo_guardado(servidor_http, caminhos, com_arquivo):
+    cache_path, arquivo_path = caminhos
+    cliente = HttpClient(retentativas=0, cache_path=cache_path, arquivo_path=arquivo_path if com_arquivo else None)
+    url = servidor_http.url + '/noticia'
+    try:
+        servidor_http.paginas['/noticia'] = (200, CORPO, {'ETag': '"v1"'})
+        assert cliente.get(url).content == CORPO
+
+        sha256, corpo = _linha_do_cache(cache_path, url)
+        if com_arquivo:
+            assert corpo is None and cliente.arquivo.ler_objeto(sha256) == CORPO
+        else:
+            assert sha256 is None and corpo is not None
+
+        servidor_http.paginas['/noticia'] = (304, b'')
+        resposta = cliente.get(url)
+        assert (resposta.status_code, resposta.content, resposta.nao_modificado) == (200, CORPO, True)
+    finally:
+        cliente.close()
+
+
+def test_sem_arquivo_ignora_entradas_guardadas_so_pelo_hash(servidor_http, caminhos):
+    cache_path, arquivo_path = caminhos
+    url = servidor_http.url + '/noticia'
+    servidor_http.paginas['/noticia'] = (200, CORPO, {'ETag': '"v1"'})
+    primeiro = HttpClient(retentativas=0, cache_path=cache_path, arquivo_path=arquivo_path)
+    primeiro.get(url)
+    primeiro.close()
+
+    # O mesmo cache, agora sem o arquivo: a requisição não é condicional
+    servidor_http.paginas['/noticia'] = (200, b'<html>nova</html>', {'ETag': '"v2"'})
+    cliente = HttpClient(retentativas=0, cache_path=cache_path, arquivo_path=None)
+    try:
+        assert cliente.get(url).content == b'<html>nova</html>'
+    finally:
+        cliente.close()
+
+
+def test_cache_do_formato_antigo_e_recriado(caminhos):
+    cache_path, _ = caminhos
+    with sqlite3.connect(cache_path) as conn:
+        conn.execute("CREATE TABLE http_cache (url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, "
+                     "corpo BLOB NOT NULL, atualizado_em TEXT NOT NULL)")
+        conn.execute("INSERT INTO http_cache VALUES ('https://exemplo.gov.br', '\"v1\"', NULL, x'00', "
+                     "'2099-01-01')")
+
+    cache = CacheValidadores(cache_path)
+    try:
+        assert cache.obter('https://exemplo.gov.br') is None
+        cache.salvar('https://exemplo.gov.br', '"v2"', None, sha256='ab' * 32)
+        assert cache.obter('https://exemplo.gov.br') == ('"v2"', None, 'ab' * 32, None)
+    finally:
+        cache.close()
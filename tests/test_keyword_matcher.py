@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+KeywordMatcher contra o scorer original (iterrows sobre o DataFrame do dicionário)
+"""
+
+import pandas as pd
+import pytest
+
+from core.scoring.keyword_matcher import KeywordMatcher, matcher_do_dataframe, obter_matcher
+
+DICIONARIO = pd.DataFrame({
+    'termo': ['reforma tributária', 'ICMS', 'imposto', 'licitação', 'MEI', 'crédito rural'],
+    'categoria': ['Tributos', 'Tributos', 'Tributos', 'Compras públicas', 'Empreendedorismo', 'Agro'],
+    'peso_interesse': [10, 8, 5, 7, 6, 4],
+    'peso_risco': [3, 5, 2, 4, 1, 2],
+})
+
+TEXTOS = [
+    'A Câmara aprovou a Reforma Tributária e mudanças no ICMS.',
+    'Nova licitação para o MEI; imposto, imposto e mais imposto.',
+    'Crédito rural: o crédito rural terá juros menores.',
+    'Sessão sem pauta econômica.',
+    '',
+]
+
+
+def _score_original(texto, dicionario):
+    """Laço dos backends antes do matcher compilado"""
+    if not texto:
+        return 0, 0, []
+    texto_lower = texto.lower()
+    score_interesse, score_risco, categorias = 0, 0, []
+    for _, row in dicionario.iterrows():
+        if row['termo'].lower() in texto_lower:
+            score_interesse += row['peso_interesse']
+            score_risco += row['peso_risco']
+            if row['categoria'] not in categorias:
+                categorias.append(row['categoria'])
+    return score_interesse, score_risco, categorias
+
+
+@pytest.mark.parametrize('texto', TEXTOS)
+def test_mesmo_resultado_do_scorer_original(texto):
+    resultado = matcher_do_dataframe(DICIONARIO).match(texto)
+
+    assert (resultado.score_interesse, resultado.score_risco, resultado.categorias) == \
+        _score_original(texto, DICIONARIO)
+
+
+def test_respeita_limites_de_palavra():
+    # A busca por substring do scorer original casava 'MEI' dentro de 'meio'
+    resultado = matcher_do_dataframe(DICIONARIO).match('No meio do caminho havia impostos')
+
+    assert resultado.contagens == {}
+    assert resultado.score_interesse == 0
+
+
+def test_por_ocorrencia_e_categoria_dominante():
+    resultado = matcher_do_dataframe(DICIONARIO).match(TEXTOS[1], por_ocorrencia=True)
+
+    assert resultado.contagens == {'imposto': 3, 'licitação': 1, 'mei': 1}
+    assert resultado.score_interesse == 3 * 5 + 7 + 6
+    # Empate entre categorias com um termo cada: vale a ordem do dicionário
+    assert resultado.categoria_dominante == 'Tributos'
+
+
+def test_versao_muda_com_o_conteudo_e_matcher_e_reaproveitado():
+    termos = list(DICIONARIO.itertuples(index=False, name=None))
+
+    assert obter_matcher(termos) is obter_matcher(termos)
+    alterados = termos[:-1] + [('crédito rural', 'Agro', 4, 3)]
+    assert KeywordMatcher(alterados).versao != KeywordMatcher(termos).versao
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""
+Lematizador compartilhado: configuração do nlp.pipe sem carregar o modelo
+"""
+
+import pytest
+
+import core.scoring.lemmatizer as lemmatizer
+
+
+@pytest.fixture(autouse=True)
+def sem_lematizador(monkeypatch):
+    monkeypatch.setattr(lemmatizer, '_lematizador', None)
+
+
+def test_padroes_do_ambiente_e_ajuste_por_chamada(monkeypatch):
+    monkeypatch.setattr(lemmatizer, 'PROCESSOS', 3)
+    monkeypatch.setattr(lemmatizer, 'TAMANHO_LOTE', 256)
+
+    lematizador = lemmatizer.get_lematizador()
+    assert (lematizador.n_process, lematizador.batch_size) == (3, 256)
+
+    assert lemmatizer.get_lematizador(n_process=2) is lematizador
+    assert (lematizador.n_process, lematizador.batch_size) == (2, 256)
+    lemmatizer.get_lematizador(batch_size=32)
+    assert (lematizador.n_process, lematizador.batch_size) == (2, 32)
+    assert lematizador._nlp is None
+
+
+def test_limpar_texto():
+    assert lemmatizer.limpar_texto('  Reforma Tributária: ICMS/ISS!  ') == 'reforma tributaria icms iss'
+    assert lemmatizer.limpar_texto(None) == ''
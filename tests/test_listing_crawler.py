@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+Condições de parada e checkpoint do ListingCrawler contra um servidor HTTP local
+"""
+
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from core.database.frontier import Fronteira
+from core.http_client import HttpClient
+from core.scrapers.listing_crawler import FonteListagem, ListingCrawler
+from core.scrapers.listing_parsers import parse_listagem_camara
+
+DATA_LIMITE = datetime(2025, 7, 1)
+RECENTE = '15/07/2025 10:00'
+ANTIGA = '20/06/2025 10:00'
+
+
+def _listagem(pagina: int, datas) -> bytes:
+    """Página no formato da listagem da Câmara"""
+    artigos = ''.join(
+        f'<li><article class="g-chamada"><h3><a class="g-chamada__titulo-link" '
+        f'href="/noticias/{pagina}-{i}">Notícia {i} da página {pagina}</a></h3>'
+        f'<span class="g-chamada__data">{data}</span></article></li>'
+        for i, data in enumerate(datas)
+    )
+    return f'<html><body><ul class="l-lista-noticias">{artigos}</ul></body></html>'.encode('utf-8')
+
+
+def _caminho(pagina: int) -> str:
+    return '/noticias' if pagina == 1 else f'/noticias?pagina={pagina}'
+
+
+def _publicar(servidor, paginas):
+    """paginas: {número: lista de datas | status HTTP}"""
+    for pagina, conteudo in paginas.items():
+        if isinstance(conteudo, int):
+            servidor.paginas[_caminho(pagina)] = (conteudo, b'erro')
+        else:
+            servidor.paginas[_caminho(pagina)] = (200, _listagem(pagina, conteudo))
+
+
+def _paginas_pedidas(servidor):
+    return sorted(1 if caminho == '/noticias' else int(caminho.rsplit('=', 1)[1])
+                  for caminho in servidor.requisicoes)
+
+
+@pytest.fixture
+def cliente():
+    client = HttpClient(retentativas=0, cache_path=None, arquivo_path=None)
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def fonte(servidor_http):
+    return FonteListagem('Teste', servidor_http.url + '/noticias', '{base}?pagina={pagina}',
+                         parse_listagem_camara)
+
+
+def _crawler(cliente, **kwargs) -> ListingCrawler:
+    kwargs.setdefault('concorrencia', 1)
+    return ListingCrawler(taxa_por_host=None, data_limite=DATA_LIMITE, client=cliente, **kwargs)
+
+
+def test_para_na_data_limite(servidor_http, fonte, cliente):
+    _publicar(servidor_http, {1: [RECENTE, RECENTE], 2: [RECENTE, ANTIGA], 3: [RECENTE]})
+
+    noticias = _crawler(cliente).crawl(fonte, max_pages=5)
+
+    assert [n['link'].rsplit('/', 1)[1] for n in noticias] == ['1-0', '1-1', '2-0']
+    assert _paginas_pedidas(servidor_http) == [1, 2]
+
+
+def test_para_na_pagina_vazia(servidor_http, fonte, cliente):
+    _publicar(servidor_http, {1: [RECENTE], 2: [], 3: [RECENTE]})
+
+    noticias = _crawler(cliente).crawl(fonte, max_pages=5)
+
+    assert len(noticias) == 1
+    assert _paginas_pedidas(servidor_http) == [1, 2]
+
+
+def test_404_encerra_a_listagem(servidor_http, fonte, cliente):
+    _publicar(servidor_http, {1: [RECENTE, RECENTE], 3: [RECENTE]})
+
+    noticias = _crawler(cliente).crawl(fonte, max_pages=5)
+
+    assert len(noticias) == 2
+    assert _paginas_pedidas(servidor_http) == [1, 2]
+
+
+def test_busca_concorrente_devolve_na_ordem_das_paginas(servidor_http, fonte, cliente):
+    _publicar(servidor_http, {pagina: [RECENTE, RECENTE] for pagina in range(1, 7)})
+
+    noticias = _crawler(cliente, concorrencia=4).crawl(fonte, max_pages=6)
+
+    assert [n['link'].rsplit('/', 1)[1] for n in noticias] == [
+        f'{pagina}-{i}' for pagina in range(1, 7) for i in range(2)
+    ]
+    assert _paginas_pedidas(servidor_http) == list(range(1, 7))
+
+
+def test_404_apaga_o_checkpoint(servidor_http, fonte, cliente, banco):
+    _publicar(servidor_http, {1: [RECENTE]})
+    fronteira = Fronteira(banco)
+
+    _crawler(cliente, fronteira=fronteira).crawl(fonte, max_pages=5)
+
+    # Fim da listagem não é falha
+    assert 'listagem' not in fronteira.resumo()
+
+
+def test_pagina_com_erro_nao_interrompe_a_coleta(servidor_http, fonte, cliente, banco):
+    _publicar(servidor_http, {1: [RECENTE], 2: 500, 3: [RECENTE], 4: [ANTIGA]})
+    fronteira = Fronteira(banco)
+
+    noticias = _crawler(cliente, fronteira=fronteira).crawl(fonte, max_pages=6)
+
+    assert [n['link'].rsplit('/', 1)[1] for n in noticias] == ['1-0', '3-0']
+    assert _paginas_pedidas(servidor_http) == [1, 2, 3, 4]
+    # A página com erro antes do fim mantém o checkpoint para a retomada
+    assert fronteira.resumo()['listagem'].get('falha') == 1
+
+
+def test_coleta_normal_rebusca_as_primeiras_paginas(servidor_http, fonte, cliente, banco):
+    _publicar(servidor_http, {1: [RECENTE], 2: 500, 3: [ANTIGA]})
+    fronteira = Fronteira(banco)
+    _crawler(cliente, fronteira=fronteira).crawl(fonte, max_pages=5)
+
+    servidor_http.limpar_requisicoes()
+    _publicar(servidor_http, {1: [RECENTE, RECENTE], 2: [RECENTE]})
+    noticias = _crawler(cliente, fronteira=fronteira).crawl(fonte, max_pages=5)
+
+    # Sem --resume, a página 1 concluída antes é buscada de novo e a página
+    # em backoff não limita a coleta
+    assert _paginas_pedidas(servidor_http) == [1, 2, 3]
+    assert len(noticias) == 3
+    assert 'listagem' not in fronteira.resumo()
+
+
+def test_retomada_pula_concluidas_e_paginas_em_backoff(servidor_http, fonte, cliente, banco):
+    _publicar(servidor_http, {1: [RECENTE], 2: 500, 3: [RECENTE], 4: [ANTIGA]})
+    _crawler(cliente, fronteira=Fronteira(banco)).crawl(fonte, max_pages=6)
+    _publicar(servidor_http, {2: [RECENTE]})
+
+    servidor_http.limpar_requisicoes()
+    noticias = _crawler(cliente, fronteira=Fronteira(banco), retomar=True).crawl(fonte, max_pages=6)
+    assert noticias == []
+    assert _paginas_pedidas(servidor_http) == []
+    assert Fronteira(banco).resumo()['listagem'].get('falha') == 1
+
+    # Backoff vencido: só a página que falhou é buscada e o checkpoint termina
+    with sqlite3.connect(banco) as conexao:
+        conexao.execute("UPDATE fronteira SET proxima_tentativa = '2000-01-01 00:00:00' WHERE status = 'falha'")
+    servidor_http.limpar_requisicoes()
+    fronteira = Fronteira(banco)
+    noticias = _crawler(cliente, fronteira=fronteira, retomar=True).crawl(fonte, max_pages=6)
+    assert [n['link'].rsplit('/', 1)[1] for n in noticias] == ['2-0']
+    assert _paginas_pedidas(servidor_http) == [2]
+    assert 'listagem' not in fronteira.resumo()
+
+
+def test_erro_alem_da_data_limite_nao_mantem_checkpoint(servidor_http, fonte, cliente, banco):
+    _publicar(servidor_http, {1: [RECENTE], 2: [ANTIGA], 3: 500})
+    fronteira = Fronteira(banco)
+
+    noticias = _crawler(cliente, fronteira=fronteira, concorrencia=3).crawl(fonte, max_pages=3)
+
+    assert len(noticias) == 1
+    assert 'listagem' not in fronteira.resumo()
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Paginação por keyset de buscar_noticias
+"""
+
+import pytest
+
+from core.database.noticias_query import buscar_noticias, codificar_cursor
+
+# Datas repetidas e nulas exercitam o desempate por id e a segunda fase
+DATAS = ['2025-07-10', '2025-07-12', None, '2025-07-12', '2025-07-11', None, '2025-07-12', '2025-07-09']
+
+
+@pytest.fixture
+def noticias(conn):
+    with conn:
+        conn.executemany(
+            "INSERT INTO noticias (titulo, fonte, link, data_publicacao, score_interesse, score_risco) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [(f'Notícia {i}', 'Senado Federal' if i % 2 else 'Câmara dos Deputados',
+              f'https://exemplo.gov.br/{i}', data, i % 3, 0)
+             for i, data in enumerate(DATAS, start=1)]
+        )
+    return conn
+
+
+def _todas_as_paginas(conn, limite, **filtros):
+    ids, cursor, paginas = [], None, 0
+    while True:
+        linhas, cursor = buscar_noticias(conn, 'v1', cursor=cursor, limite=limite, **filtros)
+        assert len(linhas) <= limite
+        ids += [linha[0] for linha in linhas]
+        paginas += 1
+        if cursor is None:
+            return ids, paginas
+
+
+@pytest.mark.parametrize('limite', [1, 2, 3, 8, 20])
+def test_cursor_percorre_tudo_na_ordem_sem_repetir(noticias, limite):
+    esperado = [row[0] for row in noticias.execute(
+        "SELECT id FROM noticias ORDER BY data_publicacao IS NULL, data_publicacao DESC, id DESC"
+    )]
+
+    ids, paginas = _todas_as_paginas(noticias, limite)
+
+    assert ids == esperado
+    assert paginas == max(1, -(-len(esperado) // limite))
+
+
+def test_cursor_com_filtro_e_ordenacao_por_score(noticias):
+    esperado = [row[0] for row in noticias.execute(
+        "SELECT id FROM noticias WHERE fonte = 'Senado Federal' "
+        "ORDER BY score_interesse + score_risco DESC, id DESC"
+    )]
+
+    ids, _ = _todas_as_paginas(noticias, 2, fonte='Senado Federal', ordenacao='score_total')
+
+    assert ids == esperado
+
+
+def test_cursor_invalido(noticias):
+    with pytest.raises(ValueError):
+        buscar_noticias(noticias, 'v1', cursor='não é um cursor')
+    # Cursor no meio das linhas sem data continua pelos ids menores
+    linhas, _ = buscar_noticias(noticias, 'v1', cursor=codificar_cursor(None, 6))
+    assert [linha[0] for linha in linhas] == [3]
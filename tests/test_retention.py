@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Arquivamento das notícias antigas em Parquet e consulta ao arquivo frio
+"""
+
+from datetime import datetime
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from core.database.bulk_ops import save_scores_bulk
+from core.database.retention import arquivar_antigas, consultar_arquivo
+
+CORTE = datetime(2025, 7, 1)
+
+
+@pytest.fixture
+def noticias(conn):
+    datas = ['2025-05-10 10:00:00', '2025-05-20 10:00:00', '2025-06-15 10:00:00', '2025-06-30 23:00:00',
+             '2025-07-02 10:00:00', None]
+    with conn:
+        conn.executemany(
+            "INSERT INTO noticias (titulo, fonte, link, data_publicacao, data_coleta, favorita) "
+            "VALUES (?, 'Senado Federal', ?, ?, ?, ?)",
+            [(f'Notícia {i}', f'https://exemplo.gov.br/{i}', data, data or '2025-07-10 08:00:00', i == 2)
+             for i, data in enumerate(datas, start=1)]
+        )
+    save_scores_bulk(conn, [{'noticia_id': i, 'score_interesse': i, 'score_risco': 0} for i in range(1, 7)], 'v1')
+    return conn
+
+
+def test_arquiva_por_mes_e_mantem_favoritas_e_recentes(noticias, tmp_path):
+    stats = arquivar_antigas(noticias, str(tmp_path), antes_de=CORTE, tamanho_lote=2)
+
+    assert (stats['noticias'], stats['scores'], stats['lotes']) == (3, 3, 2)
+    restantes = [row[0] for row in noticias.execute("SELECT id FROM noticias ORDER BY id")]
+    assert restantes == [2, 5, 6]
+    assert noticias.execute("SELECT count(*) FROM scores_faciap").fetchone()[0] == 3
+    assert sorted(p.name for p in (tmp_path / 'noticias' / 'ano=2025').iterdir()) == ['mes=05', 'mes=06']
+
+    df = consultar_arquivo(str(tmp_path), inicio='2025-06', fim='2025-06-30')
+    assert df['id'].tolist() == [3, 4]
+    scores = consultar_arquivo(str(tmp_path), 'scores_faciap', noticia_ids=[1, 4], colunas=['score_interesse'])
+    assert sorted(scores['score_interesse'].tolist()) == [1.0, 4.0]
+
+
+def test_lote_rearquivado_nao_duplica(noticias, tmp_path):
+    arquivar_antigas(noticias, str(tmp_path), antes_de=CORTE)
+    # Simula a queda entre a escrita do Parquet e o DELETE: o lote volta ao banco
+    df = consultar_arquivo(str(tmp_path))
+    with noticias:
+        noticias.executemany(
+            "INSERT INTO noticias (id, titulo, fonte, link, data_publicacao) VALUES (?, ?, ?, ?, ?)",
+            df[['id', 'titulo', 'fonte', 'link', 'data_publicacao']].itertuples(index=False, name=None)
+        )
+    arquivar_antigas(noticias, str(tmp_path), antes_de=CORTE, tamanho_lote=1)
+
+    assert sorted(consultar_arquivo(str(tmp_path))['id'].tolist()) == [1, 3, 4]
+
+
+def test_arquivos_anteriores_a_uma_migracao_sao_lidos_com_colunas_nulas(noticias, tmp_path):
+    antigo = tmp_path / 'noticias' / 'ano=2025' / 'mes=04'
+    antigo.mkdir(parents=True)
+    pq.write_table(pa.table({'id': pa.array([100], pa.int64()), 'titulo': ['Arquivo antigo'],
+                             'data_publicacao': ['2025-04-01 10:00:00']}), antigo / 'part-antigo.parquet')
+    arquivar_antigas(noticias, str(tmp_path), antes_de=CORTE)
+
+    df = consultar_arquivo(str(tmp_path), colunas=['id', 'categoria_dominante', 'fonte'])
+
+    assert df['id'].tolist() == [100, 1, 3, 4]
+    assert df['fonte'].isna().tolist() == [True, False, False, False]
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+Fila de tarefas: status compartilhado pelo banco, tarefas órfãs e trava
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+import core.scheduler as scheduler
+from core.scheduler import ServicoColeta, Tarefa, TravaExecucao, caminho_trava, validar_parametros
+
+
+def _pid_encerrado() -> int:
+    processo = subprocess.Popen([sys.executable, '-c', 'pass'])
+    processo.wait()
+    return processo.pid
+
+
+def _tarefa_pendente(servico, tipo: str, processo, status: str = 'executando') -> Tarefa:
+    tarefa = Tarefa(tipo, {}, 'api')
+    tarefa.status = status
+    tarefa.processo = processo
+    servico._salvar(tarefa)
+    return tarefa
+
+
+def _aguardar(servico, tarefa_id: str, limite: float = 10.0) -> Tarefa:
+    fim = time.monotonic() + limite
+    while time.monotonic() < fim:
+        tarefa = servico.obter(tarefa_id)
+        if not tarefa.pendente:
+            return tarefa
+        time.sleep(0.02)
+    raise AssertionError(f"tarefa {tarefa_id} ainda pendente")
+
+
+@pytest.fixture
+def servico(banco):
+    servico = ServicoColeta(isolado=False, db_path=banco)
+    yield servico
+    servico.parar()
+
+
+def test_iniciar_marca_como_erro_as_tarefas_de_processos_encerrados(servico):
+    morta = _tarefa_pendente(servico, 'coleta', _pid_encerrado())
+    sem_processo = _tarefa_pendente(servico, 'extracao', None, status='na_fila')
+    viva = _tarefa_pendente(servico, 'scoring', os.getppid())
+
+    servico.iniciar()
+
+    assert servico.obter(morta.id).status == 'erro'
+    assert 'interrompida' in servico.obter(morta.id).erro
+    assert servico.obter(morta.id).finalizada_em is not None
+    assert servico.obter(sem_processo.id).status == 'erro'
+    assert servico.obter(viva.id).status == 'executando'
+
+
+def test_disparo_agendado_ignora_so_pendentes_de_processos_vivos(servico, monkeypatch):
+    enfileiradas = []
+    monkeypatch.setattr(servico, 'enfileirar', lambda tipo, origem: enfileiradas.append(tipo))
+    _tarefa_pendente(servico, 'coleta', os.getppid())
+    _tarefa_pendente(servico, 'scoring', _pid_encerrado())
+
+    servico._disparo_agendado('coleta')
+    servico._disparo_agendado('scoring')
+
+    assert enfileiradas == ['scoring']
+
+
+def test_status_visivel_de_outra_instancia(servico, banco, monkeypatch):
+    def executar(tipo, parametros, db_path):
+        if parametros.get('limite') == 0:
+            return {'resultado': None, 'erro': 'sem links', 'metricas': {}}
+        return {'resultado': {'tipo': tipo, **parametros}, 'erro': None, 'metricas': {}}
+
+    monkeypatch.setattr(scheduler, 'executar_tarefa', executar)
+    ok = servico.enfileirar('extracao', {'limite': 5})
+    falha = servico.enfileirar('extracao', {'limite': 0})
+
+    outro = ServicoColeta(isolado=False, db_path=banco)
+    assert _aguardar(outro, ok.id).resultado == {'tipo': 'extracao', 'limite': 5}
+    assert (_aguardar(outro, falha.id).status, outro.obter(falha.id).erro) == ('erro', 'sem links')
+    assert [tarefa.id for tarefa in outro.listar()] == [falha.id, ok.id]
+    assert outro.obter(ok.id).processo == os.getpid()
+
+
+@pytest.mark.parametrize('tipo, parametros', [
+    ('backup', None),
+    ('coleta', {'paginas': 3}),
+    ('coleta', {'concorrencia': -1}),
+    ('coleta', {'incremental': 'sim'}),
+    ('extracao', {'limite': True}),
+])
+def test_validar_parametros_rejeita(tipo, parametros):
+    with pytest.raises(ValueError):
+        validar_parametros(tipo, parametros)
+
+
+def test_trava_nao_bloqueante(banco):
+    primeira = TravaExecucao(caminho_trava(banco))
+    segunda = TravaExecucao(caminho_trava(banco))
+
+    assert primeira.adquirir(bloquear=False)
+    try:
+        assert not segunda.adquirir(bloquear=False)
+    finally:
+        primeira.liberar()
+    assert segunda.adquirir(bloquear=False)
+    segunda.liberar()
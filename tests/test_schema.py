@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Migrações: inicialização dos backends sem trava quando já atualizado e sem
+esperar quando outra execução detém o banco; efeitos de migrações com dados
+"""
+
+import sqlite3
+
+from banco_de_teste import preparar_banco
+from core.database.schema import REVISAO_ATUAL, aplicar_migracoes, migrar_na_inicializacao, revisao_do_banco
+from core.scheduler import TravaExecucao, caminho_trava
+from core.scoring.keyword_matcher import KeywordMatcher
+from core.scoring.score_cache import existem_pendentes, rescore_pendentes
+
+
+def _revisao(caminho: str):
+    with sqlite3.connect(caminho) as conn:
+        return revisao_do_banco(conn)
+
+
+def test_banco_atualizado_nao_toca_na_trava(banco):
+    trava = TravaExecucao(caminho_trava(banco))
+    assert trava.adquirir(bloquear=False)
+    try:
+        migrar_na_inicializacao(banco)
+    finally:
+        trava.liberar()
+
+    assert _revisao(banco) == REVISAO_ATUAL
+
+
+def test_trava_ocupada_adia_a_migracao(tmp_path):
+    caminho = str(tmp_path / 'antigo.db')
+    preparar_banco(caminho, revisao='0010')
+    trava = TravaExecucao(caminho_trava(caminho))
+
+    assert trava.adquirir(bloquear=False)
+    try:
+        migrar_na_inicializacao(caminho)
+        assert _revisao(caminho) == '0010'
+    finally:
+        trava.liberar()
+
+    migrar_na_inicializacao(caminho)
+    assert _revisao(caminho) == REVISAO_ATUAL
+
+
+def test_0012_deixa_as_noticias_pendentes_para_preencher_a_categoria_dominante(tmp_path):
+    caminho = str(tmp_path / 'antes_da_0012.db')
+    preparar_banco(caminho, revisao='0011')
+    with sqlite3.connect(caminho) as conn:
+        conn.execute(
+            "INSERT INTO noticias (titulo, fonte, link, texto_completo) "
+            "VALUES ('Reforma tributária', 'Senado Federal', 'https://exemplo.gov.br/1', 'ICMS e ISS')"
+        )
+        conn.execute("UPDATE noticias SET score_versao = 'versao-antiga'")
+    aplicar_migracoes(caminho)
+
+    matcher = KeywordMatcher([('reforma tributária', 'Tributos', 8.0, 1.0), ('icms', 'Tributos', 5.0, 0.0)])
+    conn = sqlite3.connect(caminho)
+    try:
+        assert conn.execute("SELECT score_versao FROM noticias").fetchone()[0] is None
+        assert existem_pendentes(conn, matcher.versao)
+        assert rescore_pendentes(conn, matcher) == 1
+        assert conn.execute("SELECT categoria_dominante FROM noticias").fetchone()[0] == 'Tributos'
+    finally:
+        conn.close()
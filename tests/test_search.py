@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+Busca FTS5: consulta segura, relevância e trecho escapado
+"""
+
+import pytest
+
+from core.database.search import buscar_texto, montar_consulta_fts
+
+
+@pytest.mark.parametrize('q, esperado', [
+    ('reforma tributária', '"reforma" "tributária"'),
+    ('"reforma tributária" icms', '"reforma tributária" "icms"'),
+    ('tribut*', '"tribut"*'),
+    ('icms OR NOT (x) -y "', '"icms" "OR" "NOT" "x" "y"'),
+    ('a"b', '"a" "b"'),
+    ('  ', ''),
+])
+def test_montar_consulta_fts_neutraliza_a_sintaxe(q, esperado):
+    assert montar_consulta_fts(q) == esperado
+
+
+@pytest.fixture
+def noticias(conn):
+    with conn:
+        conn.executemany(
+            "INSERT INTO noticias (titulo, fonte, link, texto_completo) VALUES (?, ?, ?, ?)",
+            [
+                ('Sessão ordinária', 'Senado Federal', 'https://exemplo.gov.br/1',
+                 'Debate sobre a reforma tributária e o <b>ICMS</b> & outros tributos'),
+                ('Reforma Tributária aprovada', 'Câmara dos Deputados', 'https://exemplo.gov.br/2',
+                 'Texto segue para sanção'),
+                ('Licitações', 'Senado Federal', 'https://exemplo.gov.br/3', 'Pregão eletrônico'),
+            ]
+        )
+    return conn
+
+
+def test_titulo_pesa_mais_e_acentos_sao_ignorados(noticias):
+    linhas, total = buscar_texto(noticias, 'REFORMA tributaria')
+
+    assert total == 2
+    assert [linha[3] for linha in linhas] == ['https://exemplo.gov.br/2', 'https://exemplo.gov.br/1']
+
+
+def test_trecho_escapa_o_texto_e_marca_os_termos(noticias):
+    linhas, _ = buscar_texto(noticias, 'icms')
+
+    trecho = linhas[0][8]
+    assert '<mark>ICMS</mark>' in trecho
+    assert '&lt;b&gt;' in trecho and '&amp; outros' in trecho
+    assert '<b>' not in trecho
+
+
+def test_prefixo_paginacao_e_consulta_vazia(noticias):
+    linhas, total = buscar_texto(noticias, 'tribut*', pagina=2, limite=1)
+    assert total == 2 and len(linhas) == 1
+
+    with pytest.raises(ValueError):
+        buscar_texto(noticias, '" *')
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Equivalência da repontuação por matriz esparsa com KeywordMatcher.match
+"""
+
+import json
+import random
+
+import pytest
+
+from core.database.bulk_ops import save_noticias_bulk
+from core.scoring.keyword_matcher import KeywordMatcher
+from core.scoring.sparse_scorer import MatrizDocumentos, pontuar_matriz, rescore_todas
+
+TERMOS = [
+    ('reforma tributária', 'Tributos', 10, 3),
+    ('icms', 'Tributos', 8, 5),
+    ('imposto', 'Tributos', 5, 2),
+    ('licitação', 'Compras públicas', 7, 4),
+    ('pregão eletrônico', 'Compras públicas', 6, 1),
+    ('mei', 'Empreendedorismo', 6, 1),
+    ('crédito rural', 'Agro', 4, 2),
+    ('rural', 'Agro', 1, 0),
+]
+
+PALAVRAS = ['reforma', 'tributária', 'icms', 'imposto', 'licitação', 'pregão', 'eletrônico', 'mei',
+            'crédito', 'rural', 'câmara', 'senado', 'aprova', 'projeto', 'sessão', 'de', 'o']
+
+
+def _textos(quantidade: int):
+    aleatorio = random.Random(42)
+    textos = [' '.join(aleatorio.choice(PALAVRAS) for _ in range(aleatorio.randint(0, 40)))
+              for _ in range(quantidade)]
+    return textos + ['', 'Reforma Tributária: REFORMA tributária!', 'crédito rural e crédito rural']
+
+
+@pytest.mark.parametrize('por_ocorrencia', [False, True])
+def test_pontuar_matriz_igual_ao_match(por_ocorrencia):
+    matcher = KeywordMatcher(TERMOS)
+    textos = _textos(300)
+
+    resultado = pontuar_matriz(MatrizDocumentos(textos), matcher, por_ocorrencia=por_ocorrencia)
+
+    for i, texto in enumerate(textos):
+        esperado = matcher.match(texto, por_ocorrencia=por_ocorrencia)
+        assert resultado.score_interesse[i] == pytest.approx(esperado.score_interesse)
+        assert resultado.score_risco[i] == pytest.approx(esperado.score_risco)
+        assert resultado.categorias[i] == esperado.categorias
+        assert resultado.categoria_dominante[i] == esperado.categoria_dominante
+
+
+def test_rescore_todas_grava_os_mesmos_scores_do_match(conn):
+    matcher = KeywordMatcher(TERMOS)
+    textos = _textos(25)
+    save_noticias_bulk(conn, [
+        {'titulo': f'Notícia {i}', 'fonte': 'Senado Federal', 'link': f'https://exemplo.gov.br/{i}'}
+        for i in range(len(textos))
+    ])
+    with conn:
+        conn.executemany("UPDATE noticias SET texto_completo = ? WHERE link = ?",
+                         [(texto, f'https://exemplo.gov.br/{i}') for i, texto in enumerate(textos)])
+
+    stats = rescore_todas(conn, matcher, tamanho_bloco=10)
+
+    assert (stats['noticias'], stats['blocos']) == (len(textos), 3)
+    linhas = conn.execute("""
+        SELECT n.titulo, n.texto_completo, s.score_interesse, s.score_risco, s.categorias,
+               s.categoria_dominante, n.score_versao
+        FROM noticias n JOIN scores_faciap s ON s.noticia_id = n.id AND s.dicionario_hash = ?
+    """, (matcher.versao,)).fetchall()
+    assert len(linhas) == len(textos)
+    for titulo, texto, interesse, risco, categorias, dominante, versao in linhas:
+        esperado = matcher.match(f'{texto} {titulo}')
+        assert (interesse, risco) == pytest.approx((esperado.score_interesse, esperado.score_risco))
+        assert json.loads(categorias) == esperado.categorias
+        assert dominante == esperado.categoria_dominante
+        assert versao == matcher.versao